@@ -0,0 +1,89 @@
+"""Wall-clock startup time of CLI commands, with and without the schema stamp.
+
+Usage:
+    python benchmarks/bench_cli_startup.py [repeat]
+
+Every command runs in a fresh interpreter against a mock-scanned database in a
+temporary HOME. "unstamped" resets ``PRAGMA user_version`` before each run so
+``init_db`` goes through ``create_all`` and the migration checks; "stamped"
+leaves the stamp in place so it is a single pragma read. The last line times
+``init_db`` alone, without interpreter and import overhead.
+"""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+COMMANDS = [
+    ["list-installed"],
+    ["list-pinned"],
+    ["list-notinstalled"],
+    ["list-resources"],
+    ["run", "999999"],
+    ["pin", "999999"],
+]
+
+
+def run_cli(args: list[str], env: dict[str, str]) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "snapkit.cli", *args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return time.perf_counter() - started
+
+
+def reset_stamp(db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.close()
+
+
+def time_init_db(db_path: Path, repeat: int) -> tuple[float, float]:
+    from snapkit.db import get_engine, init_db
+
+    unstamped, stamped = [], []
+    for _ in range(repeat):
+        reset_stamp(db_path)
+        for samples in (unstamped, stamped):
+            engine = get_engine(db_path)
+            started = time.perf_counter()
+            init_db(engine)
+            samples.append(time.perf_counter() - started)
+            engine.dispose()
+    return statistics.median(unstamped), statistics.median(stamped)
+
+
+def main(repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as home:
+        env = {**os.environ, "HOME": home, "USERPROFILE": home}
+        db_path = Path(home) / ".snapkit" / "snapkit.db"
+        run_cli(["scan", "--mock"], env)
+
+        print(f"{'command':<22} {'unstamped':>10} {'stamped':>10} {'saved':>8}")
+        for args in COMMANDS:
+            unstamped, stamped = [], []
+            for _ in range(repeat):
+                reset_stamp(db_path)
+                unstamped.append(run_cli(args, env))
+                stamped.append(run_cli(args, env))
+            before = statistics.median(unstamped) * 1000
+            after = statistics.median(stamped) * 1000
+            print(f"{' '.join(args):<22} {before:8.1f}ms {after:8.1f}ms {before - after:6.1f}ms")
+
+        before, after = time_init_db(db_path, repeat)
+        print(f"{'init_db (in-process)':<22} {before * 1000:8.1f}ms {after * 1000:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
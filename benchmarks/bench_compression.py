@@ -0,0 +1,88 @@
+"""Export throughput and bundle size under different compression policies.
+
+Usage:
+    python benchmarks/bench_compression.py [total_mib] [files]
+
+Builds a mixed resource set (half text-like logs and CSVs, half already
+compressed media) and exports it with the old store-everything behaviour,
+the default policy on one process, and the default policy on a pool of one
+process per CPU (at least two, so the pool path is always measured). Digests are warmed first so only archive writing is timed.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.exporter import CompressionPolicy, export_bundle, hash_files
+from snapkit.models import ResourceItem
+
+WORDS = "error warn info debug request response latency user session cache timeout retry".split()
+
+
+def make_resources(root: Path, total: int, count: int) -> list[Path]:
+    rng = random.Random(0)
+    per_file = total // count
+    paths = []
+    for index in range(count):
+        if index % 2:
+            path = root / f"clip_{index:04d}.mp4"
+            path.write_bytes(os.urandom(per_file))
+        else:
+            path = root / f"log_{index:04d}.log"
+            lines = []
+            size = 0
+            while size < per_file:
+                line = f"{index} {rng.choice(WORDS)} {' '.join(rng.choices(WORDS, k=8))} {rng.random():.6f}\n"
+                lines.append(line)
+                size += len(line)
+            path.write_text("".join(lines), encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def main(total_mib: int, count: int) -> None:
+    total = total_mib << 20
+    workers = max(2, os.cpu_count() or 1)
+    policies = {
+        "store (old)": CompressionPolicy(method="store"),
+        "deflate x1": CompressionPolicy(workers=1),
+        f"deflate x{workers}": CompressionPolicy(workers=workers),
+    }
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        sources = root / "sources"
+        sources.mkdir()
+        engine = get_engine(root / "bench.db")
+        init_db(engine)
+        session = get_session(engine)
+        paths = make_resources(sources, total, count)
+        session.add_all(ResourceItem(name=p.name, path=str(p), resource_type="file") for p in paths)
+        session.commit()
+        hash_files(session, paths)
+
+        size = sum(p.stat().st_size for p in paths)
+        print(f"{count} files, {size / (1 << 20):.0f} MiB ({os.cpu_count()} CPUs)")
+        print(f"{'policy':<14} {'time':>8} {'MiB/s':>8} {'bundle':>10}")
+        for label, policy in policies.items():
+            out = root / "out.zip"
+            started = time.perf_counter()
+            export_bundle(session, out, compression=policy)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{label:<14} {elapsed:7.2f}s {size / elapsed / (1 << 20):8.0f} "
+                f"{out.stat().st_size / (1 << 20):8.0f}MiB"
+            )
+            out.unlink()
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 256,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 64,
+    )
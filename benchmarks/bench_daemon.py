@@ -0,0 +1,78 @@
+"""CLI latency with and without the resident daemon.
+
+Usage:
+    python benchmarks/bench_daemon.py [repeat]
+
+Seeds a mock-scanned database in a temporary HOME, then times each command
+as a fresh ``python -m snapkit`` process with ``SNAPKIT_NO_DAEMON=1`` and with
+a daemon running. The last column is the client/daemon round trip measured
+inside one process, i.e. what a hotkey tool holding the client would pay.
+"""
+
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+COMMANDS = [
+    ["list-pinned"],
+    ["list-installed"],
+    ["run", "999999"],
+]
+
+
+def timed(args: list[str], env: dict[str, str]) -> float:
+    started = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-m", "snapkit", *args],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        check=False,
+    )
+    return time.perf_counter() - started
+
+
+def main(repeat: int) -> None:
+    from snapkit.daemon.client import forward
+
+    with tempfile.TemporaryDirectory() as home:
+        env = {**os.environ, "HOME": home, "USERPROFILE": home}
+        env.pop("SNAPKIT_DAEMON_ADDRESS", None)
+        address = os.path.join(home, ".snapkit", "daemon.sock")
+        if sys.platform == "win32":
+            address = rf"\\.\pipe\snapkit-bench-{os.getpid()}"
+            env["SNAPKIT_DAEMON_ADDRESS"] = address
+
+        no_daemon = {**env, "SNAPKIT_NO_DAEMON": "1"}
+        snapkit = [sys.executable, "-m", "snapkit"]
+        subprocess.run([*snapkit, "scan", "--mock"], env=no_daemon, check=True, stdout=subprocess.DEVNULL)
+        in_process = {tuple(args): [timed(args, no_daemon) for _ in range(repeat)] for args in COMMANDS}
+
+        subprocess.run([*snapkit, "daemon", "start"], env=no_daemon, check=True, stdout=subprocess.DEVNULL)
+        try:
+            print(f"{'command':<16} {'in-process':>11} {'daemon':>9} {'round trip':>11}")
+            for args in COMMANDS:
+                via_daemon = [timed(args, env) for _ in range(repeat)]
+                forward(args, address)
+                round_trips = []
+                for _ in range(repeat * 10):
+                    started = time.perf_counter()
+                    forward(args, address)
+                    round_trips.append(time.perf_counter() - started)
+                print(
+                    f"{' '.join(args):<16} "
+                    f"{statistics.median(in_process[tuple(args)]) * 1000:9.1f}ms "
+                    f"{statistics.median(via_daemon) * 1000:7.1f}ms "
+                    f"{statistics.median(round_trips) * 1000:9.2f}ms"
+                )
+        finally:
+            subprocess.run([*snapkit, "daemon", "stop"], env=no_daemon, stdout=subprocess.DEVNULL)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,143 @@
+"""Peak disk and memory of ``export_bundle`` on a large resource set.
+
+Usage:
+    python benchmarks/bench_export.py [total_gib] [files]
+
+Creates *files* resource files adding up to *total_gib* GiB in a temporary
+directory, then exports them twice, each in a fresh subprocess: once with
+the current streaming exporter and once with the old copy-to-temp-dir-then-zip
+approach, reproduced here for comparison. Peak extra disk is sampled from
+``statvfs`` while the export runs; peak RSS comes from ``getrusage``.
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+CHUNK = 8 << 20
+
+_CHILD = r"""
+import resource, shutil, sys, tempfile, time
+from pathlib import Path
+from zipfile import ZipFile
+
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.exporter import export_bundle
+from snapkit.models import ResourceItem
+
+mode, db_path, out = sys.argv[1:4]
+engine = get_engine(db_path)
+init_db(engine)
+session = get_session(engine)
+started = time.perf_counter()
+if mode == "streaming":
+    export_bundle(session, Path(out))
+else:
+    with tempfile.TemporaryDirectory(dir=Path(out).parent) as tmp:
+        files = Path(tmp) / "files"
+        files.mkdir()
+        for res in session.query(ResourceItem).all():
+            shutil.copy2(res.path, files / f"{res.id}_{Path(res.path).name}")
+        with ZipFile(out, "w") as zf:
+            for f in Path(tmp).rglob("*"):
+                if f.is_file():
+                    zf.write(f, f.relative_to(tmp))
+elapsed = time.perf_counter() - started
+print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def make_resources(root: Path, total: int, count: int) -> list[Path]:
+    block = os.urandom(CHUNK)
+    per_file = total // count
+    paths = []
+    for index in range(count):
+        path = root / f"media_{index:04d}.bin"
+        with open(path, "wb") as fh:
+            remaining = per_file
+            while remaining:
+                step = min(remaining, CHUNK)
+                fh.write(block[:step])
+                remaining -= step
+        paths.append(path)
+    return paths
+
+
+def used_bytes(path: Path) -> int:
+    stats = os.statvfs(path)
+    return (stats.f_blocks - stats.f_bfree) * stats.f_frsize
+
+
+def run(mode: str, db_path: Path, out: Path) -> tuple[float, int, int]:
+    baseline = used_bytes(out.parent)
+    peak = baseline
+    done = threading.Event()
+
+    def sample():
+        nonlocal peak
+        while not done.is_set():
+            peak = max(peak, used_bytes(out.parent))
+            time.sleep(0.05)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    try:
+        result = subprocess.run(
+            [sys.executable, "-c", _CHILD, mode, str(db_path), str(out)],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    finally:
+        done.set()
+        sampler.join()
+    elapsed, max_rss_kib = result.stdout.split()
+    return float(elapsed), int(max_rss_kib) * 1024, peak - baseline
+
+
+def main(total_gib: float, count: int) -> None:
+    from snapkit.db import get_engine, get_session, init_db
+    from snapkit.models import ResourceItem
+
+    total = int(total_gib * (1 << 30))
+    with tempfile.TemporaryDirectory(dir=os.environ.get("BENCH_TMP")) as tmp:
+        root = Path(tmp)
+        sources = root / "sources"
+        sources.mkdir()
+        db_path = root / "bench.db"
+        engine = get_engine(db_path)
+        init_db(engine)
+        session = get_session(engine)
+        session.add_all(
+            ResourceItem(name=path.name, path=str(path), resource_type="file")
+            for path in make_resources(sources, total, count)
+        )
+        session.commit()
+        session.close()
+        engine.dispose()
+
+        print(f"{count} files, {total / (1 << 30):.1f} GiB")
+        print(f"{'mode':<10} {'time':>8} {'MB/s':>8} {'peak RSS':>10} {'peak extra disk':>16}")
+        for mode in ("legacy", "streaming"):
+            out = root / f"{mode}.zip"
+            elapsed, rss, disk = run(mode, db_path, out)
+            print(
+                f"{mode:<10} {elapsed:7.1f}s {total / elapsed / (1 << 20):8.0f} "
+                f"{rss / (1 << 20):8.0f}MB {disk / (1 << 30):14.2f}GB"
+            )
+            out.unlink()
+        shutil.rmtree(sources)
+
+
+if __name__ == "__main__":
+    main(
+        float(sys.argv[1]) if len(sys.argv) > 1 else 1.0,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 100,
+    )
@@ -0,0 +1,119 @@
+"""Time ``import_bundle`` on a large bundle.
+
+Usage:
+    python benchmarks/bench_import.py [records]
+
+Seeds a database with *records* rows split across installed apps, pins,
+wishes and resources, exports it as a manifest bundle and as a ``--snapshot``
+bundle, then imports each twice: into an empty database (everything is new)
+and into the source database (everything is a duplicate). Peak heap is measured with ``tracemalloc``, which also
+slows every phase down.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sqlalchemy import insert, select
+
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.exporter import CompressionPolicy, export_bundle, import_bundle
+from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
+
+
+def seed(session, records: int) -> None:
+    now = datetime.now(UTC)
+    apps = records * 4 // 10
+    session.execute(
+        insert(InstalledApp),
+        [
+            {
+                "name": f"App {i}",
+                "name_key": f"app {i}",
+                "publisher": "Bench",
+                "version": "1.0",
+                "registry_key": f"HKLM\\Software\\Bench\\{i}",
+                "tags": "bench" if i % 5 == 0 else None,
+                "scanned_at": now,
+            }
+            for i in range(apps)
+        ],
+    )
+    app_ids = session.scalars(select(InstalledApp.id)).all()
+    session.execute(
+        insert(PinnedApp),
+        [{"installed_app_id": app_id, "pinned_at": now} for app_id in app_ids[: records // 10]],
+    )
+    wishes = records * 25 // 100
+    session.execute(
+        insert(NotInstalledApp),
+        [{"name": f"Wish {i}", "name_key": f"wish {i}", "added_at": now} for i in range(wishes)],
+    )
+    session.execute(
+        insert(ResourceItem),
+        [
+            {"name": f"Site {i}", "path": f"https://example.com/{i}", "resource_type": "url", "added_at": now}
+            for i in range(records - apps - records // 10 - wishes)
+        ],
+    )
+    session.commit()
+
+
+def timed_import(db_path: Path, bundle: Path) -> tuple[float, int, dict]:
+    engine = get_engine(db_path)
+    init_db(engine)
+    session = get_session(engine)
+    tracemalloc.start()
+    started = time.perf_counter()
+    counts = import_bundle(session, bundle)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    session.close()
+    engine.dispose()
+    return elapsed, peak, counts
+
+
+def main(records: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        source = root / "source.db"
+        engine = get_engine(source)
+        init_db(engine)
+        session = get_session(engine)
+        seed(session, records)
+        print(f"{records} records")
+        bundles = {}
+        for mode in ("manifest", "snapshot"):
+            bundle = bundles[mode] = root / f"{mode}.zip"
+            tracemalloc.start()
+            started = time.perf_counter()
+            export_bundle(
+                session, bundle, compression=CompressionPolicy(workers=1), snapshot=mode == "snapshot"
+            )
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(
+                f"{mode + ' export':<25} {elapsed:7.2f}s  peak heap {peak / (1 << 20):6.1f} MiB  "
+                f"bundle {bundle.stat().st_size / (1 << 20):.1f} MiB"
+            )
+        session.close()
+        engine.dispose()
+
+        for mode, bundle in bundles.items():
+            for label, db_path in (("into empty db", root / f"empty-{mode}.db"), ("all duplicates", source)):
+                elapsed, peak, counts = timed_import(db_path, bundle)
+                print(
+                    f"{mode + ' ' + label:<25} {elapsed:7.2f}s  peak heap {peak / (1 << 20):6.1f} MiB  "
+                    f"new rows {sum(counts.values())}"
+                )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
@@ -0,0 +1,184 @@
+"""Compare ORM hydration against column projection for repository list views.
+
+Usage:
+    python benchmarks/bench_list_views.py [rows ...]
+
+Each size seeds a fresh SQLite file with that many installed apps, wishes and
+resources, then times building ``UiItem`` lists both ways and records peak
+Python heap usage with ``tracemalloc``.
+"""
+
+from __future__ import annotations
+
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import UTC, datetime
+from pathlib import Path
+
+from sqlalchemy import exists, insert
+
+from snapkit.core.entities import UiItem
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.infra.cache.query_cache import QueryCache
+from snapkit.infra.db.repo_sqlalchemy import SqlAlchemyToolboxRepository
+from snapkit.models import InstalledApp, NotInstalledApp, ResourceItem
+
+
+def seed(engine, rows: int) -> None:
+    now = datetime.now(UTC)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(InstalledApp),
+            [
+                {
+                    "name": f"App {i:07d}",
+                    "name_key": f"app {i:07d}",
+                    "publisher": "Bench Corp",
+                    "version": "1.0",
+                    "install_location": rf"C:\Program Files\App{i}",
+                    "display_icon": rf"C:\Program Files\App{i}\app.exe,0",
+                    "registry_key": f"bench::{i}",
+                    "scanned_at": now,
+                }
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(NotInstalledApp),
+            [
+                {"name": f"Wish {i}", "name_key": f"wish {i}", "added_at": now}
+                for i in range(rows)
+            ],
+        )
+        conn.execute(
+            insert(ResourceItem),
+            [
+                {"name": f"Doc {i}", "path": rf"D:\docs\doc{i}.pdf", "resource_type": "document", "added_at": now}
+                for i in range(rows)
+            ],
+        )
+
+
+def orm_installed(engine, limit: int) -> list[UiItem]:
+    session = get_session(engine)
+    try:
+        apps = session.query(InstalledApp).order_by(InstalledApp.name).limit(limit).all()
+        return [
+            UiItem(
+                item_id=app.id,
+                title=app.custom_name or app.name,
+                subtitle=app.publisher or app.version or "Unknown Publisher",
+                badge="LOCAL APP",
+                kind="local",
+                install_location=app.install_location,
+                uninstall_command=app.uninstall_command,
+                icon_path=app.custom_icon_path or app.display_icon,
+            )
+            for app in apps
+        ]
+    finally:
+        session.close()
+
+
+def orm_not_installed(engine, limit: int) -> list[UiItem]:
+    session = get_session(engine)
+    try:
+        apps = (
+            session.query(NotInstalledApp)
+            .filter(
+                ~exists().where(InstalledApp.name_key == NotInstalledApp.name_key),
+                ~exists().where(InstalledApp.custom_name_key == NotInstalledApp.name_key),
+            )
+            .order_by(NotInstalledApp.added_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            UiItem(
+                item_id=app.id,
+                title=app.name,
+                subtitle=app.description or "",
+                badge="WISHLIST",
+                kind="wish",
+                download_url=app.download_url,
+            )
+            for app in apps
+        ]
+    finally:
+        session.close()
+
+
+def orm_resources(engine, limit: int) -> list[UiItem]:
+    session = get_session(engine)
+    try:
+        items = (
+            session.query(ResourceItem)
+            .filter_by(resource_type="document")
+            .order_by(ResourceItem.added_at.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            UiItem(
+                item_id=item.id,
+                title=item.name,
+                subtitle=item.path,
+                badge="RESOURCE",
+                kind="resource",
+                path=item.path,
+                resource_type=item.resource_type,
+            )
+            for item in items
+        ]
+    finally:
+        session.close()
+
+
+def measure(fn, repeat: int = 3) -> tuple[float, int, int]:
+    fn()  # warm up statement caches and mapper configuration
+    elapsed = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = min(elapsed, time.perf_counter() - started)
+        del result
+
+    # Peak heap is measured on a separate run; tracemalloc skews timings.
+    tracemalloc.start()
+    result = fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, len(result)
+
+
+def run(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        engine = get_engine(Path(tmpdir) / "bench.db")
+        init_db(engine)
+        seed(engine, rows)
+        # A zero-byte budget disables caching so every call hits the database.
+        repo = SqlAlchemyToolboxRepository(engine, cache=QueryCache(max_bytes=0))
+
+        cases = [
+            ("installed", lambda: orm_installed(engine, rows), lambda: repo.list_installed(limit=rows)),
+            ("not_installed", lambda: orm_not_installed(engine, rows), lambda: repo.list_not_installed(limit=rows)),
+            ("resources", lambda: orm_resources(engine, rows), lambda: repo.list_resources("document", limit=rows)),
+        ]
+        for name, orm_fn, projection_fn in cases:
+            orm_time, orm_peak, count = measure(orm_fn)
+            proj_time, proj_peak, _ = measure(projection_fn)
+            print(
+                f"{rows:>7} {name:<14} rows={count:<7} "
+                f"orm={orm_time * 1000:8.1f}ms/{orm_peak / 2**20:6.1f}MiB  "
+                f"projection={proj_time * 1000:8.1f}ms/{proj_peak / 2**20:6.1f}MiB  "
+                f"speedup={orm_time / proj_time:4.1f}x"
+            )
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        run(size)
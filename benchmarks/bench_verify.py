@@ -0,0 +1,69 @@
+"""Time ``verify_bundle`` on a bundle of many resource files.
+
+Usage:
+    python benchmarks/bench_verify.py [total_mib] [files]
+
+Exports *files* compressible resource files adding up to *total_mib* MiB,
+then verifies the bundle with one hashing thread, with one per CPU, and for
+a single selected blob.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from snapkit.checksums import verify_bundle
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.exporter import CompressionPolicy, export_bundle
+from snapkit.models import ResourceItem
+
+
+def main(total_mib: int, count: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        sources = root / "sources"
+        sources.mkdir()
+        per_file = (total_mib << 20) // count
+        engine = get_engine(root / "bench.db")
+        init_db(engine)
+        session = get_session(engine)
+        for index in range(count):
+            path = sources / f"doc_{index:04d}.txt"
+            line = f"document {index} ".encode() + os.urandom(16).hex().encode() + b"\n"
+            path.write_bytes(line * (per_file // len(line)))
+            session.add(ResourceItem(name=path.name, path=str(path), resource_type="file"))
+        session.commit()
+        bundle = export_bundle(session, root / "bundle.zip", compression=CompressionPolicy(workers=1))
+        session.close()
+        engine.dispose()
+
+        print(f"{count} files, {total_mib} MiB, bundle {bundle.stat().st_size / (1 << 20):.1f} MiB")
+        cpus = os.cpu_count() or 1
+        for label, kwargs in (
+            ("1 thread", {"workers": 1}),
+            (f"pool of {min(8, cpus)}", {}),
+            ("one entry", {"entries": [min(_blobs(bundle))]}),
+        ):
+            started = time.perf_counter()
+            checks = verify_bundle(bundle, **kwargs)
+            elapsed = time.perf_counter() - started
+            assert all(check.ok for check in checks)
+            print(f"{label:<12} {elapsed:7.3f}s  {len(checks)} entries")
+
+
+def _blobs(bundle: Path) -> list[str]:
+    from zipfile import ZipFile
+
+    with ZipFile(bundle) as zf:
+        return [name for name in zf.namelist() if name.startswith("blobs/")]
+
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 512,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 200,
+    )
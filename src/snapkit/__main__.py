@@ -0,0 +1,36 @@
+"""``snapkit`` entry point.
+
+Hot commands are first offered to a running daemon (see ``snapkit.daemon``)
+without importing typer or the rest of the CLI; everything else, and every
+command when no daemon answers, runs in-process. Set ``SNAPKIT_NO_DAEMON=1``
+to skip the daemon.
+"""
+
+import os
+import sys
+
+
+def main():
+    argv = sys.argv[1:]
+    if not os.environ.get("SNAPKIT_NO_DAEMON"):
+        from snapkit.daemon import FORWARDED_COMMANDS
+
+        # --pick needs this process's terminal; --json/--jsonl stream straight to stdout.
+        local_only = {"--pick", "--json", "--jsonl"}
+        if argv and argv[0] in FORWARDED_COMMANDS and local_only.isdisjoint(argv):
+            from snapkit.daemon.client import forward
+
+            forwarded = forward(argv)
+            if forwarded is not None:
+                output, exit_code = forwarded
+                sys.stdout.write(output)
+                sys.stdout.flush()
+                sys.exit(exit_code)
+
+    from snapkit.cli import app
+
+    app(prog_name="snapkit")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,51 +1,216 @@
 ﻿from __future__ import annotations
 
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import replace
 from pathlib import Path
 
 from sqlalchemy import Engine, or_
 
-from snapkit.app.usecases.list_apps import list_items
+from snapkit.app.usecases.batch_items import (
+    batch_add_tag,
+    batch_delete,
+    batch_pin,
+    batch_set_custom_icon,
+    batch_unpin,
+)
+from snapkit.app.usecases.list_apps import list_items, list_tag_facets
 from snapkit.app.usecases.open_item import activate_item, open_item_folder, uninstall_item
-from snapkit.app.usecases.scan_apps import scan_installed_apps
-from snapkit.core.entities import UiItem, ViewId
+from snapkit.core.entities import ActionResult, ChangeEvent, UiItem, ViewId
 from snapkit.core.protocols import ToolboxRepository
 from snapkit.db import get_session
-from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
+from snapkit.exporter import export_bundle, import_bundle, record_file_digests
+from snapkit.infra.db import changelog
+from snapkit.infra.db.maintenance import MaintenanceReport, run_maintenance
+from snapkit.infra.db.writer import SerializedWriter
+from snapkit.models import (
+    InstalledApp,
+    NotInstalledApp,
+    PinnedApp,
+    ResourceItem,
+    normalize_name_key,
+)
+from snapkit.progress import CancelToken, ProgressCallback
+from snapkit.scanner import save_scanned_apps_and_prune, scan_registry
 
 
 class SnapKitService:
-    def __init__(self, repo: ToolboxRepository, engine: Engine):
+    """Application facade shared by the GUI and background workers.
+
+    Reads may run on any thread. Every database write is queued on a single
+    ``SerializedWriter`` thread; ``submit_*`` methods return its ``Future``
+    and the plain methods wait on it.
+    """
+
+    def __init__(
+        self,
+        repo: ToolboxRepository,
+        engine: Engine,
+        page_size: int = 300,
+        maintain_after_scan: bool = True,
+    ):
         self._repo = repo
         self._engine = engine
+        self._page_size = page_size
+        self._maintain_after_scan = maintain_after_scan
         self._item_index: dict[int, UiItem] = {}
+        self._index_lock = threading.Lock()
+        self._writer = SerializedWriter(engine)
+        self._background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapkit-bg")
+
+    def close(self):
+        self._background.shutdown(wait=True)
+        self._writer.close()
+
+    def submit_write(self, fn: Callable[..., object], *args, **kwargs) -> Future:
+        """Queue ``fn(session, *args, **kwargs)`` on the writer thread."""
+        return self._writer.submit(fn, *args, **kwargs)
+
+    @property
+    def page_size(self) -> int:
+        return self._page_size
 
     def load_view(
-        self, view_id: ViewId, search: str = "", local_filter: str = "all"
+        self,
+        view_id: ViewId,
+        search: str = "",
+        local_filter: str = "all",
+        tag: str | None = None,
     ) -> tuple[str, str, list[UiItem]]:
         title, subtitle, items = list_items(
             self._repo,
             view_id=view_id,
             search=search,
+            limit=self._page_size,
             local_filter=local_filter,
+            tag=tag,
         )
-        self._item_index = {item.item_id: item for item in items}
+        with self._index_lock:
+            self._item_index = {item.item_id: item for item in items}
         return title, subtitle, items
 
+    def load_more(
+        self,
+        view_id: ViewId,
+        after: str,
+        search: str = "",
+        local_filter: str = "all",
+        tag: str | None = None,
+    ) -> list[UiItem]:
+        """Fetch the page following the item whose cursor is *after*."""
+        _, _, items = list_items(
+            self._repo,
+            view_id=view_id,
+            search=search,
+            limit=self._page_size,
+            local_filter=local_filter,
+            after=after,
+            tag=tag,
+        )
+        with self._index_lock:
+            self._item_index.update((item.item_id, item) for item in items)
+        return items
+
+    def tag_facets(self, view_id: ViewId) -> list[tuple[str, int]]:
+        return list_tag_facets(self._repo, view_id)
+
+    def changes_since(self, seq: int, limit: int = 1000) -> list[ChangeEvent]:
+        """Rows changed after *seq* by this or any other process, see ``changelog``."""
+        session = get_session(self._engine)
+        try:
+            return changelog.changes_since(session, seq, limit)
+        finally:
+            session.close()
+
+    def register_change_consumer(self, name: str) -> int:
+        return self._writer.submit_untracked(changelog.register_consumer, name).result()
+
+    def unregister_change_consumer(self, name: str) -> int:
+        return self._writer.submit_untracked(changelog.unregister_consumer, name).result()
+
+    def ack_changes(self, name: str, seq: int) -> int:
+        """Mark changes up to *seq* as seen by *name*; fully acknowledged entries are dropped."""
+        return self._writer.submit_untracked(changelog.ack_changes, name, seq).result()
+
     def activate_item(self, item_id: int) -> tuple[bool, str]:
-        item = self._item_index.get(item_id)
+        item = self._get_item(item_id)
         if not item:
             return False, "项目不存在或已过期，请刷新后重试"
         return activate_item(item)
 
     def scan_apps(self) -> tuple[bool, str]:
-        found, added = scan_installed_apps(self._engine)
-        if found == 0:
+        apps = scan_registry()
+        if not apps:
             return False, "未扫描到应用，请确认在 Windows 系统中运行并有注册表读取权限"
-        return True, f"扫描完成：发现 {found} 个应用，新增 {added} 个"
+        added = self.submit_write(save_scanned_apps_and_prune, apps).result()
+        if self._maintain_after_scan:
+            # Queued behind pending writes; nobody waits on it.
+            self.submit_maintenance(quick=True)
+        return True, f"扫描完成：发现 {len(apps)} 个应用，新增 {added} 个"
+
+    def submit_scan(self) -> Future:
+        """Scan the registry off the calling thread; resolves to ``scan_apps()``'s result."""
+        return self._background.submit(self.scan_apps)
+
+    def maintain(self, **options) -> MaintenanceReport:
+        """Run ``run_maintenance`` with *options*, serialized with other writes."""
+        return self.submit_maintenance(**options).result()
+
+    def submit_maintenance(self, **options) -> Future:
+        return self._writer.submit_untracked(
+            lambda session: run_maintenance(self._engine, **options)
+        )
+
+    def submit_export(
+        self,
+        output_path: Path,
+        snapshot: bool = False,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+    ) -> Future:
+        """Export a bundle off the calling thread; resolves to the bundle's path.
+
+        The export reads on its own session beside the writer instead of
+        holding it; only the digests of newly hashed files go through the
+        writer, as bookkeeping that leaves list-view data alone.
+        """
+
+        def record(rows: list[dict]) -> None:
+            self._writer.submit_untracked(record_file_digests, rows).result()
+
+        def run() -> Path:
+            session = get_session(self._engine)
+            try:
+                return export_bundle(
+                    session,
+                    output_path,
+                    snapshot=snapshot,
+                    progress=progress,
+                    cancel=cancel,
+                    record_digests=record,
+                )
+            finally:
+                session.close()
+
+        return self._background.submit(run)
+
+    def submit_import(
+        self,
+        zip_path: Path,
+        restore_to: Path | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+    ) -> Future:
+        """Queue a bundle import on the writer; resolves to the new-row counts per table."""
+        return self.submit_write(
+            lambda session: import_bundle(
+                session, zip_path, restore_files_to=restore_to, progress=progress, cancel=cancel
+            )
+        )
 
     def perform_action(self, item_id: int, action: str) -> tuple[bool, str]:
-        item = self._item_index.get(item_id)
+        item = self._get_item(item_id)
         if not item:
             return False, "项目不存在或已过期，请刷新后重试"
 
@@ -58,16 +223,62 @@ class SnapKitService:
         if action == "uninstall":
             return uninstall_item(item)
         if action == "pin":
-            return self._pin_item(item)
+            return self.submit_write(self._pin_item, item).result()
         if action == "unpin":
-            return self._unpin_item(item)
+            return self.submit_write(self._unpin_item, item).result()
         if action == "delete":
-            return self._delete_item(item)
+            ok, message = self.submit_write(self._delete_item, item).result()
+            if ok:
+                with self._index_lock:
+                    self._item_index.pop(item.item_id, None)
+            return ok, message
 
         return False, f"不支持的操作: {action}"
 
+    def perform_batch_action(self, item_ids: list[int], action: str) -> list[ActionResult]:
+        """Apply *action* to many items; DB actions run in one transaction."""
+        return self.submit_batch_action(item_ids, action).result()
+
+    def submit_batch_action(self, item_ids: list[int], action: str) -> Future:
+        batch_handlers = {"pin": batch_pin, "unpin": batch_unpin, "delete": batch_delete}
+        handler = batch_handlers.get(action)
+        if handler is None:
+            return self._background.submit(
+                lambda: [
+                    ActionResult(item_id, *self.perform_action(item_id, action))
+                    for item_id in item_ids
+                ]
+            )
+
+        future = self._submit_batch(item_ids, handler)
+        if action == "delete":
+            future.add_done_callback(self._forget_deleted)
+        return future
+
+    def tag_items(self, item_ids: list[int], tag: str) -> list[ActionResult]:
+        return self._submit_batch(
+            item_ids, lambda session, items: batch_add_tag(session, items, tag)
+        ).result()
+
+    def set_custom_icons(self, item_ids: list[int], icon_path: str) -> list[ActionResult]:
+        path = Path(icon_path)
+        if not path.exists():
+            return [ActionResult(item_id, False, "图标文件不存在") for item_id in item_ids]
+        if path.suffix.lower() != ".exe":
+            return [ActionResult(item_id, False, "请选择 exe 文件以提取图标") for item_id in item_ids]
+
+        results = self._submit_batch(
+            item_ids, lambda session, items: batch_set_custom_icon(session, items, str(path))
+        ).result()
+        with self._index_lock:
+            for result in results:
+                item = self._item_index.get(result.item_id)
+                if result.ok and item:
+                    self._item_index[result.item_id] = replace(item, icon_path=str(path))
+        return results
+
     def rename_item(self, item_id: int, new_name: str) -> tuple[bool, str]:
-        item = self._item_index.get(item_id)
+        item = self._get_item(item_id)
         if not item:
             return False, "项目不存在或已过期，请刷新后重试"
 
@@ -75,39 +286,13 @@ class SnapKitService:
         if not name:
             return False, "名称不能为空"
 
-        session = get_session(self._engine)
-        try:
-            if item.kind == "local":
-                app = session.get(InstalledApp, item.item_id)
-                if not app:
-                    return False, "项目不存在"
-                app.custom_name = name
-            elif item.kind == "pinned":
-                pin = session.get(PinnedApp, item.item_id)
-                if not pin or not pin.installed_app:
-                    return False, "项目不存在"
-                pin.installed_app.custom_name = name
-            elif item.kind == "wish":
-                wish = session.get(NotInstalledApp, item.item_id)
-                if not wish:
-                    return False, "项目不存在"
-                wish.name = name
-            elif item.kind == "resource":
-                res = session.get(ResourceItem, item.item_id)
-                if not res:
-                    return False, "项目不存在"
-                res.name = name
-            else:
-                return False, "该类型不支持重命名"
-
-            session.commit()
-            self._item_index[item_id] = replace(item, title=name)
-            return True, f"已重命名为: {name}"
-        finally:
-            session.close()
+        ok, message = self.submit_write(self._rename_item, item, name).result()
+        if ok:
+            self._set_item(replace(item, title=name))
+        return ok, message
 
     def set_custom_icon(self, item_id: int, icon_path: str) -> tuple[bool, str]:
-        item = self._item_index.get(item_id)
+        item = self._get_item(item_id)
         if not item:
             return False, "项目不存在或已过期，请刷新后重试"
 
@@ -117,26 +302,10 @@ class SnapKitService:
         if path.suffix.lower() != ".exe":
             return False, "请选择 exe 文件以提取图标"
 
-        session = get_session(self._engine)
-        try:
-            if item.kind == "local":
-                app = session.get(InstalledApp, item.item_id)
-                if not app:
-                    return False, "项目不存在"
-                app.custom_icon_path = str(path)
-            elif item.kind == "pinned":
-                pin = session.get(PinnedApp, item.item_id)
-                if not pin or not pin.installed_app:
-                    return False, "项目不存在"
-                pin.installed_app.custom_icon_path = str(path)
-            else:
-                return False, "该类型不支持自定义图标"
-
-            session.commit()
-            self._item_index[item_id] = replace(item, icon_path=str(path))
-            return True, f"已设置自定义图标: {item.title}"
-        finally:
-            session.close()
+        ok, message = self.submit_write(self._set_custom_icon, item, str(path)).result()
+        if ok:
+            self._set_item(replace(item, icon_path=str(path)))
+        return ok, message
 
     def quick_add(
         self,
@@ -153,143 +322,218 @@ class SnapKitService:
         normalized_icon = icon_path.strip()
         normalized_mode = source_mode.strip().lower() or "local"
 
-        session = get_session(self._engine)
-        try:
-            if item_type == "local_app":
-                return self._quick_add_local_app(
-                    session,
-                    name=normalized_name,
-                    target=normalized_target,
-                    icon_path=normalized_icon,
-                )
-            if item_type == "wish":
-                return self._quick_add_wish(
-                    session,
-                    name=normalized_name,
-                    target=normalized_target,
-                    note=normalized_note,
-                )
-            if item_type == "website":
-                return self._quick_add_website(
-                    session,
-                    name=normalized_name,
-                    target=normalized_target,
-                    note=normalized_note,
-                )
-
-            resource_map = {
-                "document": "document",
-                "image": "image",
-                "video": "video",
-            }
-            resource_type = resource_map.get(item_type)
-            if not resource_type:
-                return False, f"不支持的快速添加类型: {item_type}"
-            if not normalized_target:
-                return False, "请填写路径或链接"
-
-            if normalized_mode == "network":
-                normalized_target = _normalize_web_url(normalized_target)
-                if not _is_web_url(normalized_target):
-                    return False, "网络资源必须是 http/https 链接"
-                final_target = normalized_target
-            else:
-                local_path = _to_existing_path(normalized_target)
-                if not local_path:
-                    return False, "本地资源路径不存在"
-                final_target = str(local_path)
-
-            return self._upsert_resource(
-                session=session,
-                resource_type=resource_type,
+        return self.submit_write(
+            self._quick_add,
+            item_type,
+            normalized_name,
+            normalized_target,
+            normalized_note,
+            normalized_icon,
+            normalized_mode,
+        ).result()
+
+    def _quick_add(
+        self,
+        session,
+        item_type: str,
+        normalized_name: str,
+        normalized_target: str,
+        normalized_note: str,
+        normalized_icon: str,
+        normalized_mode: str,
+    ) -> tuple[bool, str]:
+        if item_type == "local_app":
+            return self._quick_add_local_app(
+                session,
+                name=normalized_name,
+                target=normalized_target,
+                icon_path=normalized_icon,
+            )
+        if item_type == "wish":
+            return self._quick_add_wish(
+                session,
                 name=normalized_name,
-                target=final_target,
+                target=normalized_target,
+                note=normalized_note,
+            )
+        if item_type == "website":
+            return self._quick_add_website(
+                session,
+                name=normalized_name,
+                target=normalized_target,
                 note=normalized_note,
-                ok_prefix="资源",
             )
-        finally:
-            session.close()
 
-    def _delete_item(self, item: UiItem) -> tuple[bool, str]:
-        session = get_session(self._engine)
-        try:
-            if item.kind == "local":
-                app = session.get(InstalledApp, item.item_id)
-                if not app:
-                    return False, "项目不存在"
-                session.query(PinnedApp).filter_by(installed_app_id=app.id).delete()
-                session.delete(app)
-            elif item.kind == "pinned":
-                pin = session.get(PinnedApp, item.item_id)
-                if not pin:
-                    return False, "项目不存在"
-                session.delete(pin)
-            elif item.kind == "wish":
-                wish = session.get(NotInstalledApp, item.item_id)
-                if not wish:
-                    return False, "项目不存在"
-                session.delete(wish)
-            elif item.kind == "resource":
-                res = session.get(ResourceItem, item.item_id)
-                if not res:
-                    return False, "项目不存在"
-                session.delete(res)
+        resource_map = {
+            "document": "document",
+            "image": "image",
+            "video": "video",
+        }
+        resource_type = resource_map.get(item_type)
+        if not resource_type:
+            return False, f"不支持的快速添加类型: {item_type}"
+        if not normalized_target:
+            return False, "请填写路径或链接"
+
+        if normalized_mode == "network":
+            normalized_target = _normalize_web_url(normalized_target)
+            if not _is_web_url(normalized_target):
+                return False, "网络资源必须是 http/https 链接"
+            final_target = normalized_target
+        else:
+            local_path = _to_existing_path(normalized_target)
+            if not local_path:
+                return False, "本地资源路径不存在"
+            final_target = str(local_path)
+
+        return self._upsert_resource(
+            session=session,
+            resource_type=resource_type,
+            name=normalized_name,
+            target=final_target,
+            note=normalized_note,
+            ok_prefix="资源",
+        )
+
+    def _get_item(self, item_id: int) -> UiItem | None:
+        with self._index_lock:
+            return self._item_index.get(item_id)
+
+    def _set_item(self, item: UiItem):
+        with self._index_lock:
+            self._item_index[item.item_id] = item
+
+    def _forget_deleted(self, future: Future):
+        if future.cancelled() or future.exception():
+            return
+        with self._index_lock:
+            for result in future.result():
+                if result.ok:
+                    self._item_index.pop(result.item_id, None)
+
+    def _submit_batch(self, item_ids: list[int], handler) -> Future:
+        results: dict[int, ActionResult] = {}
+        items: list[UiItem] = []
+        for item_id in dict.fromkeys(item_ids):
+            item = self._get_item(item_id)
+            if item:
+                items.append(item)
             else:
-                return False, "该类型不支持删除"
+                results[item_id] = ActionResult(item_id, False, "项目不存在或已过期，请刷新后重试")
 
-            session.commit()
-            self._item_index.pop(item.item_id, None)
-            return True, f"已删除: {item.title}"
-        finally:
-            session.close()
+        def run(session) -> list[ActionResult]:
+            if items:
+                results.update((result.item_id, result) for result in handler(session, items))
+            return [results[item_id] for item_id in dict.fromkeys(item_ids)]
+
+        return self.submit_write(run)
+
+    def _rename_item(self, session, item: UiItem, name: str) -> tuple[bool, str]:
+        if item.kind == "local":
+            app = session.get(InstalledApp, item.item_id)
+            if not app:
+                return False, "项目不存在"
+            app.custom_name = name
+        elif item.kind == "pinned":
+            pin = session.get(PinnedApp, item.item_id)
+            if not pin or not pin.installed_app:
+                return False, "项目不存在"
+            pin.installed_app.custom_name = name
+        elif item.kind == "wish":
+            wish = session.get(NotInstalledApp, item.item_id)
+            if not wish:
+                return False, "项目不存在"
+            wish.name = name
+        elif item.kind == "resource":
+            res = session.get(ResourceItem, item.item_id)
+            if not res:
+                return False, "项目不存在"
+            res.name = name
+        else:
+            return False, "该类型不支持重命名"
 
-    def _pin_item(self, item: UiItem) -> tuple[bool, str]:
+        return True, f"已重命名为: {name}"
+
+    def _set_custom_icon(self, session, item: UiItem, icon_path: str) -> tuple[bool, str]:
+        if item.kind == "local":
+            app = session.get(InstalledApp, item.item_id)
+            if not app:
+                return False, "项目不存在"
+            app.custom_icon_path = icon_path
+        elif item.kind == "pinned":
+            pin = session.get(PinnedApp, item.item_id)
+            if not pin or not pin.installed_app:
+                return False, "项目不存在"
+            pin.installed_app.custom_icon_path = icon_path
+        else:
+            return False, "该类型不支持自定义图标"
+
+        return True, f"已设置自定义图标: {item.title}"
+
+    def _delete_item(self, session, item: UiItem) -> tuple[bool, str]:
+        if item.kind == "local":
+            app = session.get(InstalledApp, item.item_id)
+            if not app:
+                return False, "项目不存在"
+            session.query(PinnedApp).filter_by(installed_app_id=app.id).delete()
+            session.delete(app)
+        elif item.kind == "pinned":
+            pin = session.get(PinnedApp, item.item_id)
+            if not pin:
+                return False, "项目不存在"
+            session.delete(pin)
+        elif item.kind == "wish":
+            wish = session.get(NotInstalledApp, item.item_id)
+            if not wish:
+                return False, "项目不存在"
+            session.delete(wish)
+        elif item.kind == "resource":
+            res = session.get(ResourceItem, item.item_id)
+            if not res:
+                return False, "项目不存在"
+            session.delete(res)
+        else:
+            return False, "该类型不支持删除"
+
+        return True, f"已删除: {item.title}"
+
+    def _pin_item(self, session, item: UiItem) -> tuple[bool, str]:
         if item.kind not in {"local", "pinned"}:
             return False, "该类型不支持收藏"
 
         if item.kind == "pinned":
             return False, f"{item.title} 已在收藏中"
 
-        session = get_session(self._engine)
-        try:
-            app = session.get(InstalledApp, item.item_id)
-            if not app:
-                return False, "项目不存在"
+        app = session.get(InstalledApp, item.item_id)
+        if not app:
+            return False, "项目不存在"
 
-            existing = session.query(PinnedApp).filter_by(installed_app_id=app.id).first()
-            if existing:
-                return False, f"{item.title} 已在收藏中"
+        existing = session.query(PinnedApp).filter_by(installed_app_id=app.id).first()
+        if existing:
+            return False, f"{item.title} 已在收藏中"
 
-            session.add(PinnedApp(installed_app_id=app.id))
-            wish_name = (app.custom_name or app.name or "").strip()
-            if wish_name:
-                session.query(NotInstalledApp).filter(NotInstalledApp.name.ilike(wish_name)).delete(
-                    synchronize_session=False
-                )
-            session.commit()
-            return True, f"已收藏: {item.title}"
-        finally:
-            session.close()
+        session.add(PinnedApp(installed_app_id=app.id))
+        wish_name = (app.custom_name or app.name or "").strip()
+        if wish_name:
+            session.query(NotInstalledApp).filter(
+                NotInstalledApp.name_key == normalize_name_key(wish_name)
+            ).delete(synchronize_session=False)
+        return True, f"已收藏: {item.title}"
 
-    def _unpin_item(self, item: UiItem) -> tuple[bool, str]:
+    def _unpin_item(self, session, item: UiItem) -> tuple[bool, str]:
         if item.kind not in {"local", "pinned"}:
             return False, "该类型不支持取消收藏"
 
-        session = get_session(self._engine)
-        try:
-            if item.kind == "pinned":
-                entry = session.get(PinnedApp, item.item_id)
-            else:
-                entry = session.query(PinnedApp).filter_by(installed_app_id=item.item_id).first()
+        if item.kind == "pinned":
+            entry = session.get(PinnedApp, item.item_id)
+        else:
+            entry = session.query(PinnedApp).filter_by(installed_app_id=item.item_id).first()
 
-            if not entry:
-                return False, f"{item.title} 不在收藏中"
+        if not entry:
+            return False, f"{item.title} 不在收藏中"
 
-            session.delete(entry)
-            session.commit()
-            return True, f"已取消收藏: {item.title}"
-        finally:
-            session.close()
+        session.delete(entry)
+        return True, f"已取消收藏: {item.title}"
 
     def _quick_add_wish(
         self,
@@ -302,12 +546,13 @@ class SnapKitService:
         if not title:
             return False, "请填写软件名称"
 
+        title_key = normalize_name_key(title)
         installed = (
             session.query(InstalledApp)
             .filter(
                 or_(
-                    InstalledApp.name.ilike(title),
-                    InstalledApp.custom_name.ilike(title),
+                    InstalledApp.name_key == title_key,
+                    InstalledApp.custom_name_key == title_key,
                 )
             )
             .first()
@@ -317,19 +562,17 @@ class SnapKitService:
             if existing_pin:
                 return True, f"已安装且已收藏: {installed.custom_name or installed.name}"
             session.add(PinnedApp(installed_app_id=installed.id))
-            session.query(NotInstalledApp).filter(NotInstalledApp.name.ilike(title)).delete(
+            session.query(NotInstalledApp).filter(NotInstalledApp.name_key == title_key).delete(
                 synchronize_session=False
             )
-            session.commit()
             return True, f"检测到已安装，已加入收藏: {installed.custom_name or installed.name}"
 
-        wish = session.query(NotInstalledApp).filter(NotInstalledApp.name.ilike(title)).first()
+        wish = session.query(NotInstalledApp).filter(NotInstalledApp.name_key == title_key).first()
         if wish:
             if note:
                 wish.description = note
             if target:
                 wish.download_url = target
-            session.commit()
             return True, f"已更新待安装: {wish.name}"
 
         session.add(
@@ -339,7 +582,6 @@ class SnapKitService:
                 download_url=target or None,
             )
         )
-        session.commit()
         return True, f"已添加待安装: {title}"
 
     def _quick_add_local_app(
@@ -382,7 +624,6 @@ class SnapKitService:
             existing.custom_icon_path = str(icon_candidate)
             existing.display_icon = str(icon_candidate)
             existing.registry_key = existing.registry_key or manual_key
-            session.commit()
             return True, f"已更新本地应用: {title}"
 
         session.add(
@@ -396,7 +637,6 @@ class SnapKitService:
                 registry_key=manual_key,
             )
         )
-        session.commit()
         return True, f"已添加本地应用: {title}"
 
     def _quick_add_website(
@@ -441,7 +681,6 @@ class SnapKitService:
                 existing.name = title
             if note:
                 existing.tags = note
-            session.commit()
             return True, f"{ok_prefix}已存在: {existing.name}"
 
         session.add(
@@ -452,7 +691,6 @@ class SnapKitService:
                 tags=note or None,
             )
         )
-        session.commit()
         return True, f"已添加{ok_prefix}: {title}"
 
 
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from sqlalchemy import bindparam, delete, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from snapkit.core.entities import ActionResult, UiItem
+from snapkit.models import (
+    InstalledApp,
+    NotInstalledApp,
+    PinnedApp,
+    ResourceItem,
+    split_tags,
+    sync_item_tags,
+)
+
+_KIND_MODELS = {
+    "local": InstalledApp,
+    "pinned": PinnedApp,
+    "wish": NotInstalledApp,
+    "resource": ResourceItem,
+}
+
+
+def batch_delete(session: Session, items: list[UiItem]) -> list[ActionResult]:
+    results: list[ActionResult] = []
+    for kind, group in _group_by_kind(items, results, "该类型不支持删除").items():
+        model = _KIND_MODELS[kind]
+        found = _existing_ids(session, model, group)
+        if kind == "local" and found:
+            session.execute(delete(PinnedApp).where(PinnedApp.installed_app_id.in_(found)))
+        if found:
+            session.execute(delete(model).where(model.id.in_(found)))
+        results.extend(_found_results(group, found, "已删除: {title}"))
+    return results
+
+
+def batch_pin(session: Session, items: list[UiItem]) -> list[ActionResult]:
+    results: list[ActionResult] = []
+    local: list[UiItem] = []
+    for item in items:
+        if item.kind == "local":
+            local.append(item)
+        elif item.kind == "pinned":
+            results.append(ActionResult(item.item_id, False, f"{item.title} 已在收藏中"))
+        else:
+            results.append(ActionResult(item.item_id, False, "该类型不支持收藏"))
+    if not local:
+        return results
+
+    ids = [item.item_id for item in local]
+    wish_keys = dict(
+        session.execute(
+            select(
+                InstalledApp.id,
+                func.coalesce(InstalledApp.custom_name_key, InstalledApp.name_key),
+            ).where(InstalledApp.id.in_(ids))
+        ).all()
+    )
+    already = set(
+        session.scalars(select(PinnedApp.installed_app_id).where(PinnedApp.installed_app_id.in_(ids)))
+    )
+    to_pin = [app_id for app_id in ids if app_id in wish_keys and app_id not in already]
+    if to_pin:
+        session.execute(insert(PinnedApp), [{"installed_app_id": app_id} for app_id in to_pin])
+        keys = {wish_keys[app_id] for app_id in to_pin if wish_keys[app_id]}
+        if keys:
+            session.execute(delete(NotInstalledApp).where(NotInstalledApp.name_key.in_(keys)))
+
+    for item in local:
+        if item.item_id not in wish_keys:
+            results.append(ActionResult(item.item_id, False, "项目不存在"))
+        elif item.item_id in already:
+            results.append(ActionResult(item.item_id, False, f"{item.title} 已在收藏中"))
+        else:
+            results.append(ActionResult(item.item_id, True, f"已收藏: {item.title}"))
+    return results
+
+
+def batch_unpin(session: Session, items: list[UiItem]) -> list[ActionResult]:
+    results: list[ActionResult] = []
+    pin_ids = [item.item_id for item in items if item.kind == "pinned"]
+    app_ids = [item.item_id for item in items if item.kind == "local"]
+
+    removed_pins = set(
+        session.scalars(delete(PinnedApp).where(PinnedApp.id.in_(pin_ids)).returning(PinnedApp.id))
+    ) if pin_ids else set()
+    removed_apps = set(
+        session.scalars(
+            delete(PinnedApp)
+            .where(PinnedApp.installed_app_id.in_(app_ids))
+            .returning(PinnedApp.installed_app_id)
+        )
+    ) if app_ids else set()
+
+    for item in items:
+        if item.kind not in {"local", "pinned"}:
+            results.append(ActionResult(item.item_id, False, "该类型不支持取消收藏"))
+        elif item.item_id in (removed_pins if item.kind == "pinned" else removed_apps):
+            results.append(ActionResult(item.item_id, True, f"已取消收藏: {item.title}"))
+        else:
+            results.append(ActionResult(item.item_id, False, f"{item.title} 不在收藏中"))
+    return results
+
+
+def batch_add_tag(session: Session, items: list[UiItem], tag: str) -> list[ActionResult]:
+    results: list[ActionResult] = []
+    names = split_tags(tag)
+    if not names:
+        return [ActionResult(item.item_id, False, "标签不能为空") for item in items]
+
+    for kind, group in _group_by_kind(items, results, "该类型不支持标签").items():
+        model = _KIND_MODELS[kind]
+        ids = [item.item_id for item in group]
+        current = dict(session.execute(select(model.id, model.tags).where(model.id.in_(ids))).all())
+        changes = []
+        for row_id, text in current.items():
+            existing = split_tags(text)
+            merged = existing + [name for name in names if name not in existing]
+            if merged != existing:
+                changes.append({"row_id": row_id, "tags": ",".join(merged)})
+        if changes:
+            session.connection().execute(
+                update(model.__table__)
+                .where(model.__table__.c.id == bindparam("row_id"))
+                .values(tags=bindparam("tags")),
+                changes,
+            )
+            sync_item_tags(
+                session.connection(),
+                [(model.tag_kind, change["row_id"], change["tags"]) for change in changes],
+            )
+        results.extend(_found_results(group, set(current), f"已添加标签 {', '.join(names)}: {{title}}"))
+    return results
+
+
+def batch_set_custom_icon(session: Session, items: list[UiItem], icon_path: str) -> list[ActionResult]:
+    results: list[ActionResult] = []
+    app_ids: dict[int, int] = {}
+    for item in items:
+        if item.kind == "local":
+            app_ids[item.item_id] = item.item_id
+        elif item.kind == "pinned" and item.linked_app_id is not None:
+            app_ids[item.item_id] = item.linked_app_id
+        else:
+            results.append(ActionResult(item.item_id, False, "该类型不支持自定义图标"))
+
+    found = set(
+        session.scalars(
+            update(InstalledApp)
+            .where(InstalledApp.id.in_(set(app_ids.values())))
+            .values(custom_icon_path=icon_path)
+            .returning(InstalledApp.id)
+        )
+    ) if app_ids else set()
+
+    for item in items:
+        if item.item_id not in app_ids:
+            continue
+        if app_ids[item.item_id] in found:
+            results.append(ActionResult(item.item_id, True, f"已设置自定义图标: {item.title}"))
+        else:
+            results.append(ActionResult(item.item_id, False, "项目不存在"))
+    return results
+
+
+def _group_by_kind(
+    items: Iterable[UiItem], results: list[ActionResult], unsupported: str
+) -> dict[str, list[UiItem]]:
+    groups: dict[str, list[UiItem]] = {}
+    for item in items:
+        if item.kind in _KIND_MODELS:
+            groups.setdefault(item.kind, []).append(item)
+        else:
+            results.append(ActionResult(item.item_id, False, unsupported))
+    return groups
+
+
+def _existing_ids(session: Session, model, items: list[UiItem]) -> set[int]:
+    ids = [item.item_id for item in items]
+    return set(session.scalars(select(model.id).where(model.id.in_(ids))))
+
+
+def _found_results(items: list[UiItem], found: set[int], template: str) -> list[ActionResult]:
+    return [
+        ActionResult(item.item_id, True, template.format(title=item.title))
+        if item.item_id in found
+        else ActionResult(item.item_id, False, "项目不存在")
+        for item in items
+    ]
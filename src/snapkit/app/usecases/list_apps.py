@@ -20,21 +20,37 @@ def list_items(
     search: str = "",
     limit: int = 300,
     local_filter: str = "all",
+    after: str | None = None,
+    tag: str | None = None,
 ) -> tuple[str, str, list[UiItem]]:
     title, subtitle = VIEW_META[view_id]
 
     if view_id == "local_scan":
         return title, subtitle, repo.list_installed(
-            search=search, limit=limit, pinned_filter=local_filter
+            search=search, limit=limit, pinned_filter=local_filter, after=after, tag=tag
         )
     if view_id == "installed":
-        return title, subtitle, repo.list_pinned(search=search, limit=limit)
+        return title, subtitle, repo.list_pinned(search=search, limit=limit, after=after, tag=tag)
     if view_id == "not_installed":
-        return title, subtitle, repo.list_not_installed(search=search, limit=limit)
+        return title, subtitle, repo.list_not_installed(
+            search=search, limit=limit, after=after, tag=tag
+        )
 
     resource_type = view_id.replace("resource_", "")
     return title, subtitle, repo.list_resources(
         resource_type=resource_type,
         search=search,
         limit=limit,
+        after=after,
+        tag=tag,
     )
+
+
+def list_tag_facets(repo: ToolboxRepository, view_id: ViewId) -> list[tuple[str, int]]:
+    if view_id == "local_scan":
+        return repo.tag_facets("local")
+    if view_id == "installed":
+        return repo.tag_facets("pinned")
+    if view_id == "not_installed":
+        return repo.tag_facets("wish")
+    return repo.tag_facets("resource", resource_type=view_id.replace("resource_", ""))
@@ -0,0 +1,244 @@
+"""Apply many CLI-style edits in one process for ``snapkit batch``.
+
+Each input line is either a command as it would be typed after ``snapkit``::
+
+    add-resource "Quarterly report" C:\\Docs\\q3.pdf --type file --tags work,finance
+
+or a JSON object naming the command in ``op``::
+
+    {"op": "add-resource", "name": "Quarterly report", "path": "C:\\\\Docs\\\\q3.pdf"}
+
+Blank lines and lines starting with ``#`` are skipped. Records are committed
+in chunks; a chunk the database rejects is replayed one record per
+transaction so every line still gets its own result.
+"""
+
+from __future__ import annotations
+
+import json
+import shlex
+from collections.abc import Iterable, Iterator
+from typing import NamedTuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from snapkit.db import bump_write_generation
+from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
+
+DEFAULT_CHUNK_SIZE = 500
+RESOURCE_TYPES = ("file", "folder", "url")
+
+# op -> (positional fields, {option flag: field}, integer fields)
+_COMMANDS: dict[str, tuple[tuple[str, ...], dict[str, str], tuple[str, ...]]] = {
+    "add-resource": (("name", "path"), {"--type": "type", "--tags": "tags"}, ()),
+    "add-notinstalled": (
+        ("name",),
+        {"--url": "url", "--desc": "description", "--tags": "tags"},
+        (),
+    ),
+    "pin": (("app_id",), {}, ("app_id",)),
+    "unpin": (("pin_id",), {}, ("pin_id",)),
+    "set-launch": (("pin_id", "command"), {}, ("pin_id",)),
+}
+BATCH_OPS = tuple(_COMMANDS)
+
+
+class BatchError(ValueError):
+    """A batch record that cannot be parsed or applied."""
+
+
+class BatchResult(NamedTuple):
+    line: int
+    ok: bool
+    op: str | None = None
+    id: int | None = None
+    error: str | None = None
+
+
+def parse_line(text: str) -> dict | None:
+    """Turn one input line into a record dict with an ``op`` key; ``None`` for blank lines."""
+    text = text.strip()
+    if not text or text.startswith("#"):
+        return None
+    if text.startswith("{"):
+        try:
+            record = json.loads(text)
+        except ValueError as exc:
+            raise BatchError(f"invalid JSON: {exc}") from None
+        if not isinstance(record, dict):
+            raise BatchError("JSON record must be an object")
+        return _validate(dict(record))
+    return _validate(_parse_command(text))
+
+
+def _parse_command(text: str) -> dict:
+    if '"' in text or "'" in text:
+        lexer = shlex.shlex(text, posix=True)
+        lexer.whitespace_split = True
+        lexer.escape = ""  # keep Windows paths intact; quote arguments that contain spaces
+        try:
+            words = list(lexer)
+        except ValueError as exc:
+            raise BatchError(str(exc)) from None
+    else:
+        words = text.split()  # shlex is ~20x slower and most generated lines need no quoting
+    if words and words[0] == "snapkit":
+        words = words[1:]
+    if not words:
+        raise BatchError("missing command")
+
+    op, args = words[0], words[1:]
+    if op not in _COMMANDS:
+        raise BatchError(f"unsupported command {op!r}")
+    positional_fields, options, _ = _COMMANDS[op]
+
+    record: dict = {"op": op}
+    positional: list[str] = []
+    index = 0
+    while index < len(args):
+        word = args[index]
+        flag, has_value, value = word.partition("=")
+        if flag in options:
+            if not has_value:
+                index += 1
+                if index >= len(args):
+                    raise BatchError(f"option {flag} needs a value")
+                value = args[index]
+            record[options[flag]] = value
+        elif word.startswith("--"):
+            raise BatchError(f"unknown option {flag!r} for {op}")
+        else:
+            positional.append(word)
+        index += 1
+
+    if len(positional) > len(positional_fields):
+        raise BatchError(f"too many arguments for {op}")
+    record.update(zip(positional_fields, positional))
+    return record
+
+
+def _validate(record: dict) -> dict:
+    op = record.get("op")
+    if op not in _COMMANDS:
+        raise BatchError(f"unsupported command {op!r}")
+    positional_fields, options, integer_fields = _COMMANDS[op]
+
+    allowed = {"op", *positional_fields, *options.values()}
+    unknown = sorted(set(record) - allowed)
+    if unknown:
+        raise BatchError(f"unknown field(s) for {op}: {', '.join(unknown)}")
+    missing = [name for name in positional_fields if record.get(name) in (None, "")]
+    if missing:
+        raise BatchError(f"missing {', '.join(missing)} for {op}")
+
+    for name in integer_fields:
+        try:
+            record[name] = int(record[name])
+        except (TypeError, ValueError):
+            raise BatchError(f"{name} must be an integer") from None
+    if op == "add-resource":
+        record.setdefault("type", "file")
+        if record["type"] not in RESOURCE_TYPES:
+            raise BatchError(f"type must be one of: {', '.join(RESOURCE_TYPES)}")
+    return record
+
+
+def run_batch(
+    session: Session,
+    lines: Iterable[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[BatchResult]:
+    """Apply every record in *lines*, committing once per *chunk_size* records.
+
+    Results are yielded in input order as each chunk is committed, so callers
+    can report progress on long inputs.
+    """
+    chunk: list[tuple[int, dict | None, str | None]] = []
+    for number, text in enumerate(lines, 1):
+        try:
+            record = parse_line(text)
+        except BatchError as exc:
+            chunk.append((number, None, str(exc)))
+        else:
+            if record is None:
+                continue
+            chunk.append((number, record, None))
+        if len(chunk) >= chunk_size:
+            yield from _run_chunk(session, chunk)
+            chunk = []
+    if chunk:
+        yield from _run_chunk(session, chunk)
+
+
+def _run_chunk(session: Session, chunk: list[tuple[int, dict | None, str | None]]) -> list[BatchResult]:
+    applied = []
+    try:
+        for number, record, error in chunk:
+            if error is None:
+                try:
+                    target = _apply(session, record)
+                except BatchError as exc:
+                    error = str(exc)
+            op = record["op"] if record else None
+            applied.append((number, op, None if error else target, error))
+        session.flush()
+        results = [
+            BatchResult(number, False, op, error=error)
+            if error
+            else BatchResult(number, True, op, target if isinstance(target, int) else target.id)
+            for number, op, target, error in applied
+        ]
+        session.commit()
+    except SQLAlchemyError as exc:
+        session.rollback()
+        if len(chunk) > 1:
+            return [result for item in chunk for result in _run_chunk(session, [item])]
+        number, record, _ = chunk[0]
+        op = record["op"] if record else None
+        return [BatchResult(number, False, op, error=str(getattr(exc, "orig", None) or exc))]
+
+    if any(result.ok for result in results):
+        bump_write_generation(session.get_bind())
+    return results
+
+
+def _apply(session: Session, record: dict):
+    """Stage one record; returns the new or changed ORM object, or the id of a deleted row."""
+    op = record["op"]
+    if op == "add-resource":
+        entry = ResourceItem(
+            name=record["name"],
+            path=record["path"],
+            resource_type=record["type"],
+            tags=record.get("tags"),
+        )
+        session.add(entry)
+        return entry
+    if op == "add-notinstalled":
+        entry = NotInstalledApp(
+            name=record["name"],
+            download_url=record.get("url"),
+            description=record.get("description"),
+            tags=record.get("tags"),
+        )
+        session.add(entry)
+        return entry
+    if op == "pin":
+        app_id = record["app_id"]
+        if session.get(InstalledApp, app_id) is None:
+            raise BatchError(f"no installed app with ID {app_id}")
+        if session.query(PinnedApp).filter_by(installed_app_id=app_id).first() is not None:
+            raise BatchError(f"installed app {app_id} is already pinned")
+        entry = PinnedApp(installed_app_id=app_id)
+        session.add(entry)
+        return entry
+
+    entry = session.get(PinnedApp, record["pin_id"])
+    if entry is None:
+        raise BatchError(f"no pinned entry with ID {record['pin_id']}")
+    if op == "unpin":
+        session.delete(entry)
+        return entry.id
+    entry.launch_command = record["command"]
+    return entry
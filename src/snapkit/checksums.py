@@ -0,0 +1,170 @@
+"""Per-entry checksums for bundles and ``snapkit bundle verify``.
+
+Every bundle written by this version ends with ``checksums.json``, mapping
+each other entry to the SHA-256 and size of its uncompressed contents. The
+exporter fills it in as it writes, from digests it already has, so no entry
+is read twice. Verification hashes entries on a thread pool, streaming each
+one out of the archive; zlib, bz2, lzma and hashlib all release the GIL
+while they work.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import lzma
+import os
+import threading
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import NamedTuple
+from zipfile import ZipFile
+
+from snapkit.progress import CancelToken, ProgressCallback, ProgressReporter
+
+CHECKSUMS = "checksums.json"
+CHECKSUMS_FORMAT = "snapkit-checksums"
+CHECKSUMS_VERSION = 1
+_READ_CHUNK = 1 << 20
+
+
+class EntryCheck(NamedTuple):
+    name: str
+    ok: bool
+    error: str | None = None
+
+
+class HashingWriter:
+    """Wraps a binary stream, hashing and counting everything written through it."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._digest = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        self.size += len(data)
+        return self._stream.write(data)
+
+    def checksum(self) -> dict:
+        return {"sha256": self._digest.hexdigest(), "size": self.size}
+
+
+def checksum_bytes(data: bytes) -> dict:
+    return {"sha256": hashlib.sha256(data).hexdigest(), "size": len(data)}
+
+
+def write_checksums(zf: ZipFile, entries: dict[str, dict]) -> None:
+    """Add the checksum manifest for *entries* (name -> ``{"sha256", "size"}``) to *zf*."""
+    document = {"format": CHECKSUMS_FORMAT, "version": CHECKSUMS_VERSION, "entries": entries}
+    zf.writestr(CHECKSUMS, json.dumps(document, indent=1, sort_keys=True))
+
+
+def read_checksums(zf: ZipFile) -> dict[str, dict]:
+    """Return the expected checksum per entry; ``ValueError`` if the bundle has none."""
+    try:
+        document = json.loads(zf.read(CHECKSUMS))
+    except KeyError:
+        raise ValueError("bundle has no checksum manifest; it predates per-entry checksums") from None
+    if not isinstance(document, dict) or document.get("format") != CHECKSUMS_FORMAT:
+        raise ValueError(f"{CHECKSUMS} is not a SnapKit checksum manifest")
+    if document.get("version", 0) > CHECKSUMS_VERSION:
+        raise ValueError(f"checksum manifest version {document['version']} is newer than this SnapKit supports")
+    return document["entries"]
+
+
+def verify_bundle(
+    zip_path: Path,
+    entries: list[str] | None = None,
+    workers: int | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+) -> list[EntryCheck]:
+    """Check entries of *zip_path* against its checksum manifest.
+
+    Args:
+        zip_path: Bundle to check.
+        entries: Entry names or glob patterns (``blobs/3f*``) to check; only
+                 those entries are read. ``None`` checks every entry.
+        workers: Hashing threads (default: one per CPU, at most 8).
+        progress: Called with a ``Progress`` per entry of the ``verify`` phase.
+        cancel: Token that stops verification at the next entry.
+
+    Returns:
+        One ``EntryCheck`` per checked entry, in name order, plus a failed
+        check for each pattern that matched nothing.
+    """
+    reporter = ProgressReporter(progress, cancel)
+    with ZipFile(zip_path) as zf:
+        expected = read_checksums(zf)
+        present = {info.filename for info in zf.infolist() if not info.is_dir()} - {CHECKSUMS}
+
+    names = sorted(present | set(expected))
+    checks: list[EntryCheck] = []
+    if entries is not None:
+        selected: set[str] = set()
+        for pattern in entries:
+            matched = fnmatch.filter(names, pattern)
+            if not matched:
+                checks.append(EntryCheck(pattern, False, "no such entry"))
+            selected.update(matched)
+        names = sorted(selected)
+
+    to_hash = []
+    for name in names:
+        if name not in present:
+            checks.append(EntryCheck(name, False, "missing from archive"))
+        elif name not in expected:
+            checks.append(EntryCheck(name, False, "not in checksum manifest"))
+        else:
+            to_hash.append(name)
+
+    reporter.start("verify", len(to_hash))
+    local = threading.local()
+    opened: list[ZipFile] = []
+    opened_lock = threading.Lock()
+
+    def check(name: str) -> EntryCheck:
+        # One handle per thread; a shared ZipFile serializes reads on its lock.
+        if not hasattr(local, "zf"):
+            local.zf = ZipFile(zip_path)
+            with opened_lock:
+                opened.append(local.zf)
+        return _check_entry(local.zf, name, expected[name])
+
+    workers = workers or min(8, os.cpu_count() or 1)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                for result in pool.map(check, to_hash):
+                    checks.append(result)
+                    reporter.advance()
+            except BaseException:
+                pool.shutdown(cancel_futures=True)
+                raise
+    finally:
+        for handle in opened:
+            handle.close()
+    return sorted(checks, key=lambda check: check.name)
+
+
+def _check_entry(zf: ZipFile, name: str, expected: dict) -> EntryCheck:
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with zf.open(name) as src:
+            while chunk := src.read(_READ_CHUNK):
+                digest.update(chunk)
+                size += len(chunk)
+    except (zipfile.BadZipFile, zlib.error, lzma.LZMAError, OSError, EOFError, ValueError) as exc:
+        # zipfile checks each entry's CRC-32 as the last chunk is read.
+        return EntryCheck(name, False, f"unreadable: {exc}")
+    if size != expected.get("size"):
+        return EntryCheck(name, False, f"size {size} != {expected.get('size')}")
+    if digest.hexdigest() != expected.get("sha256"):
+        return EntryCheck(name, False, "SHA-256 mismatch")
+    return EntryCheck(name, True)
@@ -1,32 +1,133 @@
 """Typer CLI for SnapKit."""
 
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from snapkit.db import get_engine, get_session, init_db
+# rich, SQLAlchemy and the ORM models are imported inside the commands that
+# use them; `snapkit run` should not pay for any of them.
 
 app = typer.Typer(help="SnapKit – Windows personal toolbox / launcher.")
-console = Console()
+
+
+class _LazyConsole:
+    """Stands in for ``rich.console.Console`` until something is printed."""
+
+    _console = None
+
+    def __getattr__(self, name: str):
+        if _LazyConsole._console is None:
+            from rich.console import Console
+
+            _LazyConsole._console = Console()
+        return getattr(_LazyConsole._console, name)
+
+
+console = _LazyConsole()
+
+
+@contextmanager
+def use_console(replacement):
+    """Send ``console`` output to *replacement* for the duration of the block."""
+    previous = _LazyConsole._console
+    _LazyConsole._console = replacement
+    try:
+        yield replacement
+    finally:
+        _LazyConsole._console = previous
+
+
+@contextmanager
+def use_caller(cwd: str | None, env: dict[str, str] | None):
+    """Launch apps in *cwd* with *env*, the client's, for the duration of the block."""
+    global _caller
+    previous = _caller
+    _caller = (cwd, env)
+    try:
+        yield
+    finally:
+        _caller = previous
+
 
 _engine = None
+# The resident daemon keeps these warm: a caching ``launcher.ExeResolver``
+# and a prebuilt ``launch_index.LaunchIndex``.
+_exe_resolver = None
+_launch_index = None
+# (cwd, env) of the client the daemon is serving; None launches in this process's own.
+_caller = None
 
 
 def _get_engine():
     global _engine
     if _engine is None:
+        from snapkit.db import get_engine, init_db
+
         _engine = get_engine()
         init_db(_engine)
     return _engine
 
 
 def _session():
+    from snapkit.db import get_session
+
     return get_session(_get_engine())
 
 
+def _json_option():
+    return typer.Option(False, "--json", help="Stream rows as a JSON array instead of a table.")
+
+
+def _jsonl_option():
+    return typer.Option(False, "--jsonl", help="Stream rows as JSON Lines instead of a table.")
+
+
+def _output_format(as_json: bool, as_jsonl: bool) -> str | None:
+    if as_json and as_jsonl:
+        console.print("[red]Use either --json or --jsonl, not both.[/red]")
+        raise typer.Exit(2)
+    return "json" if as_json else "jsonl" if as_jsonl else None
+
+
+def _stream_json(session, statement, fmt: str, batch_size: int = 500) -> int:
+    """Write rows of *statement* to stdout as they are fetched; returns the row count.
+
+    Rows come from a ``yield_per`` cursor, so memory stays flat however large
+    the result is, and the first row is flushed as soon as it is read.
+    """
+    import json
+    import sys
+    from datetime import datetime
+
+    def default(value):
+        if isinstance(value, datetime):
+            return value.isoformat()
+        raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+    out = sys.stdout
+    result = session.execute(statement.execution_options(yield_per=batch_size))
+    keys = list(result.keys())
+    count = 0
+    if fmt == "json":
+        out.write("[")
+    for row in result:
+        line = json.dumps(dict(zip(keys, row)), ensure_ascii=False, default=default)
+        if fmt == "json":
+            out.write(",\n" if count else "\n")
+        out.write(line)
+        if fmt == "jsonl":
+            out.write("\n")
+        count += 1
+        if count == 1:
+            out.flush()
+    if fmt == "json":
+        out.write("\n]\n" if count else "]\n")
+    out.flush()
+    return count
+
+
 # ── Phase 2: Scan / List ──────────────────────────────────────────────
 
 
@@ -69,29 +170,52 @@ def scan(
 @app.command("list-installed")
 def list_installed(
     tag: Optional[str] = typer.Option(None, "--tag", help="Filter by tag"),
+    as_json: bool = _json_option(),
+    as_jsonl: bool = _jsonl_option(),
 ):
     """List all installed apps in the database."""
-    from snapkit.models import InstalledApp
-
-    session = _session()
-    query = session.query(InstalledApp)
-    if tag:
-        query = query.filter(InstalledApp.tags.contains(tag))
-    apps = query.order_by(InstalledApp.name).all()
-
-    if not apps:
-        console.print("[yellow]No installed apps found. Run 'scan' first.[/yellow]")
-        return
-
-    table = Table(title="Installed Apps")
-    table.add_column("ID", style="dim")
-    table.add_column("Name", style="bold")
-    table.add_column("Publisher")
-    table.add_column("Version")
-    table.add_column("Tags")
-    for a in apps:
-        table.add_row(str(a.id), a.name, a.publisher or "", a.version or "", a.tags or "")
-    console.print(table)
+    from snapkit.models import InstalledApp, tag_filter
+
+    fmt = _output_format(as_json, as_jsonl)
+    with _session() as session:
+        if fmt:
+            from sqlalchemy import select
+
+            statement = select(
+                InstalledApp.id,
+                InstalledApp.name,
+                InstalledApp.custom_name,
+                InstalledApp.publisher,
+                InstalledApp.version,
+                InstalledApp.install_location,
+                InstalledApp.tags,
+                InstalledApp.scanned_at,
+            ).order_by(InstalledApp.name, InstalledApp.id)
+            if tag:
+                statement = statement.where(tag_filter(InstalledApp, tag))
+            _stream_json(session, statement, fmt)
+            return
+
+        from rich.table import Table
+
+        query = session.query(InstalledApp)
+        if tag:
+            query = query.filter(tag_filter(InstalledApp, tag))
+        apps = query.order_by(InstalledApp.name).all()
+
+        if not apps:
+            console.print("[yellow]No installed apps found. Run 'scan' first.[/yellow]")
+            return
+
+        table = Table(title="Installed Apps")
+        table.add_column("ID", style="dim")
+        table.add_column("Name", style="bold")
+        table.add_column("Publisher")
+        table.add_column("Version")
+        table.add_column("Tags")
+        for a in apps:
+            table.add_row(str(a.id), a.name, a.publisher or "", a.version or "", a.tags or "")
+        console.print(table)
 
 
 # ── Phase 3: Pin / Launch ─────────────────────────────────────────────
@@ -156,58 +280,177 @@ def set_launch(
 
 
 @app.command("list-pinned")
-def list_pinned():
+def list_pinned(
+    as_json: bool = _json_option(),
+    as_jsonl: bool = _jsonl_option(),
+):
     """List all pinned apps."""
-    from snapkit.models import PinnedApp
-
-    session = _session()
-    pins = session.query(PinnedApp).all()
-
-    if not pins:
-        console.print("[yellow]No pinned apps. Use 'pin <app_id>' to pin one.[/yellow]")
-        return
+    from snapkit.models import InstalledApp, PinnedApp
 
-    table = Table(title="Pinned Apps")
-    table.add_column("Pin ID", style="dim")
-    table.add_column("App Name", style="bold")
-    table.add_column("Launch Command")
-    table.add_column("Tags")
-    for p in pins:
-        table.add_row(
-            str(p.id),
-            p.installed_app.name,
-            p.launch_command or "(auto)",
-            p.tags or "",
-        )
-    console.print(table)
+    fmt = _output_format(as_json, as_jsonl)
+    with _session() as session:
+        if fmt:
+            from sqlalchemy import select
+
+            statement = (
+                select(
+                    PinnedApp.id,
+                    PinnedApp.installed_app_id,
+                    InstalledApp.name,
+                    PinnedApp.launch_command,
+                    PinnedApp.tags,
+                    PinnedApp.pinned_at,
+                )
+                .join(InstalledApp, PinnedApp.installed_app_id == InstalledApp.id)
+                .order_by(PinnedApp.id)
+            )
+            _stream_json(session, statement, fmt)
+            return
+
+        from rich.table import Table
+
+        pins = session.query(PinnedApp).all()
+
+        if not pins:
+            console.print("[yellow]No pinned apps. Use 'pin <app_id>' to pin one.[/yellow]")
+            return
+
+        table = Table(title="Pinned Apps")
+        table.add_column("Pin ID", style="dim")
+        table.add_column("App Name", style="bold")
+        table.add_column("Launch Command")
+        table.add_column("Tags")
+        for p in pins:
+            table.add_row(
+                str(p.id),
+                p.installed_app.name,
+                p.launch_command or "(auto)",
+                p.tags or "",
+            )
+        console.print(table)
 
 
 @app.command()
-def run(pin_id: int = typer.Argument(..., help="Pinned app ID to launch")):
-    """Launch a pinned app."""
+def run(
+    target: Optional[str] = typer.Argument(
+        None, help="Pinned app ID, or part of an app name to launch the best match"
+    ),
+    pick: bool = typer.Option(False, "--pick", help="Choose interactively, filtering as you type."),
+):
+    """Launch a pinned app by ID, or the best-ranked app matching a name."""
     from snapkit.launcher import infer_exe, launch_app
-    from snapkit.models import PinnedApp
 
-    session = _session()
-    entry = session.get(PinnedApp, pin_id)
-    if not entry:
-        console.print(f"[red]No pinned entry with ID {pin_id}.[/red]")
-        raise typer.Exit(1)
+    if target and target.isdigit() and not pick:
+        entry = _pinned_launch(int(target))
+        if not entry:
+            console.print(f"[red]No pinned entry with ID {target}.[/red]")
+            raise typer.Exit(1)
+        app_id, pin_id, title = entry.installed_app_id, entry.pin_id, entry.name
+    else:
+        candidate = _find_launch_candidate(target or "", pick)
+        app_id, pin_id, title = candidate.installed_app_id, candidate.pin_id, candidate.title
+        entry = candidate
 
     command = entry.launch_command
     if not command:
-        loc = entry.installed_app.install_location
-        exe = infer_exe(loc, entry.installed_app.name) if loc else None
+        loc = entry.install_location
+        resolve = _exe_resolver or infer_exe
+        exe = resolve(loc, entry.name) if loc else None
         if not exe:
-            console.print(
-                f"[red]Cannot infer exe for {entry.installed_app.name!r}. "
-                f"Use 'set-launch {pin_id} <command>' to set manually.[/red]"
-            )
+            hint = f"'set-launch {pin_id} <command>'" if pin_id else f"'pin {app_id}' and then 'set-launch'"
+            console.print(f"[red]Cannot infer exe for {title!r}. Use {hint} to set manually.[/red]")
             raise typer.Exit(1)
         command = exe
 
-    console.print(f"Launching {entry.installed_app.name!r} → {command}")
-    launch_app(command)
+    console.print(f"Launching {title!r} → {command}")
+    cwd, env = _caller or (None, None)
+    launch_app(command, cwd=cwd, env=env)
+    _record_launch(app_id)
+
+
+def _pinned_launch(pin_id: int):
+    """Look the pin up with plain sqlite3, falling back to the ORM when that can't be trusted."""
+    from snapkit.fastpath import FastPathUnavailable, PinnedLaunch, lookup_pinned_launch
+
+    if _engine is None:
+        try:
+            return lookup_pinned_launch(pin_id)
+        except FastPathUnavailable:
+            pass
+
+    from snapkit.models import PinnedApp
+
+    with _session() as session:
+        entry = session.get(PinnedApp, pin_id)
+        if not entry:
+            return None
+        app_entry = entry.installed_app
+        return PinnedLaunch(
+            entry.id, app_entry.id, app_entry.name, entry.launch_command, app_entry.install_location
+        )
+
+
+def _find_launch_candidate(query: str, interactive: bool):
+    query = query.strip()
+    index = _get_launch_index()
+    if interactive:
+        from snapkit.picker import pick
+
+        def label(candidate):
+            return f"{candidate.title}  [pinned]" if candidate.pin_id else candidate.title
+
+        choice = pick(lambda text: index.search(text), label=label, query=query)
+        if choice is None:
+            console.print("[yellow]Cancelled.[/yellow]")
+            raise typer.Exit(1)
+        return choice
+
+    if not query:
+        console.print("[red]Give a pin ID or part of an app name, or use --pick.[/red]")
+        raise typer.Exit(1)
+    hits = index.search(query, limit=1)
+    if not hits:
+        console.print(f"[red]No app matches {query!r}.[/red]")
+        raise typer.Exit(1)
+    return hits[0]
+
+
+@contextmanager
+def _dbapi_connection(readonly: bool = True):
+    """A raw sqlite3 connection: straight to the file when possible, else via the engine."""
+    from snapkit.fastpath import FastPathUnavailable, connect
+
+    conn = None
+    if _engine is None:
+        try:
+            conn = connect(readonly=readonly)
+        except FastPathUnavailable:
+            pass
+    if conn is None:
+        conn = _get_engine().raw_connection()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+
+def _get_launch_index():
+    if _launch_index is not None:
+        return _launch_index
+
+    from snapkit.launch_index import load_launch_index
+
+    with _dbapi_connection() as conn:
+        return load_launch_index(conn)
+
+
+def _record_launch(installed_app_id: int):
+    from snapkit.launch_index import record_launch
+
+    with _dbapi_connection(readonly=False) as conn:
+        when = record_launch(conn, installed_app_id)
+    if _launch_index is not None:
+        _launch_index.note_launch(installed_app_id, when)
 
 
 # ── Phase 4: Not-installed apps / Resources ──────────────────────────
@@ -233,29 +476,50 @@ def add_notinstalled(
 @app.command("list-notinstalled")
 def list_notinstalled(
     tag: Optional[str] = typer.Option(None, "--tag", help="Filter by tag"),
+    as_json: bool = _json_option(),
+    as_jsonl: bool = _jsonl_option(),
 ):
     """List not-installed apps."""
-    from snapkit.models import NotInstalledApp
-
-    session = _session()
-    query = session.query(NotInstalledApp)
-    if tag:
-        query = query.filter(NotInstalledApp.tags.contains(tag))
-    apps = query.order_by(NotInstalledApp.name).all()
-
-    if not apps:
-        console.print("[yellow]No not-installed apps tracked.[/yellow]")
-        return
-
-    table = Table(title="Not-Installed Apps")
-    table.add_column("ID", style="dim")
-    table.add_column("Name", style="bold")
-    table.add_column("Download URL")
-    table.add_column("Description")
-    table.add_column("Tags")
-    for a in apps:
-        table.add_row(str(a.id), a.name, a.download_url or "", a.description or "", a.tags or "")
-    console.print(table)
+    from snapkit.models import NotInstalledApp, tag_filter
+
+    fmt = _output_format(as_json, as_jsonl)
+    with _session() as session:
+        if fmt:
+            from sqlalchemy import select
+
+            statement = select(
+                NotInstalledApp.id,
+                NotInstalledApp.name,
+                NotInstalledApp.download_url,
+                NotInstalledApp.description,
+                NotInstalledApp.tags,
+                NotInstalledApp.added_at,
+            ).order_by(NotInstalledApp.name, NotInstalledApp.id)
+            if tag:
+                statement = statement.where(tag_filter(NotInstalledApp, tag))
+            _stream_json(session, statement, fmt)
+            return
+
+        from rich.table import Table
+
+        query = session.query(NotInstalledApp)
+        if tag:
+            query = query.filter(tag_filter(NotInstalledApp, tag))
+        apps = query.order_by(NotInstalledApp.name).all()
+
+        if not apps:
+            console.print("[yellow]No not-installed apps tracked.[/yellow]")
+            return
+
+        table = Table(title="Not-Installed Apps")
+        table.add_column("ID", style="dim")
+        table.add_column("Name", style="bold")
+        table.add_column("Download URL")
+        table.add_column("Description")
+        table.add_column("Tags")
+        for a in apps:
+            table.add_row(str(a.id), a.name, a.download_url or "", a.description or "", a.tags or "")
+        console.print(table)
 
 
 @app.command("add-resource")
@@ -282,29 +546,50 @@ def add_resource(
 @app.command("list-resources")
 def list_resources(
     tag: Optional[str] = typer.Option(None, "--tag", help="Filter by tag"),
+    as_json: bool = _json_option(),
+    as_jsonl: bool = _jsonl_option(),
 ):
     """List tracked resources."""
-    from snapkit.models import ResourceItem
-
-    session = _session()
-    query = session.query(ResourceItem)
-    if tag:
-        query = query.filter(ResourceItem.tags.contains(tag))
-    items = query.order_by(ResourceItem.name).all()
-
-    if not items:
-        console.print("[yellow]No resources tracked.[/yellow]")
-        return
-
-    table = Table(title="Resources")
-    table.add_column("ID", style="dim")
-    table.add_column("Name", style="bold")
-    table.add_column("Type")
-    table.add_column("Path")
-    table.add_column("Tags")
-    for r in items:
-        table.add_row(str(r.id), r.name, r.resource_type, r.path, r.tags or "")
-    console.print(table)
+    from snapkit.models import ResourceItem, tag_filter
+
+    fmt = _output_format(as_json, as_jsonl)
+    with _session() as session:
+        if fmt:
+            from sqlalchemy import select
+
+            statement = select(
+                ResourceItem.id,
+                ResourceItem.name,
+                ResourceItem.resource_type,
+                ResourceItem.path,
+                ResourceItem.tags,
+                ResourceItem.added_at,
+            ).order_by(ResourceItem.name, ResourceItem.id)
+            if tag:
+                statement = statement.where(tag_filter(ResourceItem, tag))
+            _stream_json(session, statement, fmt)
+            return
+
+        from rich.table import Table
+
+        query = session.query(ResourceItem)
+        if tag:
+            query = query.filter(tag_filter(ResourceItem, tag))
+        items = query.order_by(ResourceItem.name).all()
+
+        if not items:
+            console.print("[yellow]No resources tracked.[/yellow]")
+            return
+
+        table = Table(title="Resources")
+        table.add_column("ID", style="dim")
+        table.add_column("Name", style="bold")
+        table.add_column("Type")
+        table.add_column("Path")
+        table.add_column("Tags")
+        for r in items:
+            table.add_row(str(r.id), r.name, r.resource_type, r.path, r.tags or "")
+        console.print(table)
 
 
 @app.command("open-resource")
@@ -338,16 +623,114 @@ def open_resource(res_id: int = typer.Argument(..., help="Resource ID to open"))
 
 # ── Phase 5: Export / Import ──────────────────────────────────────────
 
+_PHASE_LABELS = {
+    "hash": "Hashing files",
+    "records": "Records",
+    "snapshot": "Copying database",
+    "files": "Files",
+    "verify": "Verifying",
+}
+
+
+@contextmanager
+def _progress_bar():
+    """Show a Rich progress bar per phase; yields the ``progress`` callback to pass along."""
+    from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
+
+    console.file  # any attribute access creates the real console
+    tasks: dict[str, int] = {}
+    with Progress(
+        TextColumn("{task.description:<16}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=_LazyConsole._console,
+        transient=True,
+    ) as bar:
+
+        def update(event):
+            if event.phase not in tasks:
+                tasks[event.phase] = bar.add_task(_PHASE_LABELS.get(event.phase, event.phase), total=event.total)
+            bar.update(tasks[event.phase], completed=event.done, total=event.total)
+
+        yield update
+
+
 
 @app.command("export")
 def export_cmd(
     output: str = typer.Argument("snapkit_export.zip", help="Output zip file path"),
+    base: Optional[str] = typer.Option(
+        None, "--base", help="Earlier bundle to build on; only files it lacks are stored."
+    ),
+    compression: str = typer.Option(
+        "deflate", "--compression", help="store, deflate, bzip2 or lzma (zstd on Python 3.14+)."
+    ),
+    level: Optional[int] = typer.Option(None, "--level", help="Compression level."),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", min=1, help="Compression processes (default: one per CPU)."
+    ),
+    snapshot: bool = typer.Option(
+        False, "--snapshot", help="Package a copy of the whole database instead of per-record JSON."
+    ),
+    views: Optional[list[str]] = typer.Option(
+        None, "--view", help="Only export this GUI view (local_scan, installed, resource_url, ...)."
+    ),
+    resource_ids: Optional[list[int]] = typer.Option(None, "--id", help="Only export this resource."),
+    resource_types: Optional[list[str]] = typer.Option(
+        None, "--type", help="Only export resources of this type (file, folder, url, ...)."
+    ),
+    tags: Optional[list[str]] = typer.Option(None, "--tag", help="Only export rows carrying this tag."),
+    dry_run: bool = typer.Option(False, "--dry-run", help="Report what would be exported and stop."),
 ):
-    """Export all SnapKit data to a zip bundle."""
-    from snapkit.exporter import export_bundle
+    """Export SnapKit data to a zip bundle; --view/--id/--type/--tag narrow it."""
+    from snapkit.exporter import CompressionPolicy, ExportSelection, estimate_export, export_bundle
+
+    if base and not Path(base).exists():
+        console.print(f"[red]File not found: {base}[/red]")
+        raise typer.Exit(1)
+    try:
+        policy = CompressionPolicy(method=compression, level=level, workers=workers)
+        selection = ExportSelection(
+            views=tuple(views or ()),
+            resource_ids=tuple(resource_ids or ()),
+            resource_types=tuple(resource_types or ()),
+            tags=tuple(tags or ()),
+        )
+    except ValueError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(1)
+    if snapshot and not selection.is_everything:
+        console.print("[red]--snapshot always exports the whole database; drop --view/--id/--type/--tag.[/red]")
+        raise typer.Exit(1)
 
     session = _session()
-    result = export_bundle(session, Path(output))
+    if dry_run:
+        estimate = estimate_export(session, selection, snapshot=snapshot)
+        label = "Database snapshot" if snapshot else "Records"
+        for table, count in estimate.records.items():
+            console.print(f"  {table}: {count}")
+        console.print(f"{label}: {_format_bytes(estimate.record_bytes)}")
+        console.print(f"Files: {estimate.files} ({_format_bytes(estimate.file_bytes)})")
+        console.print(
+            f"[bold]Estimated bundle size: at most {_format_bytes(estimate.total_bytes)} before compression[/bold]"
+        )
+        return
+
+    try:
+        with _progress_bar() as progress:
+            result = export_bundle(
+                session,
+                Path(output),
+                base=Path(base) if base else None,
+                compression=policy,
+                snapshot=snapshot,
+                progress=progress,
+                selection=selection,
+            )
+    except KeyboardInterrupt:
+        console.print("[yellow]Export cancelled.[/yellow]")
+        raise typer.Exit(130)
     console.print(f"[green]Exported to {result}[/green]")
 
 
@@ -366,12 +749,266 @@ def import_cmd(
         raise typer.Exit(1)
 
     restore = Path(restore_to) if restore_to else None
-    counts = import_bundle(session, p, restore_files_to=restore)
+    try:
+        with _progress_bar() as progress:
+            counts = import_bundle(session, p, restore_files_to=restore, progress=progress)
+    except KeyboardInterrupt:
+        if restore:
+            console.print("[yellow]Import interrupted; run it again with the same --restore-to to resume.[/yellow]")
+        else:
+            console.print("[yellow]Import cancelled; nothing was imported.[/yellow]")
+        raise typer.Exit(130)
     console.print("[green]Import complete:[/green]")
     for key, count in counts.items():
         console.print(f"  {key}: {count} new")
 
 
+bundle_app = typer.Typer(help="Inspect export bundles.")
+app.add_typer(bundle_app, name="bundle")
+
+
+@bundle_app.command("verify")
+def bundle_verify(
+    zip_path: str = typer.Argument(..., help="Path to zip bundle"),
+    entries: Optional[list[str]] = typer.Argument(
+        None, help="Entry names or glob patterns to check (default: every entry)."
+    ),
+    workers: Optional[int] = typer.Option(
+        None, "--workers", min=1, help="Hashing threads (default: one per CPU)."
+    ),
+):
+    """Check bundle entries against the checksums recorded at export."""
+    from zipfile import BadZipFile
+
+    from snapkit.checksums import verify_bundle
+
+    path = Path(zip_path)
+    if not path.exists():
+        console.print(f"[red]File not found: {zip_path}[/red]")
+        raise typer.Exit(1)
+    try:
+        with _progress_bar() as progress:
+            checks = verify_bundle(path, entries or None, workers=workers, progress=progress)
+    except (ValueError, BadZipFile) as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(1)
+
+    failed = [check for check in checks if not check.ok]
+    for check in failed:
+        console.print(f"[red]FAILED[/red] {check.name}: {check.error}")
+    if failed:
+        console.print(f"[red]{len(failed)} of {len(checks)} entries failed verification.[/red]")
+        raise typer.Exit(1)
+    console.print(f"[green]All {len(checks)} entries verified.[/green]")
+
+
+# ── Batch ─────────────────────────────────────────────────────────────
+
+
+@app.command()
+def batch(
+    source: str = typer.Argument("-", help="File of commands or JSON records; '-' reads stdin."),
+    chunk_size: int = typer.Option(500, "--chunk-size", min=1, help="Records committed per transaction."),
+    as_jsonl: bool = typer.Option(False, "--jsonl", help="Print every line's result as JSON Lines."),
+):
+    """Run add-resource, add-notinstalled, pin, unpin and set-launch lines in one process."""
+    import sys
+
+    from snapkit.batch import run_batch
+
+    if source == "-":
+        stream = sys.stdin
+    else:
+        try:
+            stream = open(source, encoding="utf-8")
+        except OSError as exc:
+            console.print(f"[red]Cannot read {source}: {exc.strerror}[/red]")
+            raise typer.Exit(1)
+
+    session = _session()
+    applied = failed = 0
+    try:
+        for result in run_batch(session, stream, chunk_size=chunk_size):
+            if result.ok:
+                applied += 1
+            else:
+                failed += 1
+            if as_jsonl:
+                import json
+
+                sys.stdout.write(json.dumps(result._asdict()) + "\n")
+            elif not result.ok:
+                console.print(f"[red]line {result.line}: {result.error}[/red]", highlight=False)
+    finally:
+        session.close()
+        if stream is not sys.stdin:
+            stream.close()
+
+    if not as_jsonl:
+        style = "yellow" if failed else "green"
+        console.print(f"[{style}]Applied {applied} record(s), {failed} failed.[/{style}]")
+    if failed:
+        raise typer.Exit(1)
+
+
+# ── Database maintenance ──────────────────────────────────────────────
+
+db_app = typer.Typer(help="Database housekeeping.")
+app.add_typer(db_app, name="db")
+
+
+def _format_bytes(size: int | None) -> str:
+    if size is None:
+        return "-"
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+@db_app.command("maintain")
+def db_maintain(
+    analyze: bool = typer.Option(True, "--analyze/--no-analyze", help="Refresh planner statistics."),
+    vacuum: bool = typer.Option(True, "--vacuum/--no-vacuum", help="Reclaim free pages."),
+    integrity: bool = typer.Option(True, "--check/--no-check", help="Run PRAGMA integrity_check."),
+):
+    """Analyze, vacuum and check the database, then report space usage."""
+    from rich.table import Table
+
+    from snapkit.infra.db.maintenance import run_maintenance
+
+    report = run_maintenance(_get_engine(), analyze=analyze, vacuum=vacuum, integrity=integrity)
+
+    table = Table(title="Storage")
+    table.add_column("Object", style="cyan")
+    table.add_column("Table")
+    table.add_column("Rows", justify="right")
+    table.add_column("Pages", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Unused", justify="right")
+    for obj in report.objects:
+        table.add_row(
+            f"  {obj.name}" if obj.is_index else obj.name,
+            obj.table_name,
+            "-" if obj.rows is None else str(obj.rows),
+            "-" if obj.pages is None else str(obj.pages),
+            _format_bytes(obj.size_bytes),
+            "-" if obj.fragmentation is None else f"{obj.fragmentation:.0%}",
+        )
+    console.print(table)
+
+    console.print(
+        f"Database: {_format_bytes(report.size_bytes)} in {report.page_count} pages, "
+        f"{report.freelist_count} free ({report.free_ratio:.1%}), "
+        f"{report.reclaimed_pages} reclaimed."
+    )
+    if report.integrity_ok is False:
+        console.print("[red]Integrity check failed:[/red]")
+        for line in report.integrity:
+            console.print(f"  {line}")
+        raise typer.Exit(1)
+    if report.integrity_ok:
+        console.print("[green]Integrity check: ok[/green]")
+    console.print(f"Maintenance finished in {report.duration:.2f}s.")
+
+
+# ── Daemon ────────────────────────────────────────────────────────────
+
+daemon_app = typer.Typer(help="Resident process that answers run/list-* from a warm state.")
+app.add_typer(daemon_app, name="daemon")
+
+
+@daemon_app.command("start")
+def daemon_start(
+    foreground: bool = typer.Option(False, "--foreground", help="Serve from this process."),
+):
+    """Start the daemon; `snapkit` forwards hot commands to it while it runs."""
+    from snapkit.daemon import DaemonUnavailable, daemon_address
+    from snapkit.daemon.client import request
+
+    try:
+        reply = request({"op": "ping"})
+    except DaemonUnavailable:
+        pass
+    else:
+        console.print(f"[yellow]Daemon already running (pid {reply['pid']}).[/yellow]")
+        return
+
+    if foreground:
+        from snapkit.daemon.server import SnapKitDaemon
+
+        daemon = SnapKitDaemon(_get_engine())
+        daemon.bind()
+        console.print(f"Daemon listening on {daemon.address}. Ctrl+C to stop.")
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        return
+
+    import subprocess
+    import sys
+    import time
+
+    _get_engine()  # migrate before the daemon starts serving
+    options = {}
+    if sys.platform == "win32":
+        options["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+    else:
+        options["start_new_session"] = True
+    subprocess.Popen(
+        [sys.executable, "-m", "snapkit.daemon"],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        **options,
+    )
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            reply = request({"op": "ping"})
+        except DaemonUnavailable:
+            time.sleep(0.05)
+            continue
+        console.print(f"[green]Daemon started (pid {reply['pid']}) on {daemon_address()}.[/green]")
+        return
+    console.print("[red]Daemon did not come up within 10s.[/red]")
+    raise typer.Exit(1)
+
+
+@daemon_app.command("stop")
+def daemon_stop():
+    """Stop a running daemon."""
+    from snapkit.daemon import DaemonUnavailable
+    from snapkit.daemon.client import request
+
+    try:
+        request({"op": "shutdown"})
+    except DaemonUnavailable:
+        console.print("[yellow]Daemon is not running.[/yellow]")
+        return
+    console.print("[green]Daemon stopped.[/green]")
+
+
+@daemon_app.command("status")
+def daemon_status():
+    """Show whether the daemon is running."""
+    from snapkit.daemon import DaemonUnavailable, daemon_address
+    from snapkit.daemon.client import request
+
+    try:
+        reply = request({"op": "ping"})
+    except DaemonUnavailable:
+        console.print("Daemon is not running.")
+        raise typer.Exit(1)
+    console.print(
+        f"Daemon running (pid {reply['pid']}) on {daemon_address()}: "
+        f"up {reply['uptime']:.0f}s, {reply['served']} commands served."
+    )
+
+
 # ── Phase 6: GUI ─────────────────────────────────────────────────────
 
 
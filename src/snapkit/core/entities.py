@@ -15,6 +15,8 @@ ViewId = Literal[
 
 ItemKind = Literal["local", "pinned", "wish", "resource"]
 
+ChangeOp = Literal["I", "U", "D"]
+
 
 @dataclass(slots=True, frozen=True)
 class UiItem:
@@ -32,3 +34,19 @@ class UiItem:
     icon_path: str | None = None
     linked_app_id: int | None = None
     is_pinned: bool = False
+    cursor: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class ActionResult:
+    item_id: int
+    ok: bool
+    message: str
+
+
+@dataclass(slots=True, frozen=True)
+class ChangeEvent:
+    seq: int
+    table_name: str
+    row_id: int
+    op: ChangeOp
@@ -2,16 +2,51 @@
 
 from typing import Protocol
 
-from snapkit.core.entities import UiItem
+from snapkit.core.entities import ItemKind, UiItem
 
 
 class ToolboxRepository(Protocol):
+    """Read side of the toolbox.
+
+    Every ``list_*`` method returns one page ordered by a stable sort key. Pass
+    the ``cursor`` of the last item received as ``after`` to fetch the next page,
+    and ``tag`` to keep only items carrying that exact tag.
+    """
+
     def list_installed(
-        self, search: str = "", limit: int = 300, pinned_filter: str = "all"
+        self,
+        search: str = "",
+        limit: int = 300,
+        pinned_filter: str = "all",
+        after: str | None = None,
+        tag: str | None = None,
+    ) -> list[UiItem]: ...
+
+    def list_pinned(
+        self,
+        search: str = "",
+        limit: int = 300,
+        after: str | None = None,
+        tag: str | None = None,
     ) -> list[UiItem]: ...
 
-    def list_pinned(self, search: str = "", limit: int = 300) -> list[UiItem]: ...
+    def list_not_installed(
+        self,
+        search: str = "",
+        limit: int = 300,
+        after: str | None = None,
+        tag: str | None = None,
+    ) -> list[UiItem]: ...
 
-    def list_not_installed(self, search: str = "", limit: int = 300) -> list[UiItem]: ...
+    def list_resources(
+        self,
+        resource_type: str,
+        search: str = "",
+        limit: int = 300,
+        after: str | None = None,
+        tag: str | None = None,
+    ) -> list[UiItem]: ...
 
-    def list_resources(self, resource_type: str, search: str = "", limit: int = 300) -> list[UiItem]: ...
+    def tag_facets(
+        self, kind: ItemKind, resource_type: str | None = None
+    ) -> list[tuple[str, int]]: ...
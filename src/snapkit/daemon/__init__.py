@@ -0,0 +1,39 @@
+"""Optional resident process that answers hot CLI commands from a warm state.
+
+``python -m snapkit.daemon`` (or ``snapkit daemon start``) listens on a Unix
+socket, or a named pipe on Windows. ``snapkit.__main__`` forwards the commands
+in ``FORWARDED_COMMANDS`` to it and runs them in-process whenever it is not
+reachable.
+
+Messages are length-prefixed JSON in the framing used by
+``multiprocessing.connection``. The POSIX client speaks that framing over a
+plain socket so it does not have to import ``multiprocessing``.
+
+This package must stay cheap to import: it is on the client's hot path.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+FORWARDED_COMMANDS = frozenset(
+    {"run", "list-installed", "list-pinned", "list-notinstalled", "list-resources"}
+)
+
+IS_WINDOWS = sys.platform == "win32"
+
+
+def daemon_address() -> str:
+    """Socket path or pipe name; ``SNAPKIT_DAEMON_ADDRESS`` overrides the default."""
+    override = os.environ.get("SNAPKIT_DAEMON_ADDRESS")
+    if override:
+        return override
+    if IS_WINDOWS:
+        return rf"\\.\pipe\snapkit-{os.environ.get('USERNAME', 'user')}"
+    return str(Path.home() / ".snapkit" / "daemon.sock")
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening at the address, or it went away mid-request."""
@@ -0,0 +1,14 @@
+"""Run the SnapKit daemon in the foreground: ``python -m snapkit.daemon``."""
+
+from snapkit.daemon.server import SnapKitDaemon
+from snapkit.db import get_engine, init_db
+
+
+def main():
+    engine = get_engine()
+    init_db(engine)
+    SnapKitDaemon(engine).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import json
+import os
+import struct
+import sys
+
+from snapkit.daemon import IS_WINDOWS, DaemonUnavailable, daemon_address
+
+_HEADER = struct.Struct("!i")
+
+
+def request(message: dict, address: str | None = None, timeout: float = 5.0) -> dict:
+    """Send *message* to the daemon and return its reply."""
+    address = address or daemon_address()
+    payload = json.dumps(message).encode("utf-8")
+    if IS_WINDOWS:
+        reply = _pipe_roundtrip(address, payload)
+    else:
+        reply = _socket_roundtrip(address, payload, timeout)
+    return json.loads(reply)
+
+
+def forward(argv: list[str], address: str | None = None) -> tuple[str, int] | None:
+    """Run a CLI command in the daemon; ``None`` means run it in-process instead."""
+    message = {
+        "op": "cli",
+        "argv": argv,
+        "width": _terminal_width(),
+        "color": sys.stdout.isatty() and "NO_COLOR" not in os.environ,
+    }
+    if argv and argv[0] == "run":
+        # The daemon launches the app; it must start where and how it would have here.
+        message["cwd"] = os.getcwd()
+        message["env"] = dict(os.environ)
+    try:
+        reply = request(message, address)
+    except DaemonUnavailable:
+        return None
+    if not reply.get("ok"):
+        return None
+    return reply["output"], reply["exit_code"]
+
+
+def _socket_roundtrip(address: str, payload: bytes, timeout: float) -> bytes:
+    import socket
+
+    if not os.path.exists(address):
+        raise DaemonUnavailable(f"no socket at {address}")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+        sock.sendall(_HEADER.pack(len(payload)) + payload)
+        (size,) = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+        return _recv_exact(sock, size)
+    except OSError as exc:
+        raise DaemonUnavailable(str(exc)) from exc
+    finally:
+        sock.close()
+
+
+def _recv_exact(sock, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            raise DaemonUnavailable("daemon closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def _pipe_roundtrip(address: str, payload: bytes) -> bytes:
+    # Message-mode named pipes need the framing multiprocessing already implements.
+    from multiprocessing.connection import Client
+
+    try:
+        with Client(address, family="AF_PIPE") as conn:
+            conn.send_bytes(payload)
+            return conn.recv_bytes()
+    except (OSError, EOFError) as exc:
+        raise DaemonUnavailable(str(exc)) from exc
+
+
+def _terminal_width() -> int:
+    try:
+        return os.get_terminal_size(sys.stdout.fileno()).columns
+    except (OSError, ValueError):
+        return 80
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import io
+import json
+import os
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from multiprocessing.connection import Listener
+
+import typer.main
+from rich.console import Console
+
+from snapkit import cli
+from snapkit.daemon import FORWARDED_COMMANDS, IS_WINDOWS, DaemonUnavailable, daemon_address
+from snapkit.daemon.client import request
+from snapkit.db import get_session
+from snapkit.infra.db import changelog
+from snapkit.launch_index import load_launch_index
+from snapkit.launcher import ExeResolver
+
+CONSUMER_NAME = "daemon"
+
+
+class SnapKitDaemon:
+    """Serves forwarded CLI commands one at a time from a warm process.
+
+    The engine, the compiled CLI, an ``ExeResolver`` and the ``run <query>``
+    launch index live as long as the daemon. Resolved exes are dropped and the
+    index rebuilt whenever the change log shows writes, from this process or
+    any other.
+    """
+
+    def __init__(self, engine, address: str | None = None):
+        self._engine = engine
+        self._address = address or daemon_address()
+        self._command = typer.main.get_command(cli.app)
+        self._resolver = ExeResolver()
+        self._listener: Listener | None = None
+        self._running = False
+        self._started_at = time.time()
+        self._served = 0
+        self._seen_seq = 0
+
+    @property
+    def address(self) -> str:
+        return self._address
+
+    def bind(self):
+        """Start listening; call before ``serve_forever`` to know when clients may connect."""
+        if not IS_WINDOWS:
+            _remove_stale_socket(self._address)
+            previous_umask = os.umask(0o177)  # socket readable by this user only
+        try:
+            self._listener = Listener(self._address, family="AF_PIPE" if IS_WINDOWS else "AF_UNIX")
+        finally:
+            if not IS_WINDOWS:
+                os.umask(previous_umask)
+
+        cli._engine = self._engine
+        cli._exe_resolver = self._resolver
+        self._seen_seq = self._register_consumer()
+        cli._launch_index = self._load_launch_index()
+
+    def serve_forever(self):
+        if self._listener is None:
+            self.bind()
+        self._running = True
+        try:
+            while self._running:
+                try:
+                    conn = self._listener.accept()
+                except OSError:
+                    break
+                with conn:
+                    try:
+                        message = json.loads(conn.recv_bytes())
+                        reply = self.handle(message)
+                        conn.send_bytes(json.dumps(reply).encode("utf-8"))
+                    except (EOFError, OSError, ValueError):
+                        continue
+        finally:
+            self._shutdown()
+
+    def handle(self, message: dict) -> dict:
+        op = message.get("op")
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "uptime": time.time() - self._started_at,
+                "served": self._served,
+            }
+        if op == "shutdown":
+            self._running = False
+            return {"ok": True}
+        if op == "cli":
+            argv = list(message.get("argv") or [])
+            if not argv or argv[0] not in FORWARDED_COMMANDS:
+                return {"ok": False, "error": "command is not served by the daemon"}
+            self._served += 1
+            output, exit_code = self._run_cli(
+                argv,
+                int(message.get("width") or 80),
+                bool(message.get("color")),
+                message.get("cwd"),
+                message.get("env"),
+            )
+            return {"ok": True, "output": output, "exit_code": exit_code}
+        return {"ok": False, "error": f"unknown op: {op!r}"}
+
+    def _run_cli(
+        self, argv: list[str], width: int, color: bool, cwd: str | None = None, env: dict | None = None
+    ) -> tuple[str, int]:
+        self._drop_stale_state()
+        buffer = io.StringIO()
+        console = Console(
+            file=buffer,
+            width=width,
+            force_terminal=color,
+            color_system="auto" if color else None,
+        )
+        with (
+            cli.use_console(console),
+            cli.use_caller(cwd, env),
+            redirect_stdout(buffer),
+            redirect_stderr(buffer),
+        ):
+            try:
+                result = self._command.main(args=argv, prog_name="snapkit", standalone_mode=False)
+                exit_code = result if isinstance(result, int) else 0
+            except Exception as exc:  # click exceptions carry exit codes and know how to show themselves
+                exit_code = getattr(exc, "exit_code", 1)
+                if hasattr(exc, "show"):
+                    exc.show(file=buffer)
+                elif not hasattr(exc, "exit_code"):
+                    buffer.write(f"Error: {exc}\n")
+        return buffer.getvalue(), exit_code
+
+    def _drop_stale_state(self):
+        session = get_session(self._engine)
+        try:
+            changes = changelog.changes_since(session, self._seen_seq, limit=1)
+            if not changes:
+                return
+            self._resolver.clear()
+            cli._launch_index = self._load_launch_index()
+            self._seen_seq = changelog.latest_seq(session)
+            changelog.ack_changes(session, CONSUMER_NAME, self._seen_seq)
+            session.commit()
+        finally:
+            session.close()
+
+    def _load_launch_index(self):
+        conn = self._engine.raw_connection()
+        try:
+            return load_launch_index(conn)
+        finally:
+            conn.close()
+
+    def _register_consumer(self) -> int:
+        session = get_session(self._engine)
+        try:
+            # A daemon that crashed left its old position behind; start from the head.
+            changelog.unregister_consumer(session, CONSUMER_NAME)
+            seq = changelog.register_consumer(session, CONSUMER_NAME)
+            session.commit()
+            return seq
+        finally:
+            session.close()
+
+    def _shutdown(self):
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        session = get_session(self._engine)
+        try:
+            changelog.unregister_consumer(session, CONSUMER_NAME)
+            session.commit()
+        finally:
+            session.close()
+        cli._engine = None
+        cli._exe_resolver = None
+        cli._launch_index = None
+
+
+def _remove_stale_socket(address: str):
+    if not os.path.exists(address):
+        return
+    try:
+        request({"op": "ping"}, address, timeout=1.0)
+    except DaemonUnavailable:
+        os.unlink(address)
+    else:
+        raise RuntimeError(f"a SnapKit daemon is already listening at {address}")
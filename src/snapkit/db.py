@@ -1,31 +1,80 @@
 """SQLite engine and session management."""
 
+import threading
 from pathlib import Path
+from weakref import WeakKeyDictionary
 
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, literal, select, text
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
-from snapkit.models import Base
+from snapkit.fastpath import DEFAULT_DB_DIR, DEFAULT_DB_PATH, SCHEMA_VERSION
+from snapkit.models import (
+    CHANGE_LOG_TRIGGER_NAMES,
+    SCHEMA_TRIGGERS,
+    TAGGED_MODELS,
+    Base,
+    normalize_name_key,
+    sync_item_tags,
+)
 
-DEFAULT_DB_DIR = Path.home() / ".snapkit"
-DEFAULT_DB_PATH = DEFAULT_DB_DIR / "snapkit.db"
+
+_write_generations: WeakKeyDictionary = WeakKeyDictionary()
+_write_generation_lock = threading.Lock()
 
 
 def get_engine(db_path: Path | str | None = None):
-    """Create a SQLAlchemy engine. Pass `":memory:"` for testing."""
+    """Create a SQLAlchemy engine. Pass `":memory:"` for testing.
+
+    File databases run in WAL mode so list views can keep reading while the
+    service's writer thread commits.
+    """
     if db_path == ":memory:":
-        url = "sqlite:///:memory:"
-    else:
-        path = Path(db_path) if db_path else DEFAULT_DB_PATH
-        path.parent.mkdir(parents=True, exist_ok=True)
-        url = f"sqlite:///{path}"
-    return create_engine(url)
+        # One shared connection, otherwise every thread sees an empty database.
+        return create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+
+    path = Path(db_path) if db_path else DEFAULT_DB_PATH
+    path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{path}")
+    event.listen(engine, "connect", _configure_sqlite_connection)
+    return engine
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        # Only takes effect on a new file; existing ones switch in ``db maintain``.
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA busy_timeout=5000")
+    finally:
+        cursor.close()
 
 
 def init_db(engine) -> None:
-    """Create all tables."""
+    """Create all tables and migrate older SQLite files.
+
+    A database already stamped with ``SCHEMA_VERSION`` costs a single
+    ``PRAGMA user_version`` read.
+    """
+    if engine.dialect.name == "sqlite" and schema_version(engine) == SCHEMA_VERSION:
+        return
     Base.metadata.create_all(engine)
     _migrate_sqlite_schema(engine)
+    if engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            conn.execute(text(f"PRAGMA user_version = {SCHEMA_VERSION}"))
+
+
+def schema_version(engine) -> int:
+    """Schema version stamped into the SQLite file, 0 if never stamped."""
+    with engine.connect() as conn:
+        return conn.execute(text("PRAGMA user_version")).scalar() or 0
 
 
 def get_session(engine) -> Session:
@@ -33,6 +82,22 @@ def get_session(engine) -> Session:
     return sessionmaker(bind=engine)()
 
 
+def write_generation(bind) -> int:
+    """Return the current write generation for the engine behind *bind*."""
+    engine = getattr(bind, "engine", bind)
+    with _write_generation_lock:
+        return _write_generations.get(engine, 0)
+
+
+def bump_write_generation(bind) -> int:
+    """Mark data behind *bind* as changed so cached reads get rebuilt."""
+    engine = getattr(bind, "engine", bind)
+    with _write_generation_lock:
+        generation = _write_generations.get(engine, 0) + 1
+        _write_generations[engine] = generation
+        return generation
+
+
 def _migrate_sqlite_schema(engine) -> None:
     """Best-effort SQLite column migration for newly added fields."""
     if engine.dialect.name != "sqlite":
@@ -44,7 +109,16 @@ def _migrate_sqlite_schema(engine) -> None:
             "custom_icon_path": "TEXT",
             "display_icon": "TEXT",
             "uninstall_command": "TEXT",
-        }
+            "name_key": "VARCHAR(255)",
+            "custom_name_key": "VARCHAR(255)",
+        },
+        "not_installed_apps": {
+            "name_key": "VARCHAR(255)",
+        },
+    }
+    name_key_sources: dict[str, dict[str, str]] = {
+        "installed_apps": {"name_key": "name", "custom_name_key": "custom_name"},
+        "not_installed_apps": {"name_key": "name"},
     }
 
     with engine.begin() as conn:
@@ -59,3 +133,52 @@ def _migrate_sqlite_schema(engine) -> None:
                 conn.execute(
                     text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}")
                 )
+
+        for table_name, keys in name_key_sources.items():
+            for key_column, source_column in keys.items():
+                conn.execute(
+                    text(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{key_column} "
+                        f"ON {table_name} ({key_column})"
+                    )
+                )
+                _backfill_name_keys(conn, table_name, key_column, source_column)
+
+        # Recreated so older files pick up the "only while someone consumes" condition.
+        for name in CHANGE_LOG_TRIGGER_NAMES:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+        for trigger in SCHEMA_TRIGGERS:
+            conn.execute(text(trigger))
+        conn.execute(text("DELETE FROM change_log WHERE NOT EXISTS (SELECT 1 FROM change_consumers)"))
+        _backfill_item_tags(conn)
+
+
+def _backfill_name_keys(conn, table_name: str, key_column: str, source_column: str) -> None:
+    rows = conn.execute(
+        text(
+            f"SELECT id, {source_column} FROM {table_name} "
+            f"WHERE {key_column} IS NULL AND {source_column} IS NOT NULL"
+        )
+    ).fetchall()
+    updates = [
+        {"id": row_id, "key": normalize_name_key(value)}
+        for row_id, value in rows
+        if normalize_name_key(value)
+    ]
+    if updates:
+        conn.execute(
+            text(f"UPDATE {table_name} SET {key_column} = :key WHERE id = :id"),
+            updates,
+        )
+
+
+def _backfill_item_tags(conn) -> None:
+    """Split legacy comma-separated tag columns into the normalized tag store."""
+    if conn.execute(text("SELECT 1 FROM item_tags LIMIT 1")).first():
+        return
+    for model in TAGGED_MODELS:
+        entries = conn.execute(
+            select(literal(model.tag_kind), model.id, model.tags).where(model.tags.is_not(None))
+        ).all()
+        if entries:
+            sync_item_tags(conn, [tuple(row) for row in entries])
@@ -1,18 +1,230 @@
-"""Export/import SnapKit data as a zip bundle."""
+"""Export/import SnapKit data as a zip bundle.
 
+Bundle layout::
+
+    snapkit_data.jsonl     database records, one JSON line each (manifest v2)
+    blob_map.json          resource id -> stored name and content hash(es)
+    blobs/<sha256>         resource file contents, one entry per distinct file
+    snapshot.db            whole-database copy, in place of the manifest (--snapshot)
+    checksums.json         SHA-256 and size of every other entry, written last
+
+The v2 manifest starts with a header line, has one ``{"table", "record"}``
+line per row and ends with a footer holding per-table counts and the
+SHA-256 of every line before it. It is written and read a line at a time,
+so neither side holds the library in memory. Bundles with a v1
+``snapkit_data.json`` document still import.
+
+An incremental bundle names a ``base`` bundle in ``blob_map.json`` and only
+carries the blobs that neither the base nor the base's own bases hold.
+Bundles written before blobs existed use ``files/`` plus ``file_map.json``
+and still import.
+
+A snapshot bundle carries the SQLite file itself, copied with the online
+backup API; see :mod:`snapkit.snapshot`.
+
+Both directions report ``snapkit.progress.Progress`` events and can be
+cancelled. An import that restores files keeps a journal in the restore
+directory, so running it again after an interruption skips the records and
+files that already made it.
+"""
+
+import hashlib
+import itertools
 import json
+import os
 import shutil
 import tempfile
+import zipfile
+import zlib
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import NamedTuple
 from datetime import UTC, datetime
 from pathlib import Path
-from zipfile import ZipFile
+from zipfile import ZIP_STORED, ZipFile, ZipInfo
 
+from sqlalchemy import and_, func, insert, or_, select, text, true
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
+from snapkit.checksums import HashingWriter, checksum_bytes, write_checksums
+from snapkit.db import bump_write_generation
+from snapkit.models import (
+    FileDigest,
+    InstalledApp,
+    NotInstalledApp,
+    PinnedApp,
+    ResourceItem,
+    normalize_name_key,
+    sync_item_tags,
+    tag_filter,
+)
+from snapkit.progress import CancelToken, ProgressCallback, ProgressReporter
+from snapkit.snapshot import SNAPSHOT, backup_database, merge_snapshot, prepare_snapshot
+
+MANIFEST = "snapkit_data.jsonl"
+MANIFEST_V1 = "snapkit_data.json"
+MANIFEST_FORMAT = "snapkit-manifest"
+MANIFEST_VERSION = 2
+BLOB_MAP = "blob_map.json"
+BLOB_PREFIX = "blobs/"
+IMPORT_JOURNAL = ".snapkit-import.journal"
+_HASH_CHUNK = 1 << 20
+_DUMP_BATCH = 1000
+_INSERT_BATCH = 1000
+
+COMPRESSION_METHODS = {
+    "store": zipfile.ZIP_STORED,
+    "deflate": zipfile.ZIP_DEFLATED,
+    "bzip2": zipfile.ZIP_BZIP2,
+    "lzma": zipfile.ZIP_LZMA,
+}
+if hasattr(zipfile, "ZIP_ZSTANDARD"):  # Python 3.14+
+    COMPRESSION_METHODS["zstd"] = zipfile.ZIP_ZSTANDARD
+
+# Formats that are already compressed; deflating them again only costs CPU.
+MEDIA_SUFFIXES = frozenset(
+    {
+        ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic", ".avif",
+        ".mp4", ".mkv", ".mov", ".avi", ".webm", ".mp3", ".aac", ".flac", ".ogg", ".m4a",
+        ".zip", ".7z", ".rar", ".gz", ".tgz", ".bz2", ".xz", ".zst",
+        ".docx", ".xlsx", ".pptx", ".pdf", ".epub", ".jar", ".apk", ".msi", ".cab",
+    }
+)
+_SAMPLE_SIZE = 64 << 10
+_INCOMPRESSIBLE_RATIO = 0.95
+
+
+@dataclass(frozen=True, slots=True)
+class CompressionPolicy:
+    """How bundle entries are compressed.
+
+    Manifests and files that compress get ``method``. Files with a media
+    suffix are stored as they are, and so are unknown files whose first 64
+    KiB do not shrink by at least 5%. Files are compressed on a pool of
+    ``workers`` processes (default: one per CPU) and added to the archive
+    in order.
+    """
+
+    method: str = "deflate"
+    level: int | None = None
+    workers: int | None = None
+    store_suffixes: frozenset[str] = MEDIA_SUFFIXES
+
+    def __post_init__(self):
+        if self.method not in COMPRESSION_METHODS:
+            raise ValueError(
+                f"unsupported compression {self.method!r}; choose from {', '.join(COMPRESSION_METHODS)}"
+            )
+
+    @property
+    def compress_type(self) -> int:
+        return COMPRESSION_METHODS[self.method]
+
+    def compress_type_for(self, path: Path) -> int:
+        if self.compress_type == ZIP_STORED or path.suffix.lower() in self.store_suffixes:
+            return ZIP_STORED
+        with open(path, "rb") as fh:
+            sample = fh.read(_SAMPLE_SIZE)
+        if len(sample) >= 4096 and len(zlib.compress(sample, 1)) > len(sample) * _INCOMPRESSIBLE_RATIO:
+            return ZIP_STORED
+        return self.compress_type
+
+
+STORE_ONLY = CompressionPolicy(method="store")
+
+# GUI view id -> (manifest table, resource type shown by the view)
+EXPORT_VIEWS: dict[str, tuple[str, str | None]] = {
+    "local_scan": ("installed_apps", None),
+    "installed": ("pinned_apps", None),
+    "not_installed": ("not_installed_apps", None),
+    "resource_image": ("resource_items", "image"),
+    "resource_video": ("resource_items", "video"),
+    "resource_document": ("resource_items", "document"),
+    "resource_url": ("resource_items", "url"),
+}
+# Resource types whose path is a local file or folder packed as blobs.
+FILE_RESOURCE_TYPES = ("file", "folder")
 
 
-def export_bundle(session: Session, output_path: Path, include_resources: list[int] | None = None) -> Path:
+@dataclass(frozen=True, slots=True)
+class ExportSelection:
+    """Which records a manifest export includes; the default selects everything.
+
+    ``views`` picks tables by GUI view (a resource view also picks its
+    resource type). ``resource_ids`` and ``resource_types`` narrow resources
+    and, without ``views``, limit the export to resources. ``tags`` keeps
+    rows carrying any of the tags. Pins always bring along the installed
+    apps they point at, since an import resolves pins through them.
+    """
+
+    views: tuple[str, ...] = ()
+    resource_ids: tuple[int, ...] = ()
+    resource_types: tuple[str, ...] = ()
+    tags: tuple[str, ...] = ()
+
+    def __post_init__(self):
+        unknown = [view for view in self.views if view not in EXPORT_VIEWS]
+        if unknown:
+            raise ValueError(f"unknown view(s) {', '.join(unknown)}; choose from {', '.join(EXPORT_VIEWS)}")
+
+    @property
+    def is_everything(self) -> bool:
+        return not (self.views or self.resource_ids or self.resource_types or self.tags)
+
+    @property
+    def tables(self) -> tuple[str, ...]:
+        if self.views:
+            chosen = {EXPORT_VIEWS[view][0] for view in self.views}
+            if self.resource_ids or self.resource_types:
+                chosen.add("resource_items")
+        elif self.resource_ids or self.resource_types:
+            chosen = {"resource_items"}
+        else:
+            chosen = set(_LOADERS)
+        return tuple(table for table in _LOADERS if table in chosen)
+
+    @property
+    def types(self) -> tuple[str, ...]:
+        """Resource types to keep; empty keeps every type."""
+        from_views = [EXPORT_VIEWS[view][1] for view in self.views if EXPORT_VIEWS[view][1]]
+        return tuple(dict.fromkeys([*from_views, *self.resource_types]))
+
+
+class FileHashes(NamedTuple):
+    """``hash_files`` result: a digest per path, plus ``file_digests`` rows for the files hashed anew."""
+
+    digests: dict[Path, str]
+    fresh: list[dict]
+
+
+class ExportEstimate(NamedTuple):
+    """What an export would write, before compression and deduplication."""
+
+    records: dict[str, int]
+    record_bytes: int
+    files: int
+    file_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.record_bytes + self.file_bytes
+
+
+def export_bundle(
+    session: Session,
+    output_path: Path,
+    include_resources: list[int] | None = None,
+    base: Path | None = None,
+    compression: CompressionPolicy | None = None,
+    snapshot: bool = False,
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+    selection: ExportSelection | None = None,
+    record_digests: Callable[[list[dict]], object] | None = None,
+) -> Path:
     """Export DB data + optional resource files into a zip bundle.
 
     Args:
@@ -20,211 +232,920 @@ def export_bundle(session: Session, output_path: Path, include_resources: list[i
         output_path: Destination zip file path.
         include_resources: List of ResourceItem IDs whose files to include.
                           None means include all local files.
+        base: Earlier bundle to build on. Blobs already stored in it (or in
+              its own base chain) are referenced instead of written again.
+        compression: Compression settings; defaults to ``CompressionPolicy()``.
+        snapshot: Package a backup-API copy of the whole database instead of
+                  the JSONL manifest.
+        progress: Called with a ``Progress`` per step of the ``hash``,
+                  ``records`` (or ``snapshot`` pages) and ``files`` phases.
+        cancel: Token that stops the export at its next step; the partial
+                bundle is removed and ``OperationCancelled`` raised.
+        selection: Records to export, filtered in SQL; resource files follow
+                   the selected resources. Not combinable with *snapshot*.
+        record_digests: Called with the ``file_digests`` rows of files hashed
+                        anew, once the bundle is in place. By default they are
+                        written through *session* and committed.
     """
-    data = {
-        "exported_at": datetime.now(UTC).isoformat(),
-        "installed_apps": _dump_installed(session),
-        "pinned_apps": _dump_pinned(session),
-        "not_installed_apps": _dump_not_installed(session),
-        "resource_items": _dump_resources(session),
-    }
+    reporter = ProgressReporter(progress, cancel)
+    compression = compression or CompressionPolicy()
+    selection = selection or ExportSelection()
+    if snapshot and not selection.is_everything:
+        raise ValueError("a snapshot always holds the whole database; drop the selection or --snapshot")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp = Path(tmpdir)
-        # Write JSON manifest
-        manifest = tmp / "snapkit_data.json"
-        manifest.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
-
-        # Copy resource files
-        resources = session.query(ResourceItem).all()
-        if include_resources is not None:
-            resources = [r for r in resources if r.id in include_resources]
-
-        files_dir = tmp / "files"
-        files_dir.mkdir()
-        file_map: dict[int, str] = {}
-        for res in resources:
-            if res.resource_type in ("file", "folder") and Path(res.path).exists():
-                src = Path(res.path)
-                dest_name = f"{res.id}_{src.name}"
-                if src.is_file():
-                    shutil.copy2(src, files_dir / dest_name)
-                    file_map[res.id] = dest_name
-                elif src.is_dir():
-                    shutil.copytree(src, files_dir / dest_name)
-                    file_map[res.id] = dest_name
-
-        # Write file map
-        if file_map:
-            (tmp / "file_map.json").write_text(
-                json.dumps(file_map, indent=2), encoding="utf-8"
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial = output_path.with_name(output_path.name + ".part")
+    resource_files = _resource_files(session, selection, include_resources, skip=partial)
+
+    hashes = hash_files(
+        session, [path for _, files in resource_files.values() for _, path in files], reporter=reporter
+    )
+    digests = hashes.digests
+    available = bundle_blobs(base) if base is not None else {}
+
+    blob_map: dict[str, dict] = {}
+    for res_id, (dest_name, files) in resource_files.items():
+        if files and files[0][0] is None:
+            blob_map[str(res_id)] = {"name": dest_name, "blob": digests[files[0][1]]}
+        else:
+            blob_map[str(res_id)] = {
+                "name": dest_name,
+                "files": {relative: digests[path] for relative, path in files},
+            }
+
+    # Everything is streamed straight into the archive; nothing is staged on
+    # disk. The zip is built next to its destination and renamed into place
+    # so a failed export never leaves a truncated bundle behind.
+    try:
+        with ZipFile(
+            partial, "w", compression=compression.compress_type, compresslevel=compression.level
+        ) as zf:
+            checksums: dict[str, dict] = {}
+            if snapshot:
+                with tempfile.TemporaryDirectory(dir=partial.parent, prefix=".snapkit-export-") as tmp:
+                    copy = Path(tmp) / SNAPSHOT
+                    backup_database(session.get_bind(), copy, reporter=reporter)
+                    zf.write(copy, SNAPSHOT)
+                    checksums[SNAPSHOT] = {"sha256": _sha256_file(copy), "size": copy.stat().st_size}
+            else:
+                statements = _selected_statements(selection)
+                reporter.start("records", sum(_count_rows(session, statements).values()))
+                tables = (
+                    (table, reporter.track(_stream_rows(session, statement), _DUMP_BATCH))
+                    for table, statement in statements.items()
+                )
+                with zf.open(MANIFEST, "w", force_zip64=True) as entry:
+                    manifest = HashingWriter(entry)
+                    write_manifest(manifest, tables)
+                checksums[MANIFEST] = manifest.checksum()
+
+            blobs: dict[str, Path] = {}
+            for path, digest in digests.items():
+                if digest not in available:
+                    blobs.setdefault(digest, path)
+            _write_files(
+                zf,
+                [(BLOB_PREFIX + digest, path) for digest, path in blobs.items()],
+                compression,
+                scratch=partial.parent,
+                reporter=reporter,
             )
+            # Blob names are their content hashes already.
+            for digest, path in blobs.items():
+                checksums[BLOB_PREFIX + digest] = {"sha256": digest, "size": path.stat().st_size}
 
-        # Create zip
-        output_path = Path(output_path)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        with ZipFile(output_path, "w") as zf:
-            for f in tmp.rglob("*"):
-                if f.is_file():
-                    zf.write(f, f.relative_to(tmp))
+            base_ref = None
+            if base is not None:
+                base_ref = Path(os.path.relpath(Path(base).resolve(), output_path.resolve().parent)).as_posix()
+            blob_map_data = json.dumps(
+                {"base": base_ref, "resources": blob_map}, indent=2, ensure_ascii=False
+            ).encode("utf-8")
+            zf.writestr(BLOB_MAP, blob_map_data)
+            checksums[BLOB_MAP] = checksum_bytes(blob_map_data)
+            write_checksums(zf, checksums)
+        os.replace(partial, output_path)
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
 
+    if hashes.fresh:
+        if record_digests is None:
+            record_file_digests(session, hashes.fresh)
+            session.commit()
+        else:
+            record_digests(hashes.fresh)
     return output_path
 
 
-def import_bundle(session: Session, zip_path: Path, restore_files_to: Path | None = None) -> dict:
+def estimate_export(
+    session: Session,
+    selection: ExportSelection | None = None,
+    include_resources: list[int] | None = None,
+    snapshot: bool = False,
+) -> ExportEstimate:
+    """Size up an export without writing or hashing anything.
+
+    Record counts and the manifest size come from SQL aggregates over the
+    same filtered statements the export dumps; file sizes from ``stat``.
+    Blobs shared between resources or already held by a base bundle are
+    counted in full, so the real bundle is at most this big before
+    compression.
+    """
+    selection = selection or ExportSelection()
+    files = _resource_files(session, selection, include_resources)
+    paths = {path for _, entries in files.values() for _, path in entries}
+    file_bytes = sum(path.stat().st_size for path in paths)
+    if snapshot:
+        page_count = session.execute(text("PRAGMA page_count")).scalar()
+        page_size = session.execute(text("PRAGMA page_size")).scalar()
+        records = {}
+        record_bytes = page_count * page_size
+    else:
+        statements = _selected_statements(selection)
+        records = _count_rows(session, statements)
+        record_bytes = sum(_manifest_bytes(session, table, statement) for table, statement in statements.items())
+    return ExportEstimate(records, record_bytes, len(paths), file_bytes)
+
+
+def _resource_files(
+    session: Session,
+    selection: ExportSelection,
+    include_resources: list[int] | None,
+    skip: Path | None = None,
+) -> dict[int, tuple[str, list[tuple[str | None, Path]]]]:
+    """Map resource id -> (stored name, [(relative path or None, source file)]) for file resources."""
+    if "resource_items" not in selection.tables:
+        return {}
+    statement = (
+        select(ResourceItem.id, ResourceItem.path)
+        .where(_resource_filter(selection), ResourceItem.resource_type.in_(FILE_RESOURCE_TYPES))
+        .order_by(ResourceItem.id)
+    )
+    if include_resources is not None:
+        statement = statement.where(ResourceItem.id.in_(include_resources))
+
+    resource_files: dict[int, tuple[str, list[tuple[str | None, Path]]]] = {}
+    for res_id, path in session.execute(statement):
+        src = Path(path)
+        dest_name = f"{res_id}_{src.name}"
+        if src.is_file():
+            resource_files[res_id] = (dest_name, [(None, src)])
+        elif src.is_dir():
+            resource_files[res_id] = (dest_name, list(_walk_files(src, skip=skip)))
+    return resource_files
+
+
+def _write_files(
+    zf: ZipFile,
+    entries: list[tuple[str, Path]],
+    policy: CompressionPolicy,
+    scratch: Path,
+    reporter: ProgressReporter | None = None,
+) -> None:
+    """Add ``(arcname, path)`` entries to *zf* in order, compressing per *policy*."""
+    reporter = reporter or ProgressReporter()
+    planned = [(arcname, path, policy.compress_type_for(path)) for arcname, path in entries]
+    reporter.start("files", len(planned))
+    workers = policy.workers or os.cpu_count() or 1
+    if workers < 2 or sum(compress_type != ZIP_STORED for _, _, compress_type in planned) < 2:
+        for arcname, path, compress_type in planned:
+            zf.write(path, arcname, compress_type=compress_type, compresslevel=policy.level)
+            reporter.advance()
+        return
+
+    # Workers compress into scratch files; at most 2 x workers results are
+    # outstanding so scratch space stays bounded while the pool stays busy.
+    with tempfile.TemporaryDirectory(dir=scratch, prefix=".snapkit-export-") as tmp:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending: deque = deque()
+            for arcname, path, compress_type in planned:
+                future = None
+                if compress_type != ZIP_STORED:
+                    future = pool.submit(_compress_file, str(path), tmp, compress_type, policy.level)
+                pending.append((arcname, path, compress_type, future))
+                while len(pending) > 2 * workers:
+                    _add_entry(zf, *pending.popleft())
+                    reporter.advance()
+            while pending:
+                _add_entry(zf, *pending.popleft())
+                reporter.advance()
+
+
+def _add_entry(zf: ZipFile, arcname: str, path: Path, compress_type: int, future) -> None:
+    if future is None:
+        zf.write(path, arcname, compress_type=compress_type)
+        return
+    compressed, crc, file_size, compress_size = future.result()
+    try:
+        zinfo = ZipInfo.from_file(path, arcname)
+        zinfo.compress_type = compress_type
+        zinfo.file_size = file_size
+        zinfo.compress_size = compress_size
+        zinfo.CRC = crc
+        if compress_type == zipfile.ZIP_LZMA:
+            zinfo.flag_bits |= 0x02  # same flag ZipFile sets for its own LZMA entries
+        _write_precompressed(zf, zinfo, compressed)
+    finally:
+        os.unlink(compressed)
+
+
+def _write_precompressed(zf: ZipFile, zinfo: ZipInfo, compressed: str) -> None:
+    """Append an already-compressed stream as *zinfo*, doing the bookkeeping ``ZipFile.open("w")`` does.
+
+    ZipFile has no public way to add pre-compressed data, which is what lets
+    entries be compressed on other processes.
+    """
+    zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT or zinfo.compress_size > zipfile.ZIP64_LIMIT
+    with zf._lock:
+        zf._writecheck(zinfo)
+        zf._didModify = True
+        zf.fp.seek(zf.start_dir)
+        zinfo.header_offset = zf.fp.tell()
+        zf.fp.write(zinfo.FileHeader(zip64))
+        with open(compressed, "rb") as src:
+            shutil.copyfileobj(src, zf.fp, _HASH_CHUNK)
+        zf.start_dir = zf.fp.tell()
+        zf.filelist.append(zinfo)
+        zf.NameToInfo[zinfo.filename] = zinfo
+
+
+def _compress_file(path: str, scratch: str, compress_type: int, level: int | None):
+    """Compress *path* into a scratch file; runs in a worker process."""
+    compressor = zipfile._get_compressor(compress_type, level)
+    crc = 0
+    file_size = compress_size = 0
+    fd, compressed = tempfile.mkstemp(dir=scratch)
+    with open(fd, "wb") as out, open(path, "rb") as src:
+        while chunk := src.read(_HASH_CHUNK):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            data = compressor.compress(chunk)
+            compress_size += len(data)
+            out.write(data)
+        data = compressor.flush()
+        compress_size += len(data)
+        out.write(data)
+    return compressed, crc, file_size, compress_size
+
+
+def _walk_files(root: Path, skip: Path | None):
+    """Yield ``(relative posix path, path)`` for every file below *root*."""
+    skip = skip.resolve() if skip is not None else None
+    for dirpath, _dirnames, filenames in os.walk(root):
+        directory = Path(dirpath)
+        relative = directory.relative_to(root).as_posix()
+        for filename in sorted(filenames):
+            path = directory / filename
+            # The bundle being written may live inside a folder that is being exported.
+            if skip is not None and filename == skip.name and path.resolve() == skip:
+                continue
+            yield (filename if relative == "." else f"{relative}/{filename}"), path
+
+
+def hash_files(
+    session: Session,
+    paths: list[Path],
+    workers: int | None = None,
+    reporter: ProgressReporter | None = None,
+) -> FileHashes:
+    """Return the SHA-256 hex digest of each path.
+
+    Digests recorded in ``file_digests`` are reused while a file's size and
+    mtime are unchanged; the rest are hashed on a thread pool (hashlib
+    releases the GIL) and returned as ``fresh`` rows for the caller to pass
+    to ``record_file_digests``. Only reads *session*. *reporter* sees a
+    ``hash`` phase counting the files that need hashing.
+    """
+    reporter = reporter or ProgressReporter()
+    stats = {path: path.stat() for path in dict.fromkeys(paths)}
+    keys = {path: os.path.abspath(path) for path in stats}
+
+    cached: dict[str, FileDigest] = {}
+    key_list = list(keys.values())
+    for start in range(0, len(key_list), 500):
+        for row in session.query(FileDigest).filter(FileDigest.path.in_(key_list[start : start + 500])):
+            cached[row.path] = row
+
+    digests: dict[Path, str] = {}
+    stale: list[Path] = []
+    for path, stat in stats.items():
+        row = cached.get(keys[path])
+        if row is not None and row.size == stat.st_size and row.mtime_ns == stat.st_mtime_ns:
+            digests[path] = row.sha256
+        else:
+            stale.append(path)
+    reporter.start("hash", len(stale))
+    if not stale:
+        return FileHashes(digests, [])
+
+    workers = workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        try:
+            for path, digest in zip(stale, pool.map(_sha256_file, stale)):
+                digests[path] = digest
+                reporter.advance()
+        except BaseException:
+            pool.shutdown(cancel_futures=True)
+            raise
+
+    fresh = [
+        {
+            "path": keys[path],
+            "size": stats[path].st_size,
+            "mtime_ns": stats[path].st_mtime_ns,
+            "sha256": digests[path],
+        }
+        for path in stale
+    ]
+    return FileHashes(digests, fresh)
+
+
+def record_file_digests(session: Session, rows: list[dict]) -> None:
+    """Upsert ``hash_files``' fresh rows into ``file_digests``; the caller commits."""
+    statement = sqlite_insert(FileDigest)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[FileDigest.path],
+            set_={
+                "size": statement.excluded.size,
+                "mtime_ns": statement.excluded.mtime_ns,
+                "sha256": statement.excluded.sha256,
+            },
+        ),
+        rows,
+    )
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def bundle_blobs(bundle_path: Path) -> dict[str, Path]:
+    """Map every blob reachable from *bundle_path*, following its base chain, to the bundle holding it."""
+    blobs: dict[str, Path] = {}
+    seen: set[Path] = set()
+    current: Path | None = Path(bundle_path)
+    while current is not None:
+        current = current.resolve()
+        if current in seen:
+            break
+        seen.add(current)
+        if not current.exists():
+            raise FileNotFoundError(f"base bundle not found: {current}")
+        with ZipFile(current) as zf:
+            names = zf.namelist()
+            base_ref = json.loads(zf.read(BLOB_MAP)).get("base") if BLOB_MAP in names else None
+        for name in names:
+            if name.startswith(BLOB_PREFIX):
+                blobs.setdefault(name[len(BLOB_PREFIX):], current)
+        current = current.parent / base_ref if base_ref else None
+    return blobs
+
+
+def import_bundle(
+    session: Session,
+    zip_path: Path,
+    restore_files_to: Path | None = None,
+    progress: ProgressCallback | None = None,
+    cancel: CancelToken | None = None,
+) -> dict:
     """Import a zip bundle into the database.
 
+    Records are read straight from the archive and deduplicated against key
+    sets loaded with one query per table. A snapshot bundle is instead
+    attached as a second database and merged in SQL. Resource files are
+    streamed out of the archive only when *restore_files_to* is given.
+
+    When files are restored, records are committed before the first file is
+    written and both steps are logged to a journal in the restore directory.
+    Importing the same bundle into the same directory again after a failure
+    or cancellation picks up after the last restored file. The journal is
+    removed once the import completes.
+
     Args:
         session: Active DB session.
         zip_path: Path to the zip bundle.
         restore_files_to: Directory to extract resource files into.
+        progress: Called with a ``Progress`` per step of the ``records`` and
+                  ``files`` phases.
+        cancel: Token that stops the import at its next step with
+                ``OperationCancelled``; uncommitted records are rolled back.
 
     Returns:
         Summary dict with counts of imported items.
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmp = Path(tmpdir)
+    reporter = ProgressReporter(progress, cancel)
+    journal = _ImportJournal(Path(restore_files_to), Path(zip_path)) if restore_files_to else None
+    try:
         with ZipFile(zip_path, "r") as zf:
-            zf.extractall(tmp)
+            names = set(zf.namelist())
+            if SNAPSHOT in names:
+                counts = _import_snapshot(session, zf, names, zip_path, journal, reporter)
+            else:
+                if journal is not None and journal.counts is not None:
+                    counts = journal.counts
+                else:
+                    counts = _import_records(session, zf, names, reporter)
+                    if journal is not None:
+                        # Commit before the slow part so a rerun only redoes files.
+                        session.commit()
+                        bump_write_generation(session.get_bind())
+                        journal.record_counts(counts)
+                if journal is not None:
+                    _restore_files(zf, names, zip_path, journal, reporter)
+    except BaseException:
+        session.rollback()
+        if journal is not None:
+            journal.close()
+        raise
 
-        manifest = tmp / "snapkit_data.json"
-        data = json.loads(manifest.read_text(encoding="utf-8"))
+    session.commit()
+    bump_write_generation(session.get_bind())
+    if journal is not None:
+        journal.remove()
+    return counts
+
+
+def _import_records(session: Session, zf: ZipFile, names: set[str], reporter: ProgressReporter) -> dict:
+    if MANIFEST in names:
+        reporter.start("records")
+        with zf.open(MANIFEST) as manifest:
+            return _load_tables(session, reporter.track(read_manifest(manifest), _INSERT_BATCH))
+    with zf.open(MANIFEST_V1) as manifest:
+        data = json.load(manifest)
+    reporter.start("records", sum(len(data.get(table, [])) for table in _LOADERS))
+    records = ((table, item) for table in _LOADERS for item in data.get(table, []))
+    return _load_tables(session, reporter.track(records, _INSERT_BATCH))
 
-        counts = {
-            "installed_apps": _load_installed(session, data.get("installed_apps", [])),
-            "pinned_apps": _load_pinned(session, data.get("pinned_apps", [])),
-            "not_installed_apps": _load_not_installed(session, data.get("not_installed_apps", [])),
-            "resource_items": _load_resources(session, data.get("resource_items", [])),
-        }
 
-        # Restore files
-        file_map_path = tmp / "file_map.json"
-        if file_map_path.exists() and restore_files_to:
-            file_map = json.loads(file_map_path.read_text(encoding="utf-8"))
-            restore_files_to = Path(restore_files_to)
-            restore_files_to.mkdir(parents=True, exist_ok=True)
-            files_dir = tmp / "files"
-            for _res_id, fname in file_map.items():
-                src = files_dir / fname
-                if src.exists():
-                    dest = restore_files_to / fname
-                    if src.is_dir():
-                        shutil.copytree(src, dest, dirs_exist_ok=True)
-                    else:
-                        shutil.copy2(src, dest)
-
-        session.commit()
+def _import_snapshot(
+    session: Session,
+    zf: ZipFile,
+    names: set[str],
+    zip_path: Path,
+    journal: "_ImportJournal | None",
+    reporter: ProgressReporter,
+) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        copy = Path(tmp) / SNAPSHOT
+        with zf.open(SNAPSHOT) as src, open(copy, "wb") as dest:
+            shutil.copyfileobj(src, dest, _HASH_CHUNK)
+        prepare_snapshot(copy)
+        # Files first: the merge commits on its own and cannot be undone afterwards.
+        if journal is not None:
+            _restore_files(zf, names, zip_path, journal, reporter)
+        reporter.start("records")
+        counts = merge_snapshot(session, copy)
+        reporter.advance(sum(counts.values()))
     return counts
 
 
+class _ImportJournal:
+    """Append-only log of what an import into one restore directory has finished.
+
+    The first line identifies the bundle by path, size and mtime; a journal
+    left by a different bundle is discarded. Later lines are either
+    ``{"counts": {...}}`` once records are committed or ``{"file": path}``
+    per restored file.
+    """
+
+    def __init__(self, restore_to: Path, zip_path: Path):
+        self.restore_to = restore_to
+        self.path = restore_to / IMPORT_JOURNAL
+        stat = zip_path.stat()
+        self._identity = {"bundle": str(zip_path.resolve()), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        self.counts: dict | None = None
+        self.files: set[str] = set()
+        self._resumed = self._load()
+        self._fh = None
+
+    def _load(self) -> bool:
+        """Read a journal this bundle left behind; False if there is none to resume."""
+        try:
+            with open(self.path, encoding="utf-8") as fh:
+                lines = fh.read().splitlines()
+        except FileNotFoundError:
+            return False
+        try:
+            if not lines or json.loads(lines[0]) != self._identity:
+                return False
+            for line in lines[1:]:
+                entry = json.loads(line)
+                if "counts" in entry:
+                    self.counts = entry["counts"]
+                elif "file" in entry:
+                    self.files.add(entry["file"])
+        except ValueError:
+            pass  # a line cut short by a crash; everything before it still counts
+        return True
+
+    def record_counts(self, counts: dict) -> None:
+        self.counts = counts
+        self._append({"counts": counts})
+
+    def record_file(self, path: str) -> None:
+        self.files.add(path)
+        self._append({"file": path})
+
+    def _append(self, entry: dict) -> None:
+        if self._fh is None:
+            self.restore_to.mkdir(parents=True, exist_ok=True)
+            self._fh = open(self.path, "a" if self._resumed else "w", encoding="utf-8")
+            if not self._resumed:
+                self._fh.write(json.dumps(self._identity) + "\n")
+        self._fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def remove(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+def _restore_files(
+    zf: ZipFile, names: set[str], zip_path: Path, journal: _ImportJournal, reporter: ProgressReporter
+) -> None:
+    if BLOB_MAP in names:
+        blob_map = json.loads(zf.read(BLOB_MAP))
+        _restore_blobs(zip_path, blob_map["resources"], journal, reporter)
+    elif "file_map.json" in names:
+        file_map = json.loads(zf.read("file_map.json"))
+        _restore_legacy_files(zf, set(file_map.values()), journal, reporter)
+
+
+def _restore_blobs(
+    zip_path: Path, resources: dict[str, dict], journal: _ImportJournal, reporter: ProgressReporter
+) -> None:
+    """Write each resource's files under the journal's directory, reading blobs from the bundle chain."""
+    blobs = bundle_blobs(zip_path)
+    planned = []
+    for entry in resources.values():
+        files = {None: entry["blob"]} if "blob" in entry else entry["files"]
+        for relative, digest in files.items():
+            path = entry["name"] if relative is None else f"{entry['name']}/{relative}"
+            planned.append((entry["name"], path, digest))
+
+    reporter.start("files", len(planned))
+    archives: dict[Path, ZipFile] = {}
+    try:
+        for name, path, digest in planned:
+            if path not in journal.files:
+                holder = blobs.get(digest)
+                if holder is None:
+                    raise FileNotFoundError(f"blob {digest} for {name!r} is not in {zip_path} or its base bundles")
+                if holder not in archives:
+                    archives[holder] = ZipFile(holder)
+                _extract_to(archives[holder], BLOB_PREFIX + digest, _safe_join(journal.restore_to, path))
+                journal.record_file(path)
+            reporter.advance()
+    finally:
+        for archive in archives.values():
+            archive.close()
+
+
+def _restore_legacy_files(
+    zf: ZipFile, names: set[str], journal: _ImportJournal, reporter: ProgressReporter
+) -> None:
+    """Restore ``files/<name>`` entries (and folders below them) of a pre-blob bundle."""
+    planned = []
+    for info in zf.infolist():
+        parts = info.filename.split("/", 2)
+        if len(parts) < 2 or parts[0] != "files" or parts[1] not in names or info.is_dir():
+            continue
+        planned.append((info.filename, "/".join(parts[1:])))
+
+    reporter.start("files", len(planned))
+    for member, path in planned:
+        if path not in journal.files:
+            _extract_to(zf, member, _safe_join(journal.restore_to, path))
+            journal.record_file(path)
+        reporter.advance()
+
+
+def _extract_to(zf: ZipFile, member: str, dest: Path) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    with zf.open(member) as src, open(dest, "wb") as out:
+        shutil.copyfileobj(src, out, _HASH_CHUNK)
+
+
+def _safe_join(root: Path, relative: str) -> Path:
+    """Join a bundle-supplied relative path onto *root*, refusing anything that escapes it."""
+    parts = [part for part in relative.replace("\\", "/").split("/") if part not in ("", ".")]
+    if not parts or ".." in parts or ":" in parts[0]:
+        raise ValueError(f"unsafe path in bundle: {relative!r}")
+    return root.joinpath(*parts)
+
+
 # ── Serialization helpers ─────────────────────────────────────────────
 
 
-def _dump_installed(session: Session) -> list[dict]:
-    return [
-        {
-            "name": a.name,
-            "custom_name": a.custom_name,
-            "custom_icon_path": a.custom_icon_path,
-            "publisher": a.publisher,
-            "display_icon": a.display_icon,
-            "uninstall_command": a.uninstall_command,
-            "install_location": a.install_location,
-            "version": a.version,
-            "registry_key": a.registry_key,
-            "tags": a.tags,
-        }
-        for a in session.query(InstalledApp).all()
-    ]
+def write_manifest(out, tables) -> dict[str, int]:
+    """Write a v2 manifest for ``(table, records)`` pairs to the binary stream *out*.
 
+    Returns the number of records written per table.
+    """
+    digest = hashlib.sha256()
+    counts: dict[str, int] = {}
+
+    def emit(obj: dict) -> None:
+        line = (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+        digest.update(line)
+        out.write(line)
 
-def _dump_pinned(session: Session) -> list[dict]:
-    return [
+    emit(
         {
-            "installed_app_registry_key": p.installed_app.registry_key,
-            "launch_command": p.launch_command,
-            "tags": p.tags,
+            "type": "header",
+            "format": MANIFEST_FORMAT,
+            "version": MANIFEST_VERSION,
+            "exported_at": datetime.now(UTC).isoformat(),
         }
-        for p in session.query(PinnedApp).all()
-    ]
+    )
+    for table, records in tables:
+        counts[table] = 0
+        for record in records:
+            emit({"table": table, "record": record})
+            counts[table] += 1
+    footer = {"type": "footer", "counts": counts, "sha256": digest.hexdigest()}
+    out.write((json.dumps(footer, separators=(",", ":")) + "\n").encode("utf-8"))
+    return counts
 
 
-def _dump_not_installed(session: Session) -> list[dict]:
-    return [
-        {
-            "name": a.name,
-            "description": a.description,
-            "download_url": a.download_url,
-            "tags": a.tags,
-        }
-        for a in session.query(NotInstalledApp).all()
-    ]
+def read_manifest(stream):
+    """Yield ``(table, record)`` from a v2 manifest in the binary *stream*.
+
+    The footer is checked once the last record has been yielded; a missing
+    footer, a count mismatch or a checksum mismatch raises ``ValueError``,
+    so callers should apply records inside a transaction they can roll back.
+    """
+    digest = hashlib.sha256()
+    header_line = stream.readline()
+    try:
+        header = json.loads(header_line)
+    except ValueError:
+        header = None
+    if not isinstance(header, dict) or header.get("format") != MANIFEST_FORMAT:
+        raise ValueError("not a SnapKit manifest")
+    if header.get("version", 0) > MANIFEST_VERSION:
+        raise ValueError(f"manifest version {header['version']} is newer than this SnapKit supports")
+    digest.update(header_line)
 
+    counts: dict[str, int] = {}
+    for line in stream:
+        entry = json.loads(line)
+        if entry.get("type") == "footer":
+            expected = {name: count for name, count in (entry.get("counts") or {}).items() if count}
+            if expected != counts:
+                raise ValueError("manifest record counts do not match its footer")
+            if entry.get("sha256") != digest.hexdigest():
+                raise ValueError("manifest checksum mismatch")
+            return
+        digest.update(line)
+        table = entry["table"]
+        counts[table] = counts.get(table, 0) + 1
+        yield table, entry["record"]
+    raise ValueError("manifest is truncated: no footer")
 
-def _dump_resources(session: Session) -> list[dict]:
-    return [
-        {
-            "name": r.name,
-            "path": r.path,
-            "resource_type": r.resource_type,
-            "tags": r.tags,
-        }
-        for r in session.query(ResourceItem).all()
-    ]
 
+def _selected_statements(selection: ExportSelection) -> dict:
+    """Filtered, id-ordered dump query per selected table, in manifest order."""
+    tables = selection.tables
+    statements = {}
+    pinned = _tagged(PinnedApp, selection)
+    if "installed_apps" in tables or "pinned_apps" in tables:
+        conditions = []
+        if "installed_apps" in tables:
+            conditions.append(_tagged(InstalledApp, selection))
+        if "pinned_apps" in tables:
+            conditions.append(InstalledApp.id.in_(select(PinnedApp.installed_app_id).where(pinned)))
+        statements["installed_apps"] = _installed_select().where(or_(*conditions))
+    if "pinned_apps" in tables:
+        statements["pinned_apps"] = _pinned_select().where(pinned)
+    if "not_installed_apps" in tables:
+        statements["not_installed_apps"] = _not_installed_select().where(_tagged(NotInstalledApp, selection))
+    if "resource_items" in tables:
+        statements["resource_items"] = _resources_select().where(_resource_filter(selection))
+    return statements
 
-# ── Deserialization helpers ───────────────────────────────────────────
 
+def _tagged(model, selection: ExportSelection):
+    if not selection.tags:
+        return true()
+    return or_(*(tag_filter(model, tag) for tag in selection.tags))
 
-def _load_installed(session: Session, items: list[dict]) -> int:
-    count = 0
-    for item in items:
-        existing = session.query(InstalledApp).filter_by(registry_key=item.get("registry_key")).first()
-        if not existing:
-            session.add(InstalledApp(**item))
-            count += 1
-    return count
 
+def _resource_filter(selection: ExportSelection):
+    conditions = [_tagged(ResourceItem, selection)]
+    if selection.types:
+        conditions.append(ResourceItem.resource_type.in_(selection.types))
+    if selection.resource_ids:
+        conditions.append(ResourceItem.id.in_(selection.resource_ids))
+    return and_(*conditions)
 
-def _load_pinned(session: Session, items: list[dict]) -> int:
-    count = 0
-    for item in items:
-        reg_key = item.get("installed_app_registry_key")
-        if not reg_key:
-            continue
-        installed = session.query(InstalledApp).filter_by(registry_key=reg_key).first()
-        if not installed:
+
+def _count_rows(session: Session, statements: dict) -> dict[str, int]:
+    return {
+        table: session.scalar(select(func.count()).select_from(statement.order_by(None).subquery()))
+        for table, statement in statements.items()
+    }
+
+
+def _manifest_bytes(session: Session, table: str, statement) -> int:
+    """Approximate size of *statement*'s rows as manifest lines, summed in SQL."""
+    rows = statement.order_by(None).subquery()
+    # Per value: quoted key, colon, comma and string quotes; a NULL is written as null.
+    per_row = len(f'{{"table":"{table}","record":{{}}}}\n') + sum(len(column.name) + 6 for column in rows.c)
+    values = sum((func.coalesce(func.length(column), 4) for column in rows.c), start=0)
+    count, total = session.execute(select(func.count(), func.coalesce(func.sum(values), 0)).select_from(rows)).one()
+    return count * per_row + total
+
+
+def _stream_rows(session: Session, statement):
+    for row in session.execute(statement.execution_options(yield_per=_DUMP_BATCH)).mappings():
+        yield dict(row)
+
+
+def _installed_select():
+    return select(
+        InstalledApp.name,
+        InstalledApp.custom_name,
+        InstalledApp.custom_icon_path,
+        InstalledApp.publisher,
+        InstalledApp.display_icon,
+        InstalledApp.uninstall_command,
+        InstalledApp.install_location,
+        InstalledApp.version,
+        InstalledApp.registry_key,
+        InstalledApp.tags,
+    ).order_by(InstalledApp.id)
+
+
+def _pinned_select():
+    return (
+        select(
+            InstalledApp.registry_key.label("installed_app_registry_key"),
+            PinnedApp.launch_command,
+            PinnedApp.tags,
+        )
+        .join(InstalledApp, PinnedApp.installed_app_id == InstalledApp.id)
+        .order_by(PinnedApp.id)
+    )
+
+
+def _not_installed_select():
+    return select(
+        NotInstalledApp.name,
+        NotInstalledApp.description,
+        NotInstalledApp.download_url,
+        NotInstalledApp.tags,
+    ).order_by(NotInstalledApp.id)
+
+
+def _resources_select():
+    return select(
+        ResourceItem.name,
+        ResourceItem.path,
+        ResourceItem.resource_type,
+        ResourceItem.tags,
+    ).order_by(ResourceItem.id)
+
+
+# ── Deserialization helpers ───────────────────────────────────────────
+#
+# Each loader reads the keys already in its table with one query, skips
+# records whose key is taken (by the database or by an earlier record in
+# the bundle) and inserts the rest with bulk INSERT ... RETURNING in
+# batches, so tags can be indexed for the new ids and memory stays bounded
+# by the batch size plus the key sets.
+
+
+def _load_tables(session: Session, records) -> dict[str, int]:
+    """Apply ``(table, record)`` pairs; consecutive records of a table are loaded together."""
+    counts = dict.fromkeys(_LOADERS, 0)
+    for table, group in itertools.groupby(records, key=lambda entry: entry[0]):
+        items = (record for _, record in group)
+        loader = _LOADERS.get(table)
+        if loader is None:  # a table from a newer SnapKit
+            for _ in items:
+                pass
             continue
-        existing = session.query(PinnedApp).filter_by(installed_app_id=installed.id).first()
-        if not existing:
-            session.add(PinnedApp(
-                installed_app_id=installed.id,
-                launch_command=item.get("launch_command"),
-                tags=item.get("tags"),
-            ))
-            count += 1
-    return count
+        counts[table] += loader(session, items)
+    return counts
 
 
-def _load_not_installed(session: Session, items: list[dict]) -> int:
-    count = 0
-    for item in items:
-        existing = session.query(NotInstalledApp).filter_by(name=item["name"]).first()
-        if not existing:
-            session.add(NotInstalledApp(**item))
-            count += 1
-    return count
+def _insert_rows(session: Session, model, rows: list[dict]) -> int:
+    if not rows:
+        return 0
+    # Core insert on the table with one key set for every row, so SQLAlchemy
+    # sends one multi-row INSERT ... RETURNING per batch. RETURNING carries
+    # the tags next to each new id because SQLite does not promise to return
+    # rows in parameter order (asking for that order means one row per
+    # statement), and the ORM bulk path regroups rows by which values are None.
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    rows = [{column: row.get(column) for column in columns} for row in rows]
+    table = model.__table__
+    inserted = session.execute(insert(table).returning(table.c.id, table.c.tags), rows).all()
+    tagged = [(model.tag_kind, item_id, tags) for item_id, tags in inserted if tags]
+    if tagged:
+        sync_item_tags(session.connection(), tagged)
+    return len(inserted)
 
 
-def _load_resources(session: Session, items: list[dict]) -> int:
+def _insert_batched(session: Session, model, rows) -> int:
     count = 0
-    for item in items:
-        existing = (
-            session.query(ResourceItem)
-            .filter_by(name=item["name"], path=item["path"])
-            .first()
-        )
-        if not existing:
-            session.add(ResourceItem(**item))
-            count += 1
+    for batch in _batched(rows, _INSERT_BATCH):
+        count += _insert_rows(session, model, batch)
     return count
+
+
+def _batched(iterable, size: int):
+    iterator = iter(iterable)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+
+def _load_installed(session: Session, items) -> int:
+    seen = set(session.scalars(select(InstalledApp.registry_key)))
+
+    def rows():
+        for item in items:
+            key = item.get("registry_key")
+            if key in seen:
+                continue
+            seen.add(key)
+            yield {
+                **item,
+                "name_key": normalize_name_key(item.get("name")),
+                "custom_name_key": normalize_name_key(item.get("custom_name")),
+            }
+
+    return _insert_batched(session, InstalledApp, rows())
+
+
+def _load_pinned(session: Session, items) -> int:
+    app_ids = dict(
+        session.execute(
+            select(InstalledApp.registry_key, func.min(InstalledApp.id))
+            .where(InstalledApp.registry_key.is_not(None))
+            .group_by(InstalledApp.registry_key)
+        ).all()
+    )
+    pinned = set(session.scalars(select(PinnedApp.installed_app_id)))
+
+    def rows():
+        for item in items:
+            app_id = app_ids.get(item.get("installed_app_registry_key"))
+            if app_id is None or app_id in pinned:
+                continue
+            pinned.add(app_id)
+            yield {
+                "installed_app_id": app_id,
+                "launch_command": item.get("launch_command"),
+                "tags": item.get("tags"),
+            }
+
+    return _insert_batched(session, PinnedApp, rows())
+
+
+def _load_not_installed(session: Session, items) -> int:
+    seen = set(session.scalars(select(NotInstalledApp.name)))
+
+    def rows():
+        for item in items:
+            if item["name"] in seen:
+                continue
+            seen.add(item["name"])
+            yield {**item, "name_key": normalize_name_key(item["name"])}
+
+    return _insert_batched(session, NotInstalledApp, rows())
+
+
+def _load_resources(session: Session, items) -> int:
+    seen = {tuple(row) for row in session.execute(select(ResourceItem.name, ResourceItem.path))}
+
+    def rows():
+        for item in items:
+            key = (item["name"], item["path"])
+            if key in seen:
+                continue
+            seen.add(key)
+            yield item
+
+    return _insert_batched(session, ResourceItem, rows())
+
+
+# Manifest table name -> loader, in the order records are written and applied.
+_LOADERS = {
+    "installed_apps": _load_installed,
+    "pinned_apps": _load_pinned,
+    "not_installed_apps": _load_not_installed,
+    "resource_items": _load_resources,
+}
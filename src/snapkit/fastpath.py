@@ -0,0 +1,66 @@
+"""SQLAlchemy-free reads for hot CLI commands.
+
+Importing SQLAlchemy and configuring the ORM mappers costs far more than the
+single row lookup a command like ``snapkit run 3`` needs, so these helpers go
+straight to ``sqlite3``. They only trust databases stamped with the current
+``SCHEMA_VERSION``; anything else raises ``FastPathUnavailable`` and the caller
+falls back to the regular ORM path, which also migrates the file.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import NamedTuple
+
+DEFAULT_DB_DIR = Path.home() / ".snapkit"
+DEFAULT_DB_PATH = DEFAULT_DB_DIR / "snapkit.db"
+
+# Stored in PRAGMA user_version once tables, triggers and migrations are in place.
+# Bump whenever models.py or db._migrate_sqlite_schema changes the schema.
+SCHEMA_VERSION = 4
+
+
+class FastPathUnavailable(Exception):
+    """The database cannot be read without going through ``init_db`` first."""
+
+
+class PinnedLaunch(NamedTuple):
+    pin_id: int
+    installed_app_id: int
+    name: str
+    launch_command: str | None
+    install_location: str | None
+
+
+def lookup_pinned_launch(pin_id: int, db_path: Path | str | None = None) -> PinnedLaunch | None:
+    """Launch details for pin *pin_id*, or ``None`` if there is no such pin."""
+    with closing(connect(db_path)) as conn:
+        row = conn.execute(
+            "SELECT p.id, a.id, a.name, p.launch_command, a.install_location "
+            "FROM pinned_apps AS p JOIN installed_apps AS a ON a.id = p.installed_app_id "
+            "WHERE p.id = ?",
+            (pin_id,),
+        ).fetchone()
+    return PinnedLaunch(*row) if row else None
+
+
+def connect(db_path: Path | str | None = None, readonly: bool = True) -> sqlite3.Connection:
+    """Open a stamped database directly; raises ``FastPathUnavailable`` otherwise."""
+    path = Path(db_path) if db_path else DEFAULT_DB_PATH
+    if not path.is_file():
+        raise FastPathUnavailable(f"no database at {path}")
+
+    mode = "ro" if readonly else "rw"
+    conn = sqlite3.connect(f"{path.resolve().as_uri()}?mode={mode}", uri=True)
+    try:
+        conn.execute("PRAGMA busy_timeout=5000")
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    except sqlite3.Error as exc:
+        conn.close()
+        raise FastPathUnavailable(str(exc)) from exc
+    if version != SCHEMA_VERSION:
+        conn.close()
+        raise FastPathUnavailable(f"schema version {version}, expected {SCHEMA_VERSION}")
+    return conn
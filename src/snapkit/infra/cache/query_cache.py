@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass, fields
+
+from snapkit.core.entities import UiItem
+
+
+@dataclass(slots=True, frozen=True)
+class CacheStats:
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    generation: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class QueryCache:
+    """LRU cache for list-view results, bounded by estimated memory size.
+
+    Entries are tagged with the write generation they were built under; as soon
+    as a newer generation is observed the whole cache is dropped.
+    """
+
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, max_entries: int = 128):
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._memory: OrderedDict[Hashable, tuple[list, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._generation = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, generation: int) -> list | None:
+        with self._lock:
+            self._sync_generation(generation)
+            entry = self._memory.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._memory.move_to_end(key)
+            self._hits += 1
+            return list(entry[0])
+
+    def set(self, key: Hashable, generation: int, items: list):
+        size = estimate_size(items)
+        with self._lock:
+            self._sync_generation(generation)
+            if generation != self._generation or size > self._max_bytes:
+                return
+
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous[1]
+
+            self._memory[key] = (list(items), size)
+            self._size_bytes += size
+            while self._memory and (
+                self._size_bytes > self._max_bytes or len(self._memory) > self._max_entries
+            ):
+                _, (_, evicted_size) = self._memory.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._size_bytes = 0
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._memory),
+                size_bytes=self._size_bytes,
+                generation=self._generation,
+            )
+
+    def _sync_generation(self, generation: int):
+        if generation > self._generation:
+            self._memory.clear()
+            self._size_bytes = 0
+            self._generation = generation
+
+
+_ITEM_FIELDS = tuple(f.name for f in fields(UiItem))
+
+
+def estimate_size(items: list) -> int:
+    """Rough deep size of a result list; good enough for an eviction budget.
+
+    Handles lists of ``UiItem`` as well as plain row tuples.
+    """
+    total = sys.getsizeof(items)
+    for item in items:
+        total += sys.getsizeof(item)
+        values = item if isinstance(item, tuple) else (getattr(item, name) for name in _ITEM_FIELDS)
+        for value in values:
+            if isinstance(value, str):
+                total += sys.getsizeof(value)
+    return total
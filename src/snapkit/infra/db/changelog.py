@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from snapkit.core.entities import ChangeEvent
+from snapkit.models import ChangeConsumer, ChangeLogEntry
+
+
+def latest_seq(session: Session) -> int:
+    """Sequence number of the newest logged change, or 0 if the log is empty."""
+    return session.scalar(select(func.max(ChangeLogEntry.seq))) or 0
+
+
+def changes_since(session: Session, seq: int, limit: int = 1000) -> list[ChangeEvent]:
+    """Rows changed after *seq*, one event per row carrying its latest operation.
+
+    Events are ordered by ``seq``; poll again from the last event's ``seq`` to
+    continue. An ``"I"`` or ``"U"`` means re-read the row, ``"D"`` means drop it.
+    """
+    latest = (
+        select(func.max(ChangeLogEntry.seq))
+        .where(ChangeLogEntry.seq > seq)
+        .group_by(ChangeLogEntry.table_name, ChangeLogEntry.row_id)
+    )
+    rows = session.execute(
+        select(
+            ChangeLogEntry.seq,
+            ChangeLogEntry.table_name,
+            ChangeLogEntry.row_id,
+            ChangeLogEntry.op,
+        )
+        .where(ChangeLogEntry.seq.in_(latest))
+        .order_by(ChangeLogEntry.seq)
+        .limit(limit)
+    ).all()
+    return [ChangeEvent(*row) for row in rows]
+
+
+def register_consumer(session: Session, name: str) -> int:
+    """Register *name* as a change consumer starting from the current log head.
+
+    Re-registering keeps the consumer's existing position. Returns that position.
+    """
+    session.execute(
+        sqlite_insert(ChangeConsumer)
+        .values(name=name, acked_seq=latest_seq(session))
+        .on_conflict_do_nothing(index_elements=["name"])
+    )
+    return session.scalar(select(ChangeConsumer.acked_seq).where(ChangeConsumer.name == name))
+
+
+def unregister_consumer(session: Session, name: str) -> int:
+    """Forget *name* so it no longer holds back truncation; returns rows truncated."""
+    session.execute(delete(ChangeConsumer).where(ChangeConsumer.name == name))
+    return truncate_change_log(session)
+
+
+def ack_changes(session: Session, name: str, seq: int) -> int:
+    """Record that *name* has processed everything up to *seq*; returns rows truncated."""
+    consumer = session.get(ChangeConsumer, name)
+    if consumer is None:
+        raise KeyError(f"unknown change consumer: {name}")
+    consumer.acked_seq = max(consumer.acked_seq, seq)
+    session.flush()
+    return truncate_change_log(session)
+
+
+def truncate_change_log(session: Session) -> int:
+    """Delete log entries every registered consumer has acknowledged.
+
+    With no consumers registered nobody is reading the log, so it is emptied.
+    """
+    floor = session.scalar(select(func.min(ChangeConsumer.acked_seq)))
+    if floor is None:
+        floor = latest_seq(session)
+    result = session.execute(delete(ChangeLogEntry).where(ChangeLogEntry.seq <= floor))
+    return result.rowcount or 0
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import Engine, text
+from sqlalchemy.exc import OperationalError
+
+AUTO_VACUUM_INCREMENTAL = 2
+
+
+@dataclass(slots=True, frozen=True)
+class ObjectStats:
+    """Storage used by one table or index; byte figures need SQLite's dbstat."""
+
+    name: str
+    table_name: str
+    is_index: bool
+    rows: int | None
+    pages: int | None
+    size_bytes: int | None
+    unused_bytes: int | None
+
+    @property
+    def fragmentation(self) -> float | None:
+        """Share of this object's pages left empty."""
+        if not self.size_bytes or self.unused_bytes is None:
+            return None
+        return self.unused_bytes / self.size_bytes
+
+
+@dataclass(slots=True, frozen=True)
+class MaintenanceReport:
+    page_size: int
+    page_count: int
+    freelist_count: int
+    reclaimed_pages: int
+    auto_vacuum: int
+    analyzed: bool
+    integrity: list[str] | None
+    objects: list[ObjectStats]
+    duration: float
+
+    @property
+    def size_bytes(self) -> int:
+        return self.page_size * self.page_count
+
+    @property
+    def free_ratio(self) -> float:
+        return self.freelist_count / self.page_count if self.page_count else 0.0
+
+    @property
+    def integrity_ok(self) -> bool | None:
+        return None if self.integrity is None else self.integrity == ["ok"]
+
+
+def run_maintenance(
+    engine: Engine,
+    *,
+    analyze: bool = True,
+    vacuum: bool = True,
+    integrity: bool = True,
+    quick: bool = False,
+) -> MaintenanceReport:
+    """Refresh planner statistics, reclaim free pages and check the database.
+
+    ``quick`` is the idle-time variant run after scans: ``PRAGMA optimize``
+    instead of a full ``ANALYZE``, no one-off conversion to incremental
+    auto-vacuum, no integrity check and no per-object report.
+    """
+    started = time.perf_counter()
+    # Autocommit: VACUUM and the auto_vacuum switch cannot run inside a transaction.
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if analyze:
+            conn.execute(text("PRAGMA optimize" if quick else "ANALYZE"))
+
+        reclaimed = 0
+        if vacuum:
+            if _pragma(conn, "auto_vacuum") != AUTO_VACUUM_INCREMENTAL and not quick:
+                # The mode only changes on a full rebuild, which also drops every free page.
+                before = _pragma(conn, "freelist_count")
+                conn.execute(text(f"PRAGMA auto_vacuum = {AUTO_VACUUM_INCREMENTAL}"))
+                conn.execute(text("VACUUM"))
+                reclaimed = before
+            elif _pragma(conn, "auto_vacuum") == AUTO_VACUUM_INCREMENTAL:
+                before = _pragma(conn, "freelist_count")
+                # sqlite3's execute() steps once, freeing a single page; a script runs to completion.
+                conn.connection.driver_connection.executescript("PRAGMA incremental_vacuum;")
+                reclaimed = before - _pragma(conn, "freelist_count")
+            if _pragma(conn, "journal_mode") == "wal":
+                conn.execute(text("PRAGMA wal_checkpoint(TRUNCATE)")).fetchall()
+
+        checks = None
+        if integrity and not quick:
+            checks = [row[0] for row in conn.execute(text("PRAGMA integrity_check")).fetchall()]
+
+        return MaintenanceReport(
+            page_size=_pragma(conn, "page_size"),
+            page_count=_pragma(conn, "page_count"),
+            freelist_count=_pragma(conn, "freelist_count"),
+            reclaimed_pages=reclaimed,
+            auto_vacuum=_pragma(conn, "auto_vacuum"),
+            analyzed=analyze,
+            integrity=checks,
+            objects=[] if quick else _object_stats(conn),
+            duration=time.perf_counter() - started,
+        )
+
+
+def _pragma(conn, name: str):
+    return conn.execute(text(f"PRAGMA {name}")).scalar()
+
+
+def _object_stats(conn) -> list[ObjectStats]:
+    schema = conn.execute(
+        text(
+            "SELECT name, type, tbl_name FROM sqlite_master "
+            "WHERE type IN ('table', 'index') AND name NOT LIKE 'sqlite_%' "
+            "ORDER BY tbl_name, type DESC, name"
+        )
+    ).fetchall()
+
+    try:
+        usage = {
+            name: (pages, size, unused)
+            for name, pages, size, unused in conn.execute(
+                text(
+                    "SELECT name, count(*), sum(pgsize), sum(unused) "
+                    "FROM dbstat GROUP BY name"
+                )
+            )
+        }
+    except OperationalError:
+        # SQLite builds without SQLITE_ENABLE_DBSTAT_VTAB: row counts only.
+        usage = {}
+
+    objects = []
+    for name, object_type, table_name in schema:
+        is_index = object_type == "index"
+        rows = None if is_index else conn.execute(text(f'SELECT count(*) FROM "{name}"')).scalar()
+        pages, size, unused = usage.get(name, (None, None, None))
+        objects.append(ObjectStats(name, table_name, is_index, rows, pages, size, unused))
+    return objects
@@ -1,147 +1,350 @@
 ﻿from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Hashable
+from datetime import datetime
 
-from sqlalchemy import Engine, or_
+from sqlalchemy import Engine, exists, func, or_, select, tuple_
+from sqlalchemy.orm import scoped_session, sessionmaker
 
-from snapkit.core.entities import UiItem
-from snapkit.db import get_session
-from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
+from snapkit.core.entities import ItemKind, UiItem
+from snapkit.db import write_generation
+from snapkit.infra.cache.query_cache import CacheStats, QueryCache
+from snapkit.models import (
+    InstalledApp,
+    ItemTag,
+    NotInstalledApp,
+    PinnedApp,
+    ResourceItem,
+    Tag,
+    tag_filter,
+)
 
 
 class SqlAlchemyToolboxRepository:
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, cache: QueryCache | None = None):
         self._engine = engine
-        self._session_factory: Callable = lambda: get_session(self._engine)
+        # Thread-local sessions: the GUI thread and background scans read concurrently.
+        self._sessions = scoped_session(sessionmaker(bind=engine))
+        self._cache = cache if cache is not None else QueryCache()
+
+    def cache_stats(self) -> CacheStats:
+        return self._cache.stats()
 
     def list_installed(
-        self, search: str = "", limit: int = 300, pinned_filter: str = "all"
+        self,
+        search: str = "",
+        limit: int = 300,
+        pinned_filter: str = "all",
+        after: str | None = None,
+        tag: str | None = None,
+    ) -> list[UiItem]:
+        return self._cached(
+            ("installed", search, pinned_filter, limit, after, tag),
+            lambda: self._query_installed(search, limit, pinned_filter, after, tag),
+        )
+
+    def list_pinned(
+        self,
+        search: str = "",
+        limit: int = 300,
+        after: str | None = None,
+        tag: str | None = None,
+    ) -> list[UiItem]:
+        return self._cached(
+            ("pinned", search, None, limit, after, tag),
+            lambda: self._query_pinned(search, limit, after, tag),
+        )
+
+    def list_not_installed(
+        self,
+        search: str = "",
+        limit: int = 300,
+        after: str | None = None,
+        tag: str | None = None,
+    ) -> list[UiItem]:
+        return self._cached(
+            ("not_installed", search, None, limit, after, tag),
+            lambda: self._query_not_installed(search, limit, after, tag),
+        )
+
+    def list_resources(
+        self,
+        resource_type: str,
+        search: str = "",
+        limit: int = 300,
+        after: str | None = None,
+        tag: str | None = None,
     ) -> list[UiItem]:
-        session = self._session_factory()
+        return self._cached(
+            ("resources", search, resource_type, limit, after, tag),
+            lambda: self._query_resources(resource_type, search, limit, after, tag),
+        )
+
+    def tag_facets(
+        self, kind: ItemKind, resource_type: str | None = None
+    ) -> list[tuple[str, int]]:
+        """Tag names with item counts for one item kind, most used first."""
+        return self._cached(
+            ("tag_facets", kind, resource_type),
+            lambda: self._query_tag_facets(kind, resource_type),
+        )
+
+    def _cached(self, key: Hashable, loader: Callable[[], list]) -> list:
+        generation = write_generation(self._engine)
+        items = self._cache.get(key, generation)
+        if items is not None:
+            return items
+        items = loader()
+        self._cache.set(key, generation, items)
+        return items
+
+    def _query_installed(
+        self, search: str, limit: int, pinned_filter: str, after: str | None, tag: str | None
+    ) -> list[UiItem]:
+        session = self._sessions()
         try:
-            query = session.query(InstalledApp)
+            is_pinned = exists().where(PinnedApp.installed_app_id == InstalledApp.id)
+            stmt = select(
+                InstalledApp.id,
+                InstalledApp.name,
+                InstalledApp.custom_name,
+                InstalledApp.publisher,
+                InstalledApp.version,
+                InstalledApp.install_location,
+                InstalledApp.uninstall_command,
+                InstalledApp.custom_icon_path,
+                InstalledApp.display_icon,
+                is_pinned,
+            )
             if search:
-                query = query.filter(
+                stmt = stmt.where(
                     or_(
                         InstalledApp.name.ilike(f"%{search}%"),
                         InstalledApp.custom_name.ilike(f"%{search}%"),
                     )
                 )
-
-            apps = query.order_by(InstalledApp.name).limit(limit).all()
-            pin_pairs = session.query(PinnedApp.id, PinnedApp.installed_app_id).all()
-            pin_map = {installed_id: pin_id for pin_id, installed_id in pin_pairs}
-
             if pinned_filter == "pinned":
-                apps = [app for app in apps if app.id in pin_map]
+                stmt = stmt.where(is_pinned)
             elif pinned_filter == "unpinned":
-                apps = [app for app in apps if app.id not in pin_map]
+                stmt = stmt.where(~is_pinned)
+            if tag:
+                stmt = stmt.where(tag_filter(InstalledApp, tag))
+            if after:
+                name, app_id = _decode_cursor(after)
+                stmt = stmt.where(tuple_(InstalledApp.name, InstalledApp.id) > tuple_(name, app_id))
 
+            stmt = stmt.order_by(InstalledApp.name, InstalledApp.id).limit(limit)
             return [
                 UiItem(
-                    item_id=app.id,
-                    title=app.custom_name or app.name,
-                    subtitle=app.publisher or app.version or "Unknown Publisher",
+                    item_id=app_id,
+                    title=custom_name or name,
+                    subtitle=publisher or version or "Unknown Publisher",
                     badge="LOCAL APP",
                     kind="local",
-                    install_location=app.install_location,
-                    uninstall_command=app.uninstall_command,
-                    icon_path=app.custom_icon_path or _clean_display_icon(app.display_icon),
-                    is_pinned=app.id in pin_map,
+                    install_location=install_location,
+                    uninstall_command=uninstall_command,
+                    icon_path=custom_icon_path or _clean_display_icon(display_icon),
+                    is_pinned=bool(pinned),
+                    cursor=_encode_cursor(name, app_id),
                 )
-                for app in apps
+                for (
+                    app_id,
+                    name,
+                    custom_name,
+                    publisher,
+                    version,
+                    install_location,
+                    uninstall_command,
+                    custom_icon_path,
+                    display_icon,
+                    pinned,
+                ) in session.execute(stmt)
             ]
         finally:
-            session.close()
+            self._sessions.remove()
 
-    def list_pinned(self, search: str = "", limit: int = 300) -> list[UiItem]:
-        session = self._session_factory()
+    def _query_pinned(
+        self, search: str, limit: int, after: str | None, tag: str | None
+    ) -> list[UiItem]:
+        session = self._sessions()
         try:
-            query = session.query(PinnedApp)
-            pins = query.order_by(PinnedApp.pinned_at.desc()).limit(limit).all()
+            display_name = func.coalesce(func.nullif(InstalledApp.custom_name, ""), InstalledApp.name)
+            stmt = (
+                select(
+                    PinnedApp.id,
+                    PinnedApp.launch_command,
+                    InstalledApp.id,
+                    display_name,
+                    InstalledApp.publisher,
+                    InstalledApp.install_location,
+                    InstalledApp.uninstall_command,
+                    InstalledApp.custom_icon_path,
+                    InstalledApp.display_icon,
+                    PinnedApp.pinned_at,
+                )
+                .join(InstalledApp, PinnedApp.installed_app_id == InstalledApp.id)
+                .order_by(PinnedApp.pinned_at.desc(), PinnedApp.id.desc())
+                .limit(limit)
+            )
             if search:
-                lowered = search.lower()
-                pins = [
-                    p
-                    for p in pins
-                    if lowered in (p.installed_app.custom_name or p.installed_app.name).lower()
-                ]
+                stmt = stmt.where(display_name.ilike(f"%{search}%"))
+            if tag:
+                stmt = stmt.where(tag_filter(PinnedApp, tag))
+            if after:
+                pinned_at, pin_id = _decode_cursor(after)
+                stmt = stmt.where(
+                    tuple_(PinnedApp.pinned_at, PinnedApp.id) < tuple_(pinned_at, pin_id)
+                )
 
             return [
                 UiItem(
-                    item_id=pin.id,
-                    title=pin.installed_app.custom_name or pin.installed_app.name,
-                    subtitle=pin.installed_app.publisher or "Pinned App",
+                    item_id=pin_id,
+                    title=title,
+                    subtitle=publisher or "Pinned App",
                     badge="PINNED",
                     kind="pinned",
-                    install_location=pin.installed_app.install_location,
-                    launch_command=pin.launch_command,
-                    uninstall_command=pin.installed_app.uninstall_command,
-                    icon_path=pin.installed_app.custom_icon_path
-                    or _clean_display_icon(pin.installed_app.display_icon),
-                    linked_app_id=pin.installed_app.id,
+                    install_location=install_location,
+                    launch_command=launch_command,
+                    uninstall_command=uninstall_command,
+                    icon_path=custom_icon_path or _clean_display_icon(display_icon),
+                    linked_app_id=app_id,
                     is_pinned=True,
+                    cursor=_encode_cursor(pinned_at, pin_id),
                 )
-                for pin in pins
+                for (
+                    pin_id,
+                    launch_command,
+                    app_id,
+                    title,
+                    publisher,
+                    install_location,
+                    uninstall_command,
+                    custom_icon_path,
+                    display_icon,
+                    pinned_at,
+                ) in session.execute(stmt)
             ]
         finally:
-            session.close()
+            self._sessions.remove()
 
-    def list_not_installed(self, search: str = "", limit: int = 300) -> list[UiItem]:
-        session = self._session_factory()
+    def _query_not_installed(
+        self, search: str, limit: int, after: str | None, tag: str | None
+    ) -> list[UiItem]:
+        session = self._sessions()
         try:
-            query = session.query(NotInstalledApp)
+            stmt = select(
+                NotInstalledApp.id,
+                NotInstalledApp.name,
+                NotInstalledApp.description,
+                NotInstalledApp.download_url,
+                NotInstalledApp.added_at,
+            )
             if search:
-                query = query.filter(NotInstalledApp.name.ilike(f"%{search}%"))
+                stmt = stmt.where(NotInstalledApp.name.ilike(f"%{search}%"))
+            if tag:
+                stmt = stmt.where(tag_filter(NotInstalledApp, tag))
 
-            installed_names: set[str] = set()
-            for name, custom_name in session.query(InstalledApp.name, InstalledApp.custom_name).all():
-                if name:
-                    installed_names.add(name.strip().lower())
-                if custom_name:
-                    installed_names.add(custom_name.strip().lower())
+            # Two correlated anti-joins so each side can use its own name-key index.
+            stmt = stmt.where(
+                ~exists().where(InstalledApp.name_key == NotInstalledApp.name_key),
+                ~exists().where(InstalledApp.custom_name_key == NotInstalledApp.name_key),
+            )
+            if after:
+                added_at, wish_id = _decode_cursor(after)
+                stmt = stmt.where(
+                    tuple_(NotInstalledApp.added_at, NotInstalledApp.id) < tuple_(added_at, wish_id)
+                )
 
-            apps = query.order_by(NotInstalledApp.added_at.desc()).all()
-            apps = [app for app in apps if app.name.strip().lower() not in installed_names][:limit]
+            stmt = stmt.order_by(NotInstalledApp.added_at.desc(), NotInstalledApp.id.desc()).limit(limit)
             return [
                 UiItem(
-                    item_id=app.id,
-                    title=app.name,
-                    subtitle=app.description or "收藏中未安装",
+                    item_id=wish_id,
+                    title=name,
+                    subtitle=description or "收藏中未安装",
                     badge="WISHLIST",
                     kind="wish",
-                    download_url=app.download_url,
+                    download_url=download_url,
+                    cursor=_encode_cursor(added_at, wish_id),
                 )
-                for app in apps
+                for wish_id, name, description, download_url, added_at in session.execute(stmt)
             ]
         finally:
-            session.close()
+            self._sessions.remove()
 
-    def list_resources(
-        self, resource_type: str, search: str = "", limit: int = 300
+    def _query_resources(
+        self, resource_type: str, search: str, limit: int, after: str | None, tag: str | None
     ) -> list[UiItem]:
-        session = self._session_factory()
+        session = self._sessions()
         try:
-            query = session.query(ResourceItem).filter_by(resource_type=resource_type)
+            stmt = select(
+                ResourceItem.id,
+                ResourceItem.name,
+                ResourceItem.path,
+                ResourceItem.added_at,
+            ).where(ResourceItem.resource_type == resource_type)
             if search:
-                query = query.filter(ResourceItem.name.ilike(f"%{search}%"))
+                stmt = stmt.where(ResourceItem.name.ilike(f"%{search}%"))
+            if tag:
+                stmt = stmt.where(tag_filter(ResourceItem, tag))
+            if after:
+                added_at, res_id = _decode_cursor(after)
+                stmt = stmt.where(
+                    tuple_(ResourceItem.added_at, ResourceItem.id) < tuple_(added_at, res_id)
+                )
 
-            items = query.order_by(ResourceItem.added_at.desc()).limit(limit).all()
+            stmt = stmt.order_by(ResourceItem.added_at.desc(), ResourceItem.id.desc()).limit(limit)
+            is_url = resource_type == "url"
             return [
                 UiItem(
-                    item_id=item.id,
-                    title=item.name,
-                    subtitle=_shorten(item.path),
-                    badge="WEBSITE" if item.resource_type == "url" else "RESOURCE",
+                    item_id=res_id,
+                    title=name,
+                    subtitle=_shorten(path),
+                    badge="WEBSITE" if is_url else "RESOURCE",
                     kind="resource",
-                    path=item.path,
-                    resource_type=item.resource_type,
-                    icon_path=item.path if item.resource_type != "url" else None,
+                    path=path,
+                    resource_type=resource_type,
+                    icon_path=None if is_url else path,
+                    cursor=_encode_cursor(added_at, res_id),
                 )
-                for item in items
+                for res_id, name, path, added_at in session.execute(stmt)
             ]
         finally:
-            session.close()
+            self._sessions.remove()
+
+    def _query_tag_facets(
+        self, kind: ItemKind, resource_type: str | None
+    ) -> list[tuple[str, int]]:
+        session = self._sessions()
+        try:
+            count = func.count().label("count")
+            stmt = (
+                select(Tag.name, count)
+                .join(ItemTag, ItemTag.tag_id == Tag.id)
+                .where(ItemTag.item_type == kind)
+                .group_by(Tag.name)
+                .order_by(count.desc(), Tag.name)
+            )
+            if resource_type:
+                stmt = stmt.join(ResourceItem, ResourceItem.id == ItemTag.item_id).where(
+                    ResourceItem.resource_type == resource_type
+                )
+            return [(name, total) for name, total in session.execute(stmt)]
+        finally:
+            self._sessions.remove()
+
+
+def _encode_cursor(sort_value: str | datetime, row_id: int) -> str:
+    """Encode a row's (sort key, id) position as an opaque keyset cursor."""
+    if isinstance(sort_value, datetime):
+        return f"t:{row_id}:{sort_value.isoformat()}"
+    return f"s:{row_id}:{sort_value}"
+
+
+def _decode_cursor(cursor: str) -> tuple[str | datetime, int]:
+    kind, row_id, sort_value = cursor.split(":", 2)
+    if kind == "t":
+        return datetime.fromisoformat(sort_value), int(row_id)
+    return sort_value, int(row_id)
 
 
 def _shorten(value: str, max_len: int = 48) -> str:
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from snapkit.db import bump_write_generation
+
+
+class SerializedWriter:
+    """Runs write jobs one at a time on a dedicated thread.
+
+    SQLite allows a single writer; funnelling every write through one queue
+    avoids ``database is locked`` errors between threads of this process and
+    lets callers wait on a ``Future`` instead of the database.
+
+    Each job is called as ``fn(session, *args, **kwargs)`` with a fresh session
+    that is committed after the job returns and rolled back if it raises.
+    Committed jobs bump the engine's write generation unless they were queued
+    with ``submit_untracked``.
+    """
+
+    def __init__(self, engine: Engine, name: str = "snapkit-writer"):
+        self._engine = engine
+        self._session_factory = sessionmaker(bind=engine)
+        self._queue: queue.Queue = queue.Queue()
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        return self._enqueue(fn, args, kwargs, track=True)
+
+    def submit_untracked(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        """Like ``submit`` for bookkeeping writes that leave list-view data alone."""
+        return self._enqueue(fn, args, kwargs, track=False)
+
+    def _enqueue(self, fn: Callable[..., Any], args: tuple, kwargs: dict, track: bool) -> Future:
+        future: Future = Future()
+        with self._close_lock:
+            if self._closed:
+                raise RuntimeError("writer is closed")
+            self._queue.put((future, fn, args, kwargs, track))
+        return future
+
+    def is_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def close(self, wait: bool = True):
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        if wait and not self.is_writer_thread():
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            future, fn, args, kwargs, track = job
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            session: Session = self._session_factory()
+            try:
+                result = fn(session, *args, **kwargs)
+                session.commit()
+            except BaseException as exc:
+                session.rollback()
+                future.set_exception(exc)
+            else:
+                if track:
+                    bump_write_generation(self._engine)
+                future.set_result(result)
+            finally:
+                session.close()
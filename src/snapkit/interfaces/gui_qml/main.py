@@ -23,6 +23,7 @@ def run_gui(engine):
     repository = SqlAlchemyToolboxRepository(engine)
     service = SnapKitService(repository, engine)
     view_model = AppListViewModel(service)
+    qapp.aboutToQuit.connect(service.close)
 
     qml_engine = QQmlApplicationEngine()
     qml_engine.rootContext().setContextProperty("appVm", view_model)
@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 
+from collections.abc import Callable
 from dataclasses import replace
 from typing import Any
 from urllib.parse import urlparse
@@ -28,6 +29,9 @@ class AppListModel(QAbstractListModel):
         self._icon_sources: list[str] = []
         self._icon_cache: dict[str, str] = {}
         self._icon_provider = QFileIconProvider()
+        self._fetch_page: Callable[[str], list[UiItem]] | None = None
+        self._page_size = 0
+        self._has_more = False
 
     def rowCount(self, parent=QModelIndex()) -> int:
         if parent.isValid():
@@ -69,10 +73,44 @@ class AppListModel(QAbstractListModel):
             self.InstallLocationRole: b"installLocation",
         }
 
-    def set_items(self, items: list[UiItem]):
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        if parent.isValid():
+            return False
+        return self._has_more and self._fetch_page is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent) or not self._items:
+            return
+
+        cursor = self._items[-1].cursor
+        if not cursor:
+            self._has_more = False
+            return
+
+        items = self._fetch_page(cursor)
+        self._has_more = len(items) >= self._page_size
+        if not items:
+            return
+
+        first = len(self._items)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self._items.extend(items)
+        self._icon_sources.extend(self._build_icon_source(item) for item in items)
+        self.endInsertRows()
+
+    def set_items(
+        self,
+        items: list[UiItem],
+        fetch_page: Callable[[str], list[UiItem]] | None = None,
+        page_size: int = 0,
+    ):
+        """Replace the rows; *fetch_page* loads the page after a given cursor."""
         self.beginResetModel()
         self._items = items
         self._icon_sources = [self._build_icon_source(item) for item in items]
+        self._fetch_page = fetch_page
+        self._page_size = page_size
+        self._has_more = fetch_page is not None and page_size > 0 and len(items) >= page_size
         self.endResetModel()
 
     def set_item_pinned(self, item_id: int, pinned: bool) -> bool:
@@ -98,6 +136,36 @@ class AppListModel(QAbstractListModel):
             return True
         return False
 
+    def set_items_pinned(self, item_ids: set[int], pinned: bool) -> int:
+        """Update the pin flag for many rows with a single dataChanged range."""
+        rows = [
+            row
+            for row, item in enumerate(self._items)
+            if item.item_id in item_ids and item.is_pinned != pinned
+        ]
+        for row in rows:
+            self._items[row] = replace(self._items[row], is_pinned=pinned)
+        if rows:
+            self.dataChanged.emit(self.index(rows[0], 0), self.index(rows[-1], 0), [self.IsPinnedRole])
+        return len(rows)
+
+    def remove_items(self, item_ids: set[int]) -> int:
+        """Remove many rows, one beginRemoveRows per contiguous run."""
+        rows = [row for row, item in enumerate(self._items) if item.item_id in item_ids]
+        runs: list[tuple[int, int]] = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1] = (runs[-1][0], row)
+            else:
+                runs.append((row, row))
+
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._items[first : last + 1]
+            del self._icon_sources[first : last + 1]
+            self.endRemoveRows()
+        return len(rows)
+
     def _build_icon_source(self, item: UiItem) -> str:
         website_icon = _build_website_icon(item)
         if website_icon:
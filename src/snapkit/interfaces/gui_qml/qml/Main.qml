@@ -37,6 +37,8 @@ ApplicationWindow {
     property string imageBrowserFolderUrl: ""
     property string imageCurrentUrl: ""
     property string imageBrowserTitle: "图片浏览"
+    property bool exportSnapshot: false
+    property string importBundleUrl: ""
 
     property var darkPalette: ({
         "windowBg": "#1f2126",
@@ -517,6 +519,38 @@ ApplicationWindow {
                             onClicked: appVm.scanAndRefresh(currentViewId, searchInput.text)
                         }
 
+                        Button {
+                            id: bundleButton
+                            text: "备份"
+                            Layout.preferredWidth: 88
+                            enabled: appVm ? !appVm.transferActive : false
+                            onClicked: bundleMenu.open()
+
+                            Menu {
+                                id: bundleMenu
+                                y: bundleButton.height
+
+                                MenuItem {
+                                    text: "导出数据包..."
+                                    onTriggered: {
+                                        exportSnapshot = false
+                                        exportPicker.open()
+                                    }
+                                }
+                                MenuItem {
+                                    text: "导出数据库快照..."
+                                    onTriggered: {
+                                        exportSnapshot = true
+                                        exportPicker.open()
+                                    }
+                                }
+                                MenuItem {
+                                    text: "导入数据包..."
+                                    onTriggered: importPicker.open()
+                                }
+                            }
+                        }
+
                         Rectangle {
                             Layout.preferredWidth: 154
                             height: 46
@@ -772,6 +806,52 @@ ApplicationWindow {
         }
     }
 
+    Rectangle {
+        id: transferPanel
+        anchors.right: parent.right
+        anchors.bottom: parent.bottom
+        anchors.rightMargin: 18
+        anchors.bottomMargin: 18
+        width: 340
+        height: 92
+        radius: 12
+        color: c("panel")
+        border.color: c("border")
+        border.width: 1
+        visible: appVm ? appVm.transferActive : false
+
+        ColumnLayout {
+            anchors.fill: parent
+            anchors.margins: 12
+            spacing: 8
+
+            RowLayout {
+                Layout.fillWidth: true
+
+                Label {
+                    Layout.fillWidth: true
+                    text: appVm ? appVm.transferText : ""
+                    color: c("textSecondary")
+                    font.pixelSize: 13
+                    elide: Text.ElideRight
+                }
+
+                Button {
+                    text: "取消"
+                    onClicked: appVm.cancelTransfer()
+                }
+            }
+
+            ProgressBar {
+                Layout.fillWidth: true
+                from: 0
+                to: 1
+                value: appVm ? appVm.transferValue : 0
+                indeterminate: appVm ? appVm.transferIndeterminate : false
+            }
+        }
+    }
+
     Timer {
         id: toastTimer
         interval: 2100
@@ -1184,6 +1264,33 @@ ApplicationWindow {
         }
     }
 
+    FileDialog {
+        id: exportPicker
+        title: exportSnapshot ? "导出数据库快照" : "导出数据包"
+        fileMode: FileDialog.SaveFile
+        defaultSuffix: "zip"
+        nameFilters: ["SnapKit bundles (*.zip)"]
+        onAccepted: appVm.exportBundle(selectedFile.toString(), exportSnapshot)
+    }
+
+    FileDialog {
+        id: importPicker
+        title: "导入数据包"
+        fileMode: FileDialog.OpenFile
+        nameFilters: ["SnapKit bundles (*.zip)"]
+        onAccepted: {
+            importBundleUrl = selectedFile.toString()
+            restoreFolderPicker.open()
+        }
+    }
+
+    FolderDialog {
+        id: restoreFolderPicker
+        title: "选择资源文件的恢复目录（取消则只导入记录）"
+        onAccepted: appVm.importBundle(importBundleUrl, selectedFolder.toString())
+        onRejected: appVm.importBundle(importBundleUrl, "")
+    }
+
     FolderDialog {
         id: quickFolderPicker
         title: "选择文件夹"
@@ -1,11 +1,20 @@
 ﻿from __future__ import annotations
 
+from pathlib import Path
 from urllib.parse import unquote, urlparse
 
 from PySide6.QtCore import QObject, Property, Signal, Slot
 
 from snapkit.app.service import SnapKitService
 from snapkit.interfaces.gui_qml.models.app_list_model import AppListModel
+from snapkit.progress import CancelToken, OperationCancelled
+
+_TRANSFER_PHASES = {
+    "hash": "计算文件校验",
+    "records": "处理记录",
+    "snapshot": "复制数据库",
+    "files": "处理文件",
+}
 
 
 class AppListViewModel(QObject):
@@ -14,6 +23,11 @@ class AppListViewModel(QObject):
     busyChanged = Signal()
     notification = Signal(str, str)
     listLoaded = Signal()
+    transferChanged = Signal()
+    # Emitted from worker threads; Qt queues them onto the GUI thread.
+    _scanFinished = Signal(bool, str, str, str)
+    _transferProgress = Signal(str, int, int)
+    _transferFinished = Signal(bool, str, bool)
 
     def __init__(self, service: SnapKitService):
         super().__init__()
@@ -25,6 +39,13 @@ class AppListViewModel(QObject):
         self._local_filter = "all"
         self._current_view_id = "local_scan"
         self._search_text = ""
+        self._transfer_cancel: CancelToken | None = None
+        self._transfer_text = ""
+        self._transfer_value = 0.0
+        self._transfer_indeterminate = False
+        self._scanFinished.connect(self._on_scan_finished)
+        self._transferProgress.connect(self._on_transfer_progress)
+        self._transferFinished.connect(self._on_transfer_finished)
 
     @Property(QObject, constant=True)
     def model(self) -> QObject:
@@ -42,6 +63,22 @@ class AppListViewModel(QObject):
     def busy(self) -> bool:
         return self._busy
 
+    @Property(bool, notify=transferChanged)
+    def transferActive(self) -> bool:
+        return self._transfer_cancel is not None
+
+    @Property(str, notify=transferChanged)
+    def transferText(self) -> str:
+        return self._transfer_text
+
+    @Property(float, notify=transferChanged)
+    def transferValue(self) -> float:
+        return self._transfer_value
+
+    @Property(bool, notify=transferChanged)
+    def transferIndeterminate(self) -> bool:
+        return self._transfer_indeterminate
+
     @Slot(str, str)
     def refresh(self, view_id: str, search_text: str = ""):
         self._set_busy(True)
@@ -54,9 +91,21 @@ class AppListViewModel(QObject):
 
     @Slot(str, str)
     def scanAndRefresh(self, view_id: str, search_text: str = ""):
+        if self._busy:
+            return
         self._set_busy(True)
+
+        def done(future):
+            try:
+                ok, message = future.result()
+            except Exception as exc:
+                ok, message = False, f"扫描失败: {exc}"
+            self._scanFinished.emit(ok, message, view_id, search_text)
+
+        self._service.submit_scan().add_done_callback(done)
+
+    def _on_scan_finished(self, ok: bool, message: str, view_id: str, search_text: str):
         try:
-            ok, message = self._service.scan_apps()
             self.notification.emit("success" if ok else "error", message)
             self._load_view(view_id, search_text)
         except Exception as exc:
@@ -64,6 +113,83 @@ class AppListViewModel(QObject):
         finally:
             self._set_busy(False)
 
+    @Slot(str, bool)
+    def exportBundle(self, file_url: str, snapshot: bool = False):
+        if self._transfer_cancel is not None:
+            return
+        cancel = self._start_transfer("正在导出")
+
+        def done(future):
+            try:
+                path = future.result()
+            except OperationCancelled:
+                self._transferFinished.emit(False, "导出已取消", False)
+            except Exception as exc:
+                self._transferFinished.emit(False, f"导出失败: {exc}", False)
+            else:
+                self._transferFinished.emit(True, f"已导出到 {path}", False)
+
+        self._service.submit_export(
+            Path(_to_local_path(file_url)), snapshot=snapshot, progress=self._report_transfer, cancel=cancel
+        ).add_done_callback(done)
+
+    @Slot(str, str)
+    def importBundle(self, file_url: str, restore_folder_url: str = ""):
+        if self._transfer_cancel is not None:
+            return
+        cancel = self._start_transfer("正在导入")
+        restore_to = Path(_to_local_path(restore_folder_url)) if restore_folder_url else None
+
+        def done(future):
+            try:
+                counts = future.result()
+            except OperationCancelled:
+                message = "导入已中断，再次导入到同一目录可继续" if restore_to else "导入已取消"
+                self._transferFinished.emit(False, message, restore_to is not None)
+            except Exception as exc:
+                self._transferFinished.emit(False, f"导入失败: {exc}", restore_to is not None)
+            else:
+                self._transferFinished.emit(True, f"导入完成，新增 {sum(counts.values())} 项", True)
+
+        self._service.submit_import(
+            Path(_to_local_path(file_url)), restore_to=restore_to, progress=self._report_transfer, cancel=cancel
+        ).add_done_callback(done)
+
+    @Slot()
+    def cancelTransfer(self):
+        if self._transfer_cancel is not None:
+            self._transfer_cancel.cancel()
+            self._transfer_text = "正在取消..."
+            self.transferChanged.emit()
+
+    def _start_transfer(self, text: str) -> CancelToken:
+        self._transfer_cancel = CancelToken()
+        self._transfer_text = text
+        self._transfer_value = 0.0
+        self._transfer_indeterminate = True
+        self.transferChanged.emit()
+        return self._transfer_cancel
+
+    def _report_transfer(self, event):
+        self._transferProgress.emit(event.phase, event.done, -1 if event.total is None else event.total)
+
+    def _on_transfer_progress(self, phase: str, done: int, total: int):
+        if self._transfer_cancel is None or self._transfer_cancel.cancelled:
+            return
+        label = _TRANSFER_PHASES.get(phase, phase)
+        self._transfer_indeterminate = total <= 0
+        self._transfer_value = 0.0 if total <= 0 else min(1.0, done / total)
+        self._transfer_text = f"{label} {done}" if total < 0 else f"{label} {done}/{total}"
+        self.transferChanged.emit()
+
+    def _on_transfer_finished(self, ok: bool, message: str, reload_view: bool):
+        self._transfer_cancel = None
+        self._transfer_text = ""
+        self.transferChanged.emit()
+        self.notification.emit("success" if ok else "error", message)
+        if reload_view:
+            self._reload_current_view()
+
     @Slot(int)
     def activate(self, item_id: int):
         ok, message = self._service.activate_item(item_id)
@@ -87,6 +213,29 @@ class AppListViewModel(QObject):
         if action_name == "unpin":
             self._sync_pin_change(item_id, False)
 
+    @Slot("QVariantList", str)
+    def batchAction(self, item_ids: list, action_name: str):
+        ids = [int(item_id) for item_id in item_ids]
+        if not ids:
+            return
+
+        results = self._service.perform_batch_action(ids, action_name)
+        succeeded = {result.item_id for result in results if result.ok}
+        failed = [result for result in results if not result.ok]
+        if failed and not succeeded:
+            self.notification.emit("error", failed[0].message)
+        elif failed:
+            self.notification.emit("error", f"已处理 {len(succeeded)} 项，失败 {len(failed)} 项: {failed[0].message}")
+        else:
+            self.notification.emit("success", f"已处理 {len(succeeded)} 项")
+        if not succeeded:
+            return
+
+        if action_name == "delete":
+            self._model.remove_items(succeeded)
+        elif action_name in {"pin", "unpin"}:
+            self._sync_batch_pin_change(succeeded, action_name == "pin")
+
     @Slot(int, str)
     def renameItem(self, item_id: int, new_name: str):
         ok, message = self._service.rename_item(item_id, new_name)
@@ -144,17 +293,27 @@ class AppListViewModel(QObject):
     def _load_view(self, view_id: str, search_text: str):
         self._current_view_id = view_id
         self._search_text = search_text
+        local_filter = self._local_filter
 
         title, subtitle, items = self._service.load_view(
             view_id=view_id,  # type: ignore[arg-type]
             search=search_text,
-            local_filter=self._local_filter,
+            local_filter=local_filter,
         )
         self._page_title = title
         self._page_subtitle = subtitle
         self.pageTitleChanged.emit()
         self.pageSubtitleChanged.emit()
-        self._model.set_items(items)
+        self._model.set_items(
+            items,
+            fetch_page=lambda after: self._service.load_more(
+                view_id=view_id,  # type: ignore[arg-type]
+                after=after,
+                search=search_text,
+                local_filter=local_filter,
+            ),
+            page_size=self._service.page_size,
+        )
         self.listLoaded.emit()
 
     def _sync_pin_change(self, item_id: int, pinned: bool):
@@ -174,6 +333,14 @@ class AppListViewModel(QObject):
 
         self._reload_current_view()
 
+    def _sync_batch_pin_change(self, item_ids: set[int], pinned: bool):
+        if self._current_view_id == "local_scan" and self._local_filter == "all":
+            self._model.set_items_pinned(item_ids, pinned)
+        elif self._current_view_id == "installed" and not pinned:
+            self._model.remove_items(item_ids)
+        else:
+            self._reload_current_view()
+
     def _reload_current_view(self):
         self._set_busy(True)
         try:
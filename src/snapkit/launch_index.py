@@ -0,0 +1,163 @@
+"""Fuzzy, frecency-ranked lookup of launchable apps for ``snapkit run <query>``.
+
+Works on plain DB-API (sqlite3) connections so the CLI fast path and the
+daemon can use it without the ORM.
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import UTC, datetime
+from typing import NamedTuple
+
+# Recency multipliers applied to the launch count, newest bucket first.
+_RECENCY_WEIGHTS = (
+    (3600, 4.0),
+    (86400, 2.0),
+    (7 * 86400, 0.5),
+)
+_OLD_WEIGHT = 0.25
+_PINNED_BONUS = 0.5
+
+_LOAD_SQL = (
+    "SELECT a.id, p.id, COALESCE(a.custom_name, a.name), a.name, p.launch_command, "
+    "a.install_location, s.launch_count, s.last_launched_at "
+    "FROM installed_apps AS a "
+    "LEFT JOIN pinned_apps AS p ON p.installed_app_id = a.id "
+    "LEFT JOIN launch_stats AS s ON s.installed_app_id = a.id"
+)
+
+
+class LaunchCandidate(NamedTuple):
+    installed_app_id: int
+    pin_id: int | None
+    title: str
+    name: str
+    launch_command: str | None
+    install_location: str | None
+    launch_count: int
+    last_launched_at: datetime | None
+
+
+def frecency(launch_count: int, last_launched_at: datetime | None, now: datetime) -> float:
+    """Launch count weighted by how recently the app was last launched."""
+    if not launch_count or last_launched_at is None:
+        return 0.0
+    age = (now - last_launched_at).total_seconds()
+    for max_age, weight in _RECENCY_WEIGHTS:
+        if age <= max_age:
+            return launch_count * weight
+    return launch_count * _OLD_WEIGHT
+
+
+def fuzzy_score(query: str, text: str) -> float | None:
+    """Score how well *query* matches *text* as a subsequence; ``None`` if it doesn't.
+
+    Characters at word starts and runs of consecutive characters score higher,
+    so "vsc" prefers "Visual Studio Code" and "fire" prefers "Firefox".
+    """
+    query = query.lower().strip()
+    text = text.lower()
+    needle = query.replace(" ", "")
+    if not needle:
+        # A blank query filters nothing; frecency alone decides the order.
+        return 0.0
+
+    score = 0.0
+    position = 0
+    previous = -2
+    for char in query:
+        if char == " ":
+            continue
+        found = text.find(char, position)
+        if found < 0:
+            return None
+        if found == 0 or not text[found - 1].isalnum():
+            score += 2.0
+        elif found == previous + 1:
+            score += 1.5
+        else:
+            score += 0.5
+        previous = found
+        position = found + 1
+
+    best = 2.0 * len(needle)
+    # Shorter names win ties: "Code" beats "Code Helper (Renderer)" for "code".
+    return score / best - 0.01 * (len(text) - len(query))
+
+
+class LaunchIndex:
+    """In-memory launch candidates; built once per process, kept warm by the daemon."""
+
+    def __init__(self, candidates: list[LaunchCandidate]):
+        self._candidates = {candidate.installed_app_id: candidate for candidate in candidates}
+
+    def __len__(self) -> int:
+        return len(self._candidates)
+
+    def search(self, query: str, limit: int = 10, now: datetime | None = None) -> list[LaunchCandidate]:
+        now = now or datetime.now(UTC).replace(tzinfo=None)
+        query = query.strip()
+        ranked = []
+        for candidate in self._candidates.values():
+            match = fuzzy_score(query, candidate.title)
+            if candidate.name != candidate.title:
+                original = fuzzy_score(query, candidate.name)
+                if original is not None and (match is None or original > match):
+                    match = original
+            if match is None:
+                continue
+            rank = match + math.log1p(
+                frecency(candidate.launch_count, candidate.last_launched_at, now)
+            )
+            if candidate.pin_id is not None:
+                rank += _PINNED_BONUS
+            ranked.append((rank, candidate.title.lower(), candidate))
+        ranked.sort(key=lambda entry: (-entry[0], entry[1]))
+        return [candidate for _, _, candidate in ranked[:limit]]
+
+    def note_launch(self, installed_app_id: int, when: datetime):
+        candidate = self._candidates.get(installed_app_id)
+        if candidate:
+            self._candidates[installed_app_id] = candidate._replace(
+                launch_count=candidate.launch_count + 1, last_launched_at=when
+            )
+
+
+def load_launch_index(conn) -> LaunchIndex:
+    """Build a ``LaunchIndex`` from every installed app, pinned or not."""
+    rows = conn.execute(_LOAD_SQL).fetchall()
+    return LaunchIndex(
+        [
+            LaunchCandidate(
+                installed_app_id=app_id,
+                pin_id=pin_id,
+                title=title,
+                name=name,
+                launch_command=launch_command,
+                install_location=install_location,
+                launch_count=launch_count or 0,
+                last_launched_at=_parse_datetime(last_launched_at),
+            )
+            for app_id, pin_id, title, name, launch_command, install_location, launch_count, last_launched_at in rows
+        ]
+    )
+
+
+def record_launch(conn, installed_app_id: int, when: datetime | None = None) -> datetime:
+    """Count a launch of *installed_app_id* and commit; returns the launch time."""
+    when = when or datetime.now(UTC).replace(tzinfo=None)
+    conn.execute(
+        "INSERT INTO launch_stats (installed_app_id, launch_count, last_launched_at) "
+        "VALUES (?, 1, ?) ON CONFLICT (installed_app_id) DO UPDATE SET "
+        "launch_count = launch_count + 1, last_launched_at = excluded.last_launched_at",
+        (installed_app_id, when.strftime("%Y-%m-%d %H:%M:%S.%f")),
+    )
+    conn.commit()
+    return when
+
+
+def _parse_datetime(value) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
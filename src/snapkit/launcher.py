@@ -40,15 +40,46 @@ def infer_exe(install_location: str, app_name: str = "") -> str | None:
     return str(candidates[0])
 
 
-def launch_app(command: str) -> subprocess.Popen | None:
-    """Launch an application via *command*."""
-    if platform.system() == "Windows" and not _has_args(command):
-        os.startfile(command)  # type: ignore[attr-defined]
+class ExeResolver:
+    """Memoizes ``infer_exe`` for long-lived processes such as the daemon.
+
+    Cached hits are re-checked on disk, so an exe that has since been removed
+    is looked up again instead of being returned.
+    """
+
+    def __init__(self):
+        self._cache: dict[tuple[str, str], str] = {}
+
+    def __call__(self, install_location: str, app_name: str = "") -> str | None:
+        key = (install_location, app_name)
+        exe = self._cache.get(key)
+        if exe and os.path.isfile(exe):
+            return exe
+
+        exe = infer_exe(install_location, app_name)
+        if exe:
+            self._cache[key] = exe
+        else:
+            self._cache.pop(key, None)
+        return exe
+
+    def clear(self):
+        self._cache.clear()
+
+
+def launch_app(
+    command: str, cwd: str | None = None, env: dict[str, str] | None = None
+) -> subprocess.Popen | None:
+    """Launch an application via *command*, in *cwd* with *env* when given."""
+    if platform.system() == "Windows" and not _has_args(command) and env is None:
+        os.startfile(command, cwd=cwd)  # type: ignore[attr-defined]
         return None
 
     return subprocess.Popen(
         command,
         shell=True,
+        cwd=cwd,
+        env=env,
         stdout=subprocess.DEVNULL,
         stderr=subprocess.DEVNULL,
     )
@@ -1,9 +1,38 @@
 """SQLAlchemy ORM models."""
 
 from datetime import UTC, datetime
+from typing import ClassVar
 
-from sqlalchemy import ForeignKey, String, Text
-from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy import DDL, ForeignKey, Index, String, Text, delete, event, exists, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    Mapped,
+    Session,
+    attributes,
+    mapped_column,
+    relationship,
+    validates,
+)
+
+
+def normalize_name_key(value: str | None) -> str | None:
+    """Normalized lookup key used to match app names across tables."""
+    if not value:
+        return None
+    return value.strip().lower() or None
+
+
+def split_tags(value: str | None) -> list[str]:
+    """Split a free-text comma list into normalized, de-duplicated tag names."""
+    if not value:
+        return []
+    names: list[str] = []
+    for part in value.replace("，", ",").split(","):
+        name = part.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
 
 
 class Base(DeclarativeBase):
@@ -12,11 +41,14 @@ class Base(DeclarativeBase):
 
 class InstalledApp(Base):
     __tablename__ = "installed_apps"
+    tag_kind: ClassVar[str] = "local"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255))
+    name_key: Mapped[str | None] = mapped_column(String(255), default=None, index=True)
     publisher: Mapped[str | None] = mapped_column(String(255), default=None)
     custom_name: Mapped[str | None] = mapped_column(String(255), default=None)
+    custom_name_key: Mapped[str | None] = mapped_column(String(255), default=None, index=True)
     custom_icon_path: Mapped[str | None] = mapped_column(Text, default=None)
     install_location: Mapped[str | None] = mapped_column(Text, default=None)
     display_icon: Mapped[str | None] = mapped_column(Text, default=None)
@@ -28,12 +60,18 @@ class InstalledApp(Base):
 
     pinned: Mapped["PinnedApp | None"] = relationship(back_populates="installed_app")
 
+    @validates("name", "custom_name")
+    def _sync_name_keys(self, key: str, value: str | None) -> str | None:
+        setattr(self, f"{key}_key", normalize_name_key(value))
+        return value
+
     def __repr__(self) -> str:
         return f"<InstalledApp(id={self.id}, name={self.name!r})>"
 
 
 class PinnedApp(Base):
     __tablename__ = "pinned_apps"
+    tag_kind: ClassVar[str] = "pinned"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     installed_app_id: Mapped[int] = mapped_column(ForeignKey("installed_apps.id"))
@@ -49,20 +87,28 @@ class PinnedApp(Base):
 
 class NotInstalledApp(Base):
     __tablename__ = "not_installed_apps"
+    tag_kind: ClassVar[str] = "wish"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255))
+    name_key: Mapped[str | None] = mapped_column(String(255), default=None, index=True)
     description: Mapped[str | None] = mapped_column(Text, default=None)
     download_url: Mapped[str | None] = mapped_column(Text, default=None)
     tags: Mapped[str | None] = mapped_column(Text, default=None)
     added_at: Mapped[datetime] = mapped_column(default=lambda: datetime.now(UTC))
 
+    @validates("name")
+    def _sync_name_key(self, key: str, value: str) -> str:
+        self.name_key = normalize_name_key(value)
+        return value
+
     def __repr__(self) -> str:
         return f"<NotInstalledApp(id={self.id}, name={self.name!r})>"
 
 
 class ResourceItem(Base):
     __tablename__ = "resource_items"
+    tag_kind: ClassVar[str] = "resource"
 
     id: Mapped[int] = mapped_column(primary_key=True)
     name: Mapped[str] = mapped_column(String(255))
@@ -73,3 +119,176 @@ class ResourceItem(Base):
 
     def __repr__(self) -> str:
         return f"<ResourceItem(id={self.id}, name={self.name!r})>"
+
+
+class Tag(Base):
+    __tablename__ = "tags"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column(String(100), unique=True)
+
+    def __repr__(self) -> str:
+        return f"<Tag(id={self.id}, name={self.name!r})>"
+
+
+class ItemTag(Base):
+    """Association between a tag and a row of one of the tagged tables."""
+
+    __tablename__ = "item_tags"
+    __table_args__ = (Index("ix_item_tags_tag_kind_item", "tag_id", "item_type", "item_id"),)
+
+    item_type: Mapped[str] = mapped_column(String(20), primary_key=True)
+    item_id: Mapped[int] = mapped_column(primary_key=True)
+    tag_id: Mapped[int] = mapped_column(ForeignKey("tags.id"), primary_key=True)
+
+
+class LaunchStat(Base):
+    """How often and how recently an installed app was launched; feeds ``run <query>`` ranking.
+
+    Kept out of ``installed_apps`` so recording a launch is not a change-log event.
+    """
+
+    __tablename__ = "launch_stats"
+
+    installed_app_id: Mapped[int] = mapped_column(ForeignKey("installed_apps.id"), primary_key=True)
+    launch_count: Mapped[int] = mapped_column(default=0)
+    last_launched_at: Mapped[datetime | None] = mapped_column(default=None)
+
+
+class FileDigest(Base):
+    """SHA-256 of a local file, reused by exports while its size and mtime are unchanged."""
+
+    __tablename__ = "file_digests"
+
+    path: Mapped[str] = mapped_column(Text, primary_key=True)
+    size: Mapped[int]
+    mtime_ns: Mapped[int]
+    sha256: Mapped[str] = mapped_column(String(64))
+
+
+class ChangeLogEntry(Base):
+    """One insert/update/delete of a row in a tracked table, written by triggers."""
+
+    __tablename__ = "change_log"
+    __table_args__ = ({"sqlite_autoincrement": True},)
+
+    seq: Mapped[int] = mapped_column(primary_key=True)
+    table_name: Mapped[str] = mapped_column(String(40))
+    row_id: Mapped[int]
+    op: Mapped[str] = mapped_column(String(1))
+
+
+class ChangeConsumer(Base):
+    """A named reader of ``change_log`` and the last sequence it has processed."""
+
+    __tablename__ = "change_consumers"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    acked_seq: Mapped[int] = mapped_column(default=0)
+
+
+TAGGED_MODELS = (InstalledApp, PinnedApp, NotInstalledApp, ResourceItem)
+TRACKED_MODELS = TAGGED_MODELS
+
+
+def tag_filter(model, tag: str):
+    """EXISTS clause matching rows of *model* carrying exactly *tag*."""
+    return exists().where(
+        ItemTag.item_type == model.tag_kind,
+        ItemTag.item_id == model.id,
+        ItemTag.tag_id == Tag.id,
+        Tag.name == tag.strip().lower(),
+    )
+
+
+def sync_item_tags(conn, entries: list[tuple[str, int, str | None]]) -> None:
+    """Rebuild item_tags rows for ``(item_type, item_id, tags_text)`` entries."""
+    ids_by_type: dict[str, list[int]] = {}
+    for item_type, item_id, _ in entries:
+        ids_by_type.setdefault(item_type, []).append(item_id)
+    for item_type, item_ids in ids_by_type.items():
+        # One statement per type and block of ids; batch imports flush thousands of rows.
+        for start in range(0, len(item_ids), 500):
+            conn.execute(
+                delete(ItemTag).where(
+                    ItemTag.item_type == item_type,
+                    ItemTag.item_id.in_(item_ids[start : start + 500]),
+                )
+            )
+
+    wanted = {(item_type, item_id): split_tags(text) for item_type, item_id, text in entries}
+    names = {name for tag_names in wanted.values() for name in tag_names}
+    if not names:
+        return
+
+    conn.execute(
+        sqlite_insert(Tag).on_conflict_do_nothing(index_elements=["name"]),
+        [{"name": name} for name in sorted(names)],
+    )
+    tag_ids = dict(conn.execute(select(Tag.name, Tag.id).where(Tag.name.in_(names))).all())
+    conn.execute(
+        sqlite_insert(ItemTag).on_conflict_do_nothing(),
+        [
+            {"item_type": item_type, "item_id": item_id, "tag_id": tag_ids[name]}
+            for (item_type, item_id), tag_names in wanted.items()
+            for name in tag_names
+        ],
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_tags_after_flush(session: Session, flush_context) -> None:
+    entries = [
+        (obj.tag_kind, obj.id, obj.tags)
+        for obj in session.new
+        if isinstance(obj, TAGGED_MODELS)
+    ]
+    entries.extend(
+        (obj.tag_kind, obj.id, obj.tags)
+        for obj in session.dirty
+        if isinstance(obj, TAGGED_MODELS) and attributes.get_history(obj, "tags").has_changes()
+    )
+    if entries:
+        sync_item_tags(session.connection(), entries)
+
+
+# Deletes are cleaned up in SQL so bulk ``query.delete()`` calls are covered too.
+TAG_CLEANUP_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_{model.__tablename__}_untag "
+    f"AFTER DELETE ON {model.__tablename__} BEGIN "
+    f"DELETE FROM item_tags WHERE item_type = '{model.tag_kind}' AND item_id = OLD.id; "
+    f"END"
+    for model in TAGGED_MODELS
+]
+
+_CHANGE_OPS = {"INSERT": ("I", "NEW"), "UPDATE": ("U", "NEW"), "DELETE": ("D", "OLD")}
+
+CHANGE_LOG_TRIGGER_NAMES = [
+    f"trg_{model.__tablename__}_log_{event_name.lower()}"
+    for model in TRACKED_MODELS
+    for event_name in _CHANGE_OPS
+]
+
+# Nothing is logged while no consumer is registered; nobody would ever ack it.
+CHANGE_LOG_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS trg_{model.__tablename__}_log_{event_name.lower()} "
+    f"AFTER {event_name} ON {model.__tablename__} "
+    f"WHEN EXISTS (SELECT 1 FROM change_consumers) BEGIN "
+    f"INSERT INTO change_log (table_name, row_id, op) "
+    f"VALUES ('{model.__tablename__}', {row}.id, '{op}'); "
+    f"END"
+    for model in TRACKED_MODELS
+    for event_name, (op, row) in _CHANGE_OPS.items()
+]
+
+LAUNCH_STATS_CLEANUP_TRIGGER = (
+    "CREATE TRIGGER IF NOT EXISTS trg_installed_apps_launch_stats "
+    "AFTER DELETE ON installed_apps BEGIN "
+    "DELETE FROM launch_stats WHERE installed_app_id = OLD.id; "
+    "END"
+)
+
+SCHEMA_TRIGGERS = TAG_CLEANUP_TRIGGERS + CHANGE_LOG_TRIGGERS + [LAUNCH_STATS_CLEANUP_TRIGGER]
+
+for _trigger in SCHEMA_TRIGGERS:
+    event.listen(Base.metadata, "after_create", DDL(_trigger).execute_if(dialect="sqlite"))
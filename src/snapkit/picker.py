@@ -0,0 +1,136 @@
+"""Minimal interactive terminal picker for ``snapkit run --pick``.
+
+Candidates are re-ranked and redrawn on every keystroke. Keys: type to
+filter, Backspace, Up/Down (or Ctrl+P/Ctrl+N) to move, Enter to choose,
+Esc or Ctrl+C to cancel.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Callable, Iterator
+from typing import TextIO
+
+UP, DOWN, ENTER, BACKSPACE, CANCEL = "<up>", "<down>", "<enter>", "<backspace>", "<cancel>"
+
+
+def pick(
+    search: Callable[[str], list],
+    label: Callable[[object], str] = str,
+    query: str = "",
+    limit: int = 8,
+    keys: Iterator[str] | None = None,
+    out: TextIO | None = None,
+):
+    """Let the user choose one of ``search(query)``'s results; ``None`` if cancelled."""
+    out = out or sys.stderr
+    keys = keys if keys is not None else _terminal_keys()
+    selected = 0
+    drawn = 0
+    try:
+        while True:
+            results = search(query)[:limit]
+            selected = min(selected, max(len(results) - 1, 0))
+            drawn = _draw(out, query, results, selected, label, drawn)
+
+            key = next(keys, CANCEL)
+            if key == CANCEL:
+                return None
+            if key == ENTER:
+                return results[selected] if results else None
+            if key == UP:
+                selected = max(selected - 1, 0)
+            elif key == DOWN:
+                selected = min(selected + 1, max(len(results) - 1, 0))
+            elif key == BACKSPACE:
+                query = query[:-1]
+                selected = 0
+            elif key.isprintable():
+                query += key
+                selected = 0
+    finally:
+        _clear(out, drawn)
+        if hasattr(keys, "close"):
+            keys.close()
+
+
+def _draw(out: TextIO, query: str, results: list, selected: int, label, drawn: int) -> int:
+    _clear(out, drawn)
+    lines = [f"> {query}"]
+    lines.extend(
+        f"{'»' if index == selected else ' '} {label(result)}" for index, result in enumerate(results)
+    )
+    if not results:
+        lines.append("  (no matches)")
+    out.write("\n".join(lines) + "\n")
+    out.flush()
+    return len(lines)
+
+
+def _clear(out: TextIO, lines: int):
+    if lines:
+        # Cursor to the start of the first drawn line, then erase to the end of the screen.
+        out.write(f"\x1b[{lines}F\x1b[J")
+        out.flush()
+
+
+def _terminal_keys() -> Iterator[str]:
+    if os.name == "nt":
+        return _windows_keys()
+    return _posix_keys()
+
+
+def _windows_keys() -> Iterator[str]:
+    import msvcrt
+
+    special = {"H": UP, "P": DOWN}
+    while True:
+        char = msvcrt.getwch()
+        if char in ("\x00", "\xe0"):
+            key = special.get(msvcrt.getwch())
+            if key:
+                yield key
+        else:
+            yield _translate(char)
+
+
+def _posix_keys() -> Iterator[str]:
+    import select
+    import termios
+    import tty
+
+    fd = sys.stdin.fileno()
+    saved = termios.tcgetattr(fd)
+    tty.setcbreak(fd)
+    try:
+        while True:
+            char = os.read(fd, 1).decode(errors="ignore")
+            if char == "\x1b":
+                # A lone Esc cancels; arrow keys arrive as Esc [ A / Esc [ B.
+                if not select.select([fd], [], [], 0.05)[0]:
+                    yield CANCEL
+                    continue
+                sequence = os.read(fd, 2).decode(errors="ignore")
+                if sequence == "[A":
+                    yield UP
+                elif sequence == "[B":
+                    yield DOWN
+            else:
+                yield _translate(char)
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+
+def _translate(char: str) -> str:
+    if char in ("\r", "\n"):
+        return ENTER
+    if char in ("\x7f", "\x08"):
+        return BACKSPACE
+    if char in ("\x03", "\x1b"):
+        return CANCEL
+    if char == "\x10":
+        return UP
+    if char == "\x0e":
+        return DOWN
+    return char
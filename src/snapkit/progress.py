@@ -0,0 +1,87 @@
+"""Progress reporting and cancellation for long-running operations.
+
+Bundle export and import report ``Progress`` events to an optional callback
+and stop at their next checkpoint once a ``CancelToken`` is cancelled, by
+raising ``OperationCancelled``. Callbacks run on the thread doing the work.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from typing import NamedTuple, TypeVar
+
+T = TypeVar("T")
+
+
+class OperationCancelled(Exception):
+    """Raised at a checkpoint after the operation's ``CancelToken`` was cancelled."""
+
+
+class CancelToken:
+    """A flag any thread can set to stop an operation at its next checkpoint."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class Progress(NamedTuple):
+    """One progress event: *done* of *total* units of *phase*; *total* is None when unknown."""
+
+    phase: str
+    done: int
+    total: int | None = None
+
+
+ProgressCallback = Callable[[Progress], None]
+
+
+class ProgressReporter:
+    """Tracks the current phase, forwards events to a callback and checks for cancellation.
+
+    Every ``start``/``advance`` is a checkpoint. Without a callback or token
+    it only counts, so library code can report unconditionally.
+    """
+
+    def __init__(self, callback: ProgressCallback | None = None, cancel: CancelToken | None = None):
+        self._callback = callback
+        self._cancel = cancel
+        self._phase = ""
+        self._done = 0
+        self._total: int | None = None
+
+    def start(self, phase: str, total: int | None = None) -> None:
+        self._phase, self._done, self._total = phase, 0, total
+        self._emit()
+
+    def advance(self, count: int = 1) -> None:
+        self._done += count
+        self._emit()
+
+    def check(self) -> None:
+        if self._cancel is not None and self._cancel.cancelled:
+            raise OperationCancelled(f"cancelled during {self._phase or 'start-up'}")
+
+    def track(self, items: Iterable[T], every: int = 1000) -> Iterator[T]:
+        """Yield *items*, advancing the current phase once per *every* items and at the end."""
+        pending = 0
+        for item in items:
+            yield item
+            pending += 1
+            if pending == every:
+                self.advance(pending)
+                pending = 0
+        if pending:
+            self.advance(pending)
+
+    def _emit(self) -> None:
+        if self._callback is not None:
+            self._callback(Progress(self._phase, self._done, self._total))
+        self.check()
@@ -12,7 +12,8 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
-from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp
+from snapkit.db import bump_write_generation
+from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, normalize_name_key
 
 REGISTRY_PATHS = [
     r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall",
@@ -635,10 +636,12 @@ def _save_scanned_apps(session: Session, apps: list[dict], prune_missing: bool)
                 for app in stale_apps
                 if (app.custom_name or app.name)
             }
+            stale_keys = {normalize_name_key(name) for name in stale_name_set.values()}
             existing_wishes = {
-                name.lower()
-                for (name,) in session.query(NotInstalledApp.name).all()
-                if name and name.strip()
+                key
+                for (key,) in session.query(NotInstalledApp.name_key)
+                .filter(NotInstalledApp.name_key.in_(stale_keys))
+                .all()
             }
 
             pinned_stale = (
@@ -650,7 +653,7 @@ def _save_scanned_apps(session: Session, apps: list[dict], prune_missing: bool)
                 app_name = stale_name_set.get(pin.installed_app_id, "").strip()
                 if not app_name:
                     continue
-                key = app_name.lower()
+                key = normalize_name_key(app_name)
                 if key in existing_wishes:
                     continue
                 session.add(
@@ -668,4 +671,5 @@ def _save_scanned_apps(session: Session, apps: list[dict], prune_missing: bool)
                 session.delete(app)
 
     session.commit()
+    bump_write_generation(session.get_bind())
     return added
@@ -0,0 +1,181 @@
+"""Whole-database snapshots for ``snapkit export --snapshot``.
+
+A snapshot is a page-for-page copy of the SQLite file taken with the online
+backup API, a few pages at a time so other connections keep working while it
+runs. Importing attaches the snapshot and merges its rows with set-based
+``INSERT ... SELECT`` statements, deduplicating on the same keys as a manifest
+import.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from snapkit.db import get_engine, init_db
+from snapkit.fastpath import SCHEMA_VERSION
+from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem, sync_item_tags
+from snapkit.progress import ProgressReporter
+
+SNAPSHOT = "snapshot.db"
+BACKUP_STEP_PAGES = 256
+_ALIAS = "snapshot"
+
+
+def backup_database(
+    engine,
+    dest: Path,
+    pages: int = BACKUP_STEP_PAGES,
+    sleep: float = 0.001,
+    reporter: ProgressReporter | None = None,
+) -> None:
+    """Copy the database behind *engine* to *dest* with SQLite's online backup API.
+
+    The copy advances *pages* pages per step and yields for *sleep* seconds
+    between steps, so writers are only held up for one step at a time.
+    *reporter* sees a ``snapshot`` phase counting pages; cancelling it
+    aborts the copy between steps.
+    """
+    reporter = reporter or ProgressReporter()
+    copied = None
+
+    def step(status, remaining, total):
+        nonlocal copied
+        if copied is None:
+            reporter.start("snapshot", total)
+            copied = 0
+        reporter.advance(total - remaining - copied)
+        copied = total - remaining
+
+    source = engine.raw_connection()
+    if source.driver_connection.in_transaction:
+        # The backup would retry on SQLITE_LOCKED forever against its own open write.
+        source.close()
+        raise RuntimeError("backup_database needs a connection without uncommitted writes")
+    target = sqlite3.connect(dest)
+    try:
+        source.driver_connection.backup(target, pages=pages, progress=step, sleep=sleep)
+        # A WAL source produces a WAL-mode copy; a single self-contained file travels better.
+        target.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        target.close()
+        source.close()
+
+
+def prepare_snapshot(path: Path) -> None:
+    """Bring an extracted snapshot up to this SnapKit's schema, or reject a newer one."""
+    with sqlite3.connect(path) as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+    conn.close()
+    if version > SCHEMA_VERSION:
+        raise ValueError(f"snapshot schema version {version} is newer than this SnapKit supports")
+    if version < SCHEMA_VERSION:
+        engine = get_engine(path)
+        try:
+            init_db(engine)
+        finally:
+            engine.dispose()
+
+
+def merge_snapshot(session: Session, path: Path) -> dict[str, int]:
+    """Insert rows from the snapshot at *path* that this database does not have yet.
+
+    Dedupe keys match a manifest import: installed apps by registry key, pins
+    by their app, wishes by name and resources by (name, path). Commits on
+    success and returns the number of new rows per table.
+    """
+    conn = session.connection()
+    dbapi = conn.connection.driver_connection
+    if dbapi.in_transaction:
+        raise RuntimeError("merge_snapshot needs a session without uncommitted writes")
+    conn.exec_driver_sql(f"ATTACH DATABASE ? AS {_ALIAS}", (str(path),))
+    try:
+        before = {
+            model: conn.execute(text(f"SELECT COALESCE(MAX(id), 0) FROM main.{model.__tablename__}")).scalar()
+            for model in _MERGES
+        }
+        counts = {}
+        for model, statement in _MERGES.items():
+            counts[model.__tablename__] = conn.execute(text(statement)).rowcount
+            rows = conn.execute(
+                text(
+                    f"SELECT id, tags FROM main.{model.__tablename__} "
+                    "WHERE id > :before AND tags IS NOT NULL AND tags != ''"
+                ),
+                {"before": before[model]},
+            ).all()
+            if rows:
+                sync_item_tags(conn, [(model.tag_kind, item_id, tags) for item_id, tags in rows])
+        session.commit()
+    finally:
+        # DETACH is refused inside a transaction; after commit or rollback it is not.
+        if dbapi.in_transaction:
+            session.rollback()
+        dbapi.execute(f"DETACH DATABASE {_ALIAS}")
+    return counts
+
+
+def _columns(model, *exclude: str) -> list[str]:
+    return [column.name for column in model.__table__.columns if column.name not in ("id", *exclude)]
+
+
+def _plain_merge(model, keys: tuple[str, ...], new_key: str | None = None) -> str:
+    """INSERT ... SELECT of snapshot rows whose *keys* are new, first row per key only.
+
+    *new_key* replaces the default "key not in main" predicate on snapshot row ``s``.
+    """
+    table = model.__tablename__
+    columns = ", ".join(_columns(model))
+    selected = ", ".join(f"s.{column}" for column in _columns(model))
+    key_list = ", ".join(keys)
+    if new_key is None:
+        new_key = _key_not_in_main(table, keys)
+    return (
+        f"INSERT INTO main.{table} ({columns}) SELECT {selected} FROM {_ALIAS}.{table} AS s "
+        f"WHERE s.id IN (SELECT MIN(id) FROM {_ALIAS}.{table} GROUP BY {key_list}) AND {new_key}"
+    )
+
+
+def _key_not_in_main(table: str, keys: tuple[str, ...]) -> str:
+    if len(keys) == 1:
+        return f"s.{keys[0]} NOT IN (SELECT {keys[0]} FROM main.{table} WHERE {keys[0]} IS NOT NULL)"
+    row_value = ", ".join(f"s.{key}" for key in keys)
+    return f"({row_value}) NOT IN (SELECT {', '.join(keys)} FROM main.{table})"
+
+
+def _installed_merge() -> str:
+    keys = ("registry_key",)
+    # Like a manifest import, a missing registry key is itself a key: at most one such app.
+    new_key = (
+        "(s.registry_key IS NULL AND NOT EXISTS "
+        "(SELECT 1 FROM main.installed_apps WHERE registry_key IS NULL) "
+        f"OR {_key_not_in_main('installed_apps', keys)})"
+    )
+    return _plain_merge(InstalledApp, keys, new_key)
+
+
+def _pinned_merge() -> str:
+    columns = _columns(PinnedApp, "installed_app_id")
+    return (
+        f"INSERT INTO main.pinned_apps (installed_app_id, {', '.join(columns)}) "
+        f"SELECT m.id, {', '.join(f'p.{column}' for column in columns)} "
+        f"FROM {_ALIAS}.pinned_apps AS p "
+        f"JOIN {_ALIAS}.installed_apps AS a ON a.id = p.installed_app_id "
+        "JOIN (SELECT registry_key, MIN(id) AS id FROM main.installed_apps "
+        "WHERE registry_key IS NOT NULL GROUP BY registry_key) AS m ON m.registry_key = a.registry_key "
+        "WHERE m.id NOT IN (SELECT installed_app_id FROM main.pinned_apps) "
+        f"AND p.id IN (SELECT MIN(p2.id) FROM {_ALIAS}.pinned_apps AS p2 "
+        f"JOIN {_ALIAS}.installed_apps AS a2 ON a2.id = p2.installed_app_id GROUP BY a2.registry_key)"
+    )
+
+
+# Applied in order: pins resolve against the apps merged just before them.
+_MERGES = {
+    InstalledApp: _installed_merge(),
+    PinnedApp: _pinned_merge(),
+    NotInstalledApp: _plain_merge(NotInstalledApp, ("name",)),
+    ResourceItem: _plain_merge(ResourceItem, ("name", "path")),
+}
@@ -1,15 +1,21 @@
 """Shared test fixtures."""
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from snapkit.models import Base
 
 
 @pytest.fixture()
 def engine():
-    eng = create_engine("sqlite:///:memory:")
+    # Shared connection so the service's writer thread sees the same database.
+    eng = create_engine(
+        "sqlite:///:memory:",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
     Base.metadata.create_all(eng)
     return eng
 
@@ -19,3 +25,16 @@ def session(engine):
     sess = sessionmaker(bind=engine)()
     yield sess
     sess.close()
+
+
+@pytest.fixture()
+def sql_statements(engine):
+    """Record every SQL statement sent to *engine* while the test runs."""
+    statements: list[str] = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", _record)
@@ -0,0 +1,124 @@
+"""Tests for ``snapkit batch``."""
+
+import json
+
+import pytest
+from sqlalchemy import text
+from typer.testing import CliRunner
+
+from snapkit import cli
+from snapkit.batch import BatchError, parse_line, run_batch
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.models import InstalledApp, ItemTag, NotInstalledApp, PinnedApp, ResourceItem
+
+
+def test_parse_line_accepts_commands_and_json():
+    assert parse_line("  # comment") is None
+    assert parse_line("") is None
+    assert parse_line(r'add-resource "Q3 report" C:\Docs\q3.pdf --tags work,finance') == {
+        "op": "add-resource",
+        "name": "Q3 report",
+        "path": r"C:\Docs\q3.pdf",
+        "type": "file",
+        "tags": "work,finance",
+    }
+    assert parse_line("snapkit add-notinstalled Krita --url=https://krita.org") == {
+        "op": "add-notinstalled",
+        "name": "Krita",
+        "url": "https://krita.org",
+    }
+    assert parse_line('{"op": "set-launch", "pin_id": "3", "command": "app.exe"}') == {
+        "op": "set-launch",
+        "pin_id": 3,
+        "command": "app.exe",
+    }
+
+
+@pytest.mark.parametrize(
+    "line",
+    [
+        "rename 1 foo",
+        "add-resource OnlyName",
+        "add-resource a b --type disk",
+        "add-resource a b --colour red",
+        "pin abc",
+        '{"op": "pin", "app_id": 1, "extra": true}',
+        "{not json",
+    ],
+)
+def test_parse_line_rejects_bad_records(line):
+    with pytest.raises(BatchError):
+        parse_line(line)
+
+
+def test_run_batch_reports_every_line_and_commits_in_chunks(session):
+    app = InstalledApp(name="Firefox")
+    session.add(app)
+    session.commit()
+    lines = [
+        "add-resource Docs C:\\Docs --type folder --tags work",
+        "bogus",
+        f"pin {app.id}",
+        f"pin {app.id}",
+        "unpin 999",
+        "add-notinstalled Krita --tags art",
+    ]
+
+    results = list(run_batch(session, lines, chunk_size=2))
+
+    assert [(r.line, r.ok) for r in results] == [
+        (1, True),
+        (2, False),
+        (3, True),
+        (4, False),
+        (5, False),
+        (6, True),
+    ]
+    assert "already pinned" in results[3].error
+    assert session.get(ResourceItem, results[0].id).resource_type == "folder"
+    assert session.get(PinnedApp, results[2].id).installed_app_id == app.id
+    assert session.get(NotInstalledApp, results[5].id).name == "Krita"
+    assert session.query(ItemTag).count() == 2
+
+
+def test_run_batch_replays_a_rejected_chunk_record_by_record(session):
+    session.execute(
+        text(
+            "CREATE TRIGGER reject_bad BEFORE INSERT ON resource_items "
+            "WHEN NEW.name = 'bad' BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+    )
+    session.commit()
+
+    results = list(run_batch(session, ["add-resource A a", "add-resource bad b", "add-resource C c"]))
+
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].error == "rejected"
+    assert sorted(name for (name,) in session.query(ResourceItem.name)) == ["A", "C"]
+
+
+def test_batch_command_reads_file_and_prints_jsonl(tmp_path, monkeypatch):
+    engine = get_engine(tmp_path / "batch.db")
+    init_db(engine)
+    monkeypatch.setattr(cli, "_engine", engine)
+    script = tmp_path / "script.txt"
+    script.write_text(
+        "\n".join(f"add-resource r{i} https://example.com/{i} --type url" for i in range(1200))
+        + "\nadd-resource broken\n",
+        encoding="utf-8",
+    )
+
+    result = CliRunner().invoke(cli.app, ["batch", str(script), "--jsonl"])
+
+    assert result.exit_code == 1
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert len(rows) == 1201
+    assert rows[-1]["ok"] is False and rows[-1]["line"] == 1201
+    session = get_session(engine)
+    assert session.query(ResourceItem).count() == 1200
+    session.close()
+
+    result = CliRunner().invoke(cli.app, ["batch", "-"], input="add-notinstalled GIMP\n")
+    assert result.exit_code == 0, result.output
+    assert "Applied 1 record(s), 0 failed." in result.output
+    engine.dispose()
@@ -0,0 +1,92 @@
+"""Tests for the change-data-capture log."""
+
+import pytest
+
+from snapkit.app.service import SnapKitService
+from snapkit.db import write_generation
+from snapkit.infra.db import changelog
+from snapkit.infra.db.repo_sqlalchemy import SqlAlchemyToolboxRepository
+from snapkit.models import ChangeLogEntry, InstalledApp, NotInstalledApp, PinnedApp
+from snapkit.scanner import load_mock_data, save_scanned_apps_and_prune
+
+
+def test_triggers_log_every_write_and_changes_are_compacted(session):
+    changelog.register_consumer(session, "gui")
+    app = InstalledApp(name="Git")
+    wish = NotInstalledApp(name="Blender")
+    session.add_all([app, wish])
+    session.commit()
+    session.add(PinnedApp(installed_app_id=app.id))
+    session.commit()
+    app.custom_name = "Git SCM"
+    session.commit()
+    session.delete(wish)
+    session.commit()
+
+    ops = session.query(ChangeLogEntry.table_name, ChangeLogEntry.op).order_by(ChangeLogEntry.seq)
+    assert ops.all() == [
+        ("installed_apps", "I"),
+        ("not_installed_apps", "I"),
+        ("pinned_apps", "I"),
+        ("installed_apps", "U"),
+        ("not_installed_apps", "D"),
+    ]
+
+    changes = changelog.changes_since(session, 0)
+    assert [(c.table_name, c.row_id, c.op) for c in changes] == [
+        ("pinned_apps", 1, "I"),
+        ("installed_apps", app.id, "U"),
+        ("not_installed_apps", wish.id, "D"),
+    ]
+    assert changelog.changes_since(session, changes[-1].seq) == []
+    assert [c.op for c in changelog.changes_since(session, 0, limit=1)] == ["I"]
+
+
+def test_nothing_is_logged_without_a_consumer(session):
+    apps = load_mock_data()
+    for _ in range(5):
+        save_scanned_apps_and_prune(session, apps)
+    assert session.query(ChangeLogEntry).count() == 0
+
+    changelog.register_consumer(session, "gui")
+    changelog.unregister_consumer(session, "gui")
+    save_scanned_apps_and_prune(session, apps)
+    assert session.query(ChangeLogEntry).count() == 0
+
+
+def test_log_is_truncated_once_every_consumer_acked(session):
+    assert changelog.register_consumer(session, "gui") == 0
+    session.add_all(InstalledApp(name=f"App {i}") for i in range(3))
+    session.commit()
+    assert changelog.register_consumer(session, "search") == 3
+    assert changelog.register_consumer(session, "gui") == 0
+
+    assert changelog.ack_changes(session, "search", 3) == 0
+    assert changelog.ack_changes(session, "gui", 2) == 2
+    assert changelog.ack_changes(session, "gui", 1) == 0
+    assert [c.seq for c in changelog.changes_since(session, 0)] == [3]
+
+    assert changelog.unregister_consumer(session, "gui") == 1
+    assert changelog.latest_seq(session) == 0
+    with pytest.raises(KeyError):
+        changelog.ack_changes(session, "gui", 5)
+
+    session.add(InstalledApp(name="Next"))
+    session.commit()
+    assert changelog.changes_since(session, 3)[0].seq == 4
+
+
+def test_service_consumer_acks_do_not_invalidate_cache(session, engine):
+    service = SnapKitService(SqlAlchemyToolboxRepository(engine), engine)
+    try:
+        service.register_change_consumer("gui")
+        service.quick_add("wish", "Blender")
+        changes = service.changes_since(0)
+        assert [(c.table_name, c.op) for c in changes] == [("not_installed_apps", "I")]
+
+        generation = write_generation(engine)
+        assert service.ack_changes("gui", changes[-1].seq) == 1
+        assert write_generation(engine) == generation
+        assert service.changes_since(0) == []
+    finally:
+        service.close()
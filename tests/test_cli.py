@@ -1,5 +1,6 @@
 """Tests for CLI commands."""
 
+import pytest
 from typer.testing import CliRunner
 
 from snapkit.cli import app
@@ -17,3 +18,198 @@ def test_list_installed_empty():
     result = runner.invoke(app, ["list-installed"])
     # May show "No installed apps" or a table depending on prior state
     assert result.exit_code == 0
+
+
+def test_db_maintain(tmp_path, monkeypatch):
+    from snapkit import cli
+    from snapkit.db import get_engine, init_db
+
+    engine = get_engine(tmp_path / "cli.db")
+    init_db(engine)
+    monkeypatch.setattr(cli, "_engine", engine)
+
+    result = runner.invoke(app, ["db", "maintain"])
+    assert result.exit_code == 0, result.output
+    assert "installed_apps" in result.output
+    assert "Integrity check: ok" in result.output
+    engine.dispose()
+
+
+# Budget for `import snapkit.cli` (about 0.1s here, 0.65s before imports were made lazy).
+IMPORT_BUDGET_US = 400_000
+
+
+def test_cli_import_stays_light():
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    import snapkit
+
+    src = str(Path(snapkit.__file__).resolve().parent.parent)
+    pythonpath = [src, os.environ.get("PYTHONPATH", "")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, pythonpath))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import snapkit.cli"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, module = line.split("|")
+        if total.strip().isdigit():
+            cumulative[module.strip()] = int(total)
+
+    heavy = [m for m in cumulative if m.split(".")[0] in {"sqlalchemy", "rich"} or m == "snapkit.models"]
+    assert heavy == []
+    assert cumulative["snapkit.cli"] < IMPORT_BUDGET_US
+
+
+def test_run_fast_path_reads_stamped_database(tmp_path):
+    from snapkit.db import get_engine, get_session, init_db
+    from snapkit.fastpath import FastPathUnavailable, lookup_pinned_launch
+    from snapkit.models import InstalledApp, PinnedApp
+
+    db_path = tmp_path / "fast.db"
+    with pytest.raises(FastPathUnavailable):
+        lookup_pinned_launch(1, db_path)
+
+    engine = get_engine(db_path)
+    init_db(engine)
+    session = get_session(engine)
+    app_entry = InstalledApp(name="Tool", install_location=r"C:\Tool")
+    session.add(app_entry)
+    session.flush()
+    session.add(PinnedApp(installed_app_id=app_entry.id, launch_command="tool.exe"))
+    session.commit()
+    app_id = app_entry.id
+    session.close()
+
+    assert lookup_pinned_launch(1, db_path) == (1, app_id, "Tool", "tool.exe", r"C:\Tool")
+    assert lookup_pinned_launch(2, db_path) is None
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("PRAGMA user_version = 0")
+    with pytest.raises(FastPathUnavailable):
+        lookup_pinned_launch(1, db_path)
+    engine.dispose()
+
+
+def test_list_commands_stream_jsonl(tmp_path, monkeypatch):
+    import json
+
+    from snapkit import cli
+    from snapkit.db import get_engine, get_session, init_db
+    from snapkit.models import InstalledApp, PinnedApp
+
+    engine = get_engine(tmp_path / "json.db")
+    init_db(engine)
+    session = get_session(engine)
+    firefox = InstalledApp(name="Firefox", publisher="Mozilla", tags="browser")
+    session.add_all([firefox, InstalledApp(name="Notepad++", tags="editor")])
+    session.flush()
+    session.add(PinnedApp(installed_app_id=firefox.id))
+    session.commit()
+    session.close()
+    monkeypatch.setattr(cli, "_engine", engine)
+
+    result = runner.invoke(app, ["list-installed", "--jsonl"])
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    assert [row["name"] for row in rows] == ["Firefox", "Notepad++"]
+    assert rows[0]["publisher"] == "Mozilla"
+
+    result = runner.invoke(app, ["list-installed", "--jsonl", "--tag", "editor"])
+    assert [json.loads(line)["name"] for line in result.output.splitlines()] == ["Notepad++"]
+
+    result = runner.invoke(app, ["list-pinned", "--json"])
+    assert result.exit_code == 0, result.output
+    assert [row["name"] for row in json.loads(result.output)] == ["Firefox"]
+
+    result = runner.invoke(app, ["list-resources", "--json"])
+    assert json.loads(result.output) == []
+    result = runner.invoke(app, ["list-notinstalled", "--jsonl"])
+    assert result.output == ""
+
+    result = runner.invoke(app, ["list-installed", "--json", "--jsonl"])
+    assert result.exit_code == 2
+    engine.dispose()
+
+
+def test_export_and_import_with_progress(tmp_path, monkeypatch):
+    from snapkit import cli
+    from snapkit.db import get_engine, get_session, init_db
+    from snapkit.models import NotInstalledApp
+
+    engine = get_engine(tmp_path / "cli.db")
+    init_db(engine)
+    session = get_session(engine)
+    session.add(NotInstalledApp(name="Blender"))
+    session.commit()
+    session.close()
+    monkeypatch.setattr(cli, "_engine", engine)
+
+    bundle = tmp_path / "bundle.zip"
+    for args in (["export", str(bundle), "--snapshot"], ["import", str(bundle), "--restore-to", str(tmp_path / "r")]):
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0, result.output
+    assert "not_installed_apps: 0 new" in result.output
+    engine.dispose()
+
+
+def test_bundle_verify(tmp_path):
+    from zipfile import ZipFile
+
+    from snapkit.checksums import checksum_bytes, write_checksums
+
+    bundle = tmp_path / "bundle.zip"
+    with ZipFile(bundle, "w") as zf:
+        zf.writestr("blob_map.json", b"{}")
+        zf.writestr("blobs/abc", b"changed")
+        write_checksums(zf, {"blob_map.json": checksum_bytes(b"{}"), "blobs/abc": checksum_bytes(b"original")})
+
+    result = runner.invoke(app, ["bundle", "verify", str(bundle), "blob_map.json"])
+    assert result.exit_code == 0, result.output
+    assert "All 1 entries verified" in result.output
+
+    result = runner.invoke(app, ["bundle", "verify", str(bundle)])
+    assert result.exit_code == 1
+    assert "blobs/abc" in result.output
+
+
+def test_export_dry_run_and_selection(tmp_path, monkeypatch):
+    from snapkit import cli
+    from snapkit.db import get_engine, get_session, init_db
+    from snapkit.models import NotInstalledApp, ResourceItem
+
+    engine = get_engine(tmp_path / "cli.db")
+    init_db(engine)
+    session = get_session(engine)
+    session.add_all(
+        [
+            NotInstalledApp(name="Blender"),
+            ResourceItem(name="Docs", path="https://docs", resource_type="url", tags="work"),
+        ]
+    )
+    session.commit()
+    session.close()
+    monkeypatch.setattr(cli, "_engine", engine)
+
+    bundle = tmp_path / "bundle.zip"
+    result = runner.invoke(app, ["export", str(bundle), "--tag", "work", "--dry-run"])
+    assert result.exit_code == 0, result.output
+    assert "resource_items: 1" in result.output and "not_installed_apps: 0" in result.output
+    assert "Estimated bundle size" in result.output
+    assert not bundle.exists()
+
+    result = runner.invoke(app, ["export", str(bundle), "--view", "resource_url"])
+    assert result.exit_code == 0, result.output
+    assert runner.invoke(app, ["export", str(bundle), "--view", "nope"]).exit_code == 1
+    assert runner.invoke(app, ["export", str(bundle), "--snapshot", "--tag", "x"]).exit_code == 1
+    engine.dispose()
@@ -0,0 +1,105 @@
+"""Tests for the resident CLI daemon."""
+
+import sys
+import threading
+
+import pytest
+
+from snapkit import cli
+from snapkit.daemon.client import forward, request
+from snapkit.daemon.server import SnapKitDaemon
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.models import InstalledApp, PinnedApp
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="exercises the AF_UNIX client")
+
+
+@pytest.fixture()
+def daemon(tmp_path):
+    engine = get_engine(tmp_path / "daemon.db")
+    init_db(engine)
+    server = SnapKitDaemon(engine, address=str(tmp_path / "d.sock"))
+    server.bind()
+    thread = threading.Thread(target=server.serve_forever)
+    thread.start()
+    yield server, engine
+    request({"op": "shutdown"}, server.address)
+    thread.join(5)
+    engine.dispose()
+
+
+def _pin(engine, **fields):
+    session = get_session(engine)
+    app = InstalledApp(name="Tool", **fields)
+    session.add(app)
+    session.flush()
+    pin = PinnedApp(installed_app_id=app.id)
+    session.add(pin)
+    session.commit()
+    pin_id = pin.id
+    session.close()
+    return pin_id
+
+
+def test_forwards_list_and_run(daemon, tmp_path):
+    server, engine = daemon
+    (tmp_path / "tool").mkdir()
+    (tmp_path / "tool" / "tool.exe").touch()
+    pin_id = _pin(engine, install_location=str(tmp_path / "tool"))
+
+    output, code = forward(["list-pinned"], server.address)
+    assert code == 0 and "Tool" in output
+
+    output, code = forward(["run", str(pin_id)], server.address)
+    assert code == 0
+    assert "tool.exe" in output
+    assert server._resolver._cache
+
+    output, code = forward(["run", "999"], server.address)
+    assert code == 1 and "No pinned entry" in output
+
+    # Any write, even from another connection, drops cached exe resolutions.
+    session = get_session(engine)
+    session.get(InstalledApp, 1).custom_name = "Renamed"
+    session.commit()
+    session.close()
+    forward(["list-installed"], server.address)
+    assert not server._resolver._cache
+    for command in ("list-installed", "list-pinned", "list-notinstalled", "list-resources"):
+        assert forward([command], server.address)[1] == 0
+    # Every served command hands its connection back; none waits for the GC.
+    assert engine.pool.checkedout() == 0
+
+    assert request({"op": "ping"}, server.address)["served"] == 8
+    assert cli._engine is engine
+
+
+def test_run_launches_in_the_clients_cwd_and_environment(daemon, tmp_path, monkeypatch):
+    server, engine = daemon
+    pin_id = _pin(engine)
+    session = get_session(engine)
+    session.get(PinnedApp, pin_id).launch_command = "tool.exe --flag"
+    session.commit()
+    session.close()
+
+    launches = []
+    monkeypatch.setattr(
+        "snapkit.launcher.launch_app",
+        lambda command, cwd=None, env=None: launches.append((command, cwd, env)),
+    )
+    monkeypatch.setenv("SNAPKIT_TEST_CALLER", "1")
+    monkeypatch.chdir(tmp_path)
+
+    output, code = forward(["run", str(pin_id)], server.address)
+    assert code == 0, output
+    [(command, cwd, env)] = launches
+    assert command == "tool.exe --flag"
+    assert cwd == str(tmp_path)
+    assert env["SNAPKIT_TEST_CALLER"] == "1"
+    assert cli._caller is None
+
+
+def test_rejects_unforwarded_commands_and_falls_back(daemon, tmp_path):
+    server, _ = daemon
+    assert forward(["scan", "--mock"], server.address) is None
+    assert forward(["list-pinned"], str(tmp_path / "missing.sock")) is None
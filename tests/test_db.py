@@ -0,0 +1,85 @@
+"""Tests for database initialization and migrations."""
+
+import sqlite3
+
+from sqlalchemy import event, text
+
+from snapkit.db import SCHEMA_VERSION, get_engine, get_session, init_db, schema_version
+from snapkit.infra.db import changelog
+from snapkit.infra.db.repo_sqlalchemy import SqlAlchemyToolboxRepository
+
+
+def _create_legacy_db(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE installed_apps (
+            id INTEGER PRIMARY KEY, name VARCHAR(255), publisher VARCHAR(255),
+            install_location TEXT, version VARCHAR(100), registry_key TEXT,
+            tags TEXT, scanned_at DATETIME
+        );
+        CREATE TABLE not_installed_apps (
+            id INTEGER PRIMARY KEY, name VARCHAR(255), description TEXT,
+            download_url TEXT, tags TEXT, added_at DATETIME
+        );
+        INSERT INTO installed_apps (name, tags, scanned_at)
+            VALUES (' Git ', 'dev,vcs', '2024-01-01 00:00:00');
+        INSERT INTO not_installed_apps (name, tags, added_at)
+            VALUES ('git', NULL, '2024-01-01 00:00:00'),
+                   ('Blender', '3d,modeling', '2024-01-02 00:00:00');
+        """
+    )
+    conn.commit()
+    conn.close()
+
+
+def test_migrates_legacy_database(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    _create_legacy_db(db_path)
+
+    engine = get_engine(db_path)
+    init_db(engine)
+    init_db(engine)
+    repo = SqlAlchemyToolboxRepository(engine)
+
+    assert [i.title for i in repo.list_not_installed()] == ["Blender"]
+    assert repo.tag_facets("local") == [("dev", 1), ("vcs", 1)]
+    assert [i.title for i in repo.list_not_installed(tag="3d")] == ["Blender"]
+
+    session = get_session(engine)
+    seq = changelog.register_consumer(session, "gui")
+    session.execute(text("DELETE FROM not_installed_apps WHERE name = 'Blender'"))
+    session.commit()
+    assert [(c.table_name, c.op) for c in changelog.changes_since(session, seq)] == [
+        ("not_installed_apps", "D")
+    ]
+    session.close()
+    engine.dispose()
+
+
+def test_stamped_database_skips_ddl(tmp_path):
+    engine = get_engine(tmp_path / "stamped.db")
+    init_db(engine)
+    assert schema_version(engine) == SCHEMA_VERSION
+
+    statements = []
+    event.listen(
+        engine,
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+    init_db(engine)
+    assert statements == ["PRAGMA user_version"]
+
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA user_version = 0"))
+        conn.execute(text("DROP TRIGGER trg_pinned_apps_untag"))
+    statements.clear()
+    init_db(engine)
+    assert len(statements) > 1
+    assert schema_version(engine) == SCHEMA_VERSION
+    with engine.connect() as conn:
+        assert conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'trg_pinned_apps_untag'")
+        ).scalar()
+    engine.dispose()
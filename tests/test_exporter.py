@@ -1,8 +1,11 @@
 """Tests for exporter module."""
 
+import os
 import tempfile
 from pathlib import Path
 
+import pytest
+
 from snapkit.exporter import export_bundle, import_bundle
 from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
 
@@ -80,3 +83,547 @@ def test_import_no_duplicates(session):
         counts = import_bundle(session, zip_path)
         assert counts["installed_apps"] == 0
         assert counts["not_installed_apps"] == 0
+
+
+def _resource_tree(session, tmp_path):
+    notes = tmp_path / "notes.txt"
+    notes.write_text("hello", encoding="utf-8")
+    folder = tmp_path / "project"
+    (folder / ".config").mkdir(parents=True)
+    (folder / "readme.md").write_text("# project", encoding="utf-8")
+    (folder / ".config" / "settings.json").write_text("{}", encoding="utf-8")
+    (folder / "notes-copy.txt").write_text("hello", encoding="utf-8")
+    session.add_all(
+        [
+            ResourceItem(name="Notes", path=str(notes), resource_type="file"),
+            ResourceItem(name="Project", path=str(folder), resource_type="folder"),
+            ResourceItem(name="Site", path="https://example.com", resource_type="url"),
+        ]
+    )
+    session.commit()
+    return notes, folder
+
+
+def _blob_names(zip_path):
+    from zipfile import ZipFile
+
+    with ZipFile(zip_path) as zf:
+        return {name for name in zf.namelist() if name.startswith("blobs/")}
+
+
+def test_export_stores_each_distinct_file_once(session, tmp_path):
+    _, folder = _resource_tree(session, tmp_path)
+
+    # The bundle is written inside an exported folder and must not include itself.
+    out = export_bundle(session, folder / "bundle.zip")
+
+    assert len(_blob_names(out)) == 3  # "hello" is shared by notes.txt and notes-copy.txt
+    assert not (folder / "bundle.zip.part").exists()
+
+    restore = tmp_path / "restore"
+    import_bundle(session, out, restore_files_to=restore)
+    assert (restore / "1_notes.txt").read_text(encoding="utf-8") == "hello"
+    assert (restore / "2_project" / ".config" / "settings.json").read_text(encoding="utf-8") == "{}"
+    assert (restore / "2_project" / "notes-copy.txt").read_text(encoding="utf-8") == "hello"
+    assert not (restore / "2_project" / "bundle.zip").exists()
+
+
+def test_incremental_export_only_adds_new_blobs(session, tmp_path):
+    notes, folder = _resource_tree(session, tmp_path)
+    bundles = tmp_path / "bundles"
+    full = export_bundle(session, bundles / "full.zip")
+
+    (folder / "readme.md").write_text("# project v2", encoding="utf-8")
+    first = export_bundle(session, bundles / "inc1.zip", base=full)
+    assert len(_blob_names(first)) == 1
+
+    notes.write_text("changed", encoding="utf-8")
+    second = export_bundle(session, bundles / "inc2.zip", base=first)
+    assert len(_blob_names(second)) == 1
+
+    restore = tmp_path / "restore"
+    import_bundle(session, second, restore_files_to=restore)
+    assert (restore / "1_notes.txt").read_text(encoding="utf-8") == "changed"
+    assert (restore / "2_project" / "readme.md").read_text(encoding="utf-8") == "# project v2"
+    assert (restore / "2_project" / ".config" / "settings.json").read_text(encoding="utf-8") == "{}"
+
+    full.unlink()
+    with pytest.raises(FileNotFoundError):
+        import_bundle(session, second, restore_files_to=tmp_path / "again")
+
+
+def test_hash_files_reuses_digests_of_unchanged_files(session, tmp_path, monkeypatch):
+    from snapkit import exporter
+
+    path = tmp_path / "a.bin"
+    path.write_bytes(b"abc")
+    first = exporter.hash_files(session, [path])
+    assert len(first.fresh) == 1
+    assert session.query(exporter.FileDigest).count() == 0
+    exporter.record_file_digests(session, first.fresh)
+
+    hashed = []
+    real = exporter._sha256_file
+    monkeypatch.setattr(exporter, "_sha256_file", lambda p: hashed.append(p) or real(p))
+    assert exporter.hash_files(session, [path]) == (first.digests, [])
+    assert hashed == []
+
+    path.write_bytes(b"abcd")
+    os.utime(path, ns=(1, 1))
+    assert exporter.hash_files(session, [path]).digests != first.digests
+    assert hashed == [path]
+
+
+def test_import_legacy_file_map_bundle(session, tmp_path):
+    import json
+    from zipfile import ZipFile
+
+    legacy = tmp_path / "legacy.zip"
+    with ZipFile(legacy, "w") as zf:
+        zf.writestr("snapkit_data.json", json.dumps({"resource_items": []}))
+        zf.writestr("files/7_notes.txt", "old")
+        zf.writestr("file_map.json", json.dumps({"7": "7_notes.txt"}))
+
+    import_bundle(session, legacy, restore_files_to=tmp_path / "restore")
+    assert (tmp_path / "restore" / "7_notes.txt").read_text(encoding="utf-8") == "old"
+
+
+def test_compression_policy_stores_media_and_incompressible_files(tmp_path):
+    from zipfile import ZIP_DEFLATED, ZIP_STORED
+
+    from snapkit.exporter import CompressionPolicy
+
+    text = tmp_path / "notes.txt"
+    text.write_text("lorem ipsum " * 1000, encoding="utf-8")
+    photo = tmp_path / "photo.JPG"
+    photo.write_text("not really a jpeg " * 1000, encoding="utf-8")
+    noise = tmp_path / "noise.dat"
+    noise.write_bytes(os.urandom(16384))
+
+    policy = CompressionPolicy()
+    assert policy.compress_type_for(text) == ZIP_DEFLATED
+    assert policy.compress_type_for(photo) == ZIP_STORED
+    assert policy.compress_type_for(noise) == ZIP_STORED
+    assert CompressionPolicy(method="store").compress_type_for(text) == ZIP_STORED
+    with pytest.raises(ValueError):
+        CompressionPolicy(method="brotli")
+
+
+@pytest.mark.parametrize("method", ["deflate", "bzip2", "lzma"])
+def test_parallel_compression_writes_valid_entries_in_order(session, tmp_path, method):
+    from zipfile import ZIP_STORED, ZipFile
+
+    from snapkit.exporter import COMPRESSION_METHODS, CompressionPolicy
+
+    files = []
+    for index in range(6):
+        path = tmp_path / f"doc{index}.txt"
+        path.write_text(f"document {index} " * 5000, encoding="utf-8")
+        files.append(path)
+    media = tmp_path / "clip.mp4"
+    media.write_bytes(os.urandom(50000))
+    files.insert(3, media)
+    session.add_all(ResourceItem(name=p.name, path=str(p), resource_type="file") for p in files)
+    session.commit()
+
+    out = export_bundle(
+        session, tmp_path / "out.zip", compression=CompressionPolicy(method=method, workers=2)
+    )
+
+    with ZipFile(out) as zf:
+        assert zf.testzip() is None
+        blobs = [info for info in zf.infolist() if info.filename.startswith("blobs/")]
+        assert [info.compress_type for info in blobs] == [
+            ZIP_STORED if index == 3 else COMPRESSION_METHODS[method] for index in range(7)
+        ]
+        assert zf.getinfo("snapkit_data.jsonl").compress_type == COMPRESSION_METHODS[method]
+        assert sum(info.compress_size for info in blobs) < sum(p.stat().st_size for p in files) / 2
+
+    restore = tmp_path / "restore"
+    import_bundle(session, out, restore_files_to=restore)
+    assert (restore / "1_doc0.txt").read_text(encoding="utf-8") == files[0].read_text(encoding="utf-8")
+
+
+def test_import_dedupes_in_bulk_and_indexes_tags(session, tmp_path):
+    import json
+    from zipfile import ZipFile
+
+    from snapkit.models import tag_filter
+
+    session.add(InstalledApp(name="Existing", registry_key="HKLM\\Existing"))
+    session.commit()
+    bundle = tmp_path / "bundle.zip"
+    data = {
+        "installed_apps": [
+            {"name": "Existing", "registry_key": "HKLM\\Existing"},
+            {"name": "Krita", "registry_key": "HKLM\\Krita", "tags": "art, Paint"},
+            {"name": "Krita again", "registry_key": "HKLM\\Krita"},
+        ],
+        "pinned_apps": [
+            {"installed_app_registry_key": "HKLM\\Krita", "launch_command": "krita.exe"},
+            {"installed_app_registry_key": "HKLM\\Krita"},
+            {"installed_app_registry_key": "HKLM\\Missing"},
+        ],
+        "not_installed_apps": [{"name": "GIMP", "tags": "art"}, {"name": "GIMP"}],
+        "resource_items": [
+            {"name": "Docs", "path": "https://docs", "resource_type": "url"},
+            {"name": "Docs", "path": "https://docs", "resource_type": "url"},
+        ],
+    }
+    with ZipFile(bundle, "w") as zf:
+        zf.writestr("snapkit_data.json", json.dumps(data))
+
+    counts = import_bundle(session, bundle)
+
+    assert counts == {"installed_apps": 1, "pinned_apps": 1, "not_installed_apps": 1, "resource_items": 1}
+    krita = session.query(InstalledApp).filter_by(registry_key="HKLM\\Krita").one()
+    assert krita.name_key == "krita"
+    assert krita.scanned_at is not None
+    assert session.query(PinnedApp).one().launch_command == "krita.exe"
+    assert session.query(InstalledApp).filter(tag_filter(InstalledApp, "paint")).one() == krita
+    assert session.query(NotInstalledApp).filter(tag_filter(NotInstalledApp, "art")).one().name_key == "gimp"
+
+
+def test_import_refuses_paths_that_escape_the_restore_dir(session, tmp_path):
+    import json
+    from zipfile import ZipFile
+
+    bundle = tmp_path / "evil.zip"
+    with ZipFile(bundle, "w") as zf:
+        zf.writestr("snapkit_data.json", json.dumps({}))
+        zf.writestr("blobs/abc", "x")
+        zf.writestr("blob_map.json", json.dumps({"base": None, "resources": {"1": {"name": "../evil", "blob": "abc"}}}))
+
+    with pytest.raises(ValueError):
+        import_bundle(session, bundle, restore_files_to=tmp_path / "restore")
+    assert not (tmp_path / "evil").exists()
+
+
+def test_manifest_v2_round_trips_and_detects_damage():
+    import io
+
+    from snapkit.exporter import read_manifest, write_manifest
+
+    buffer = io.BytesIO()
+    counts = write_manifest(
+        buffer,
+        [("installed_apps", iter([{"name": "Git"}, {"name": "Vim"}])), ("pinned_apps", iter([]))],
+    )
+    assert counts == {"installed_apps": 2, "pinned_apps": 0}
+    raw = buffer.getvalue()
+    assert raw.count(b"\n") == 4  # header, two records, footer
+
+    assert list(read_manifest(io.BytesIO(raw))) == [
+        ("installed_apps", {"name": "Git"}),
+        ("installed_apps", {"name": "Vim"}),
+    ]
+
+    truncated = raw[: raw.rindex(b'{"type":"footer"')]
+    with pytest.raises(ValueError, match="truncated"):
+        list(read_manifest(io.BytesIO(truncated)))
+    with pytest.raises(ValueError, match="checksum"):
+        list(read_manifest(io.BytesIO(raw.replace(b"Vim", b"Vi!"))))
+    with pytest.raises(ValueError, match="not a SnapKit manifest"):
+        list(read_manifest(io.BytesIO(b'{"installed_apps": []}')))
+
+
+def test_import_of_damaged_manifest_rolls_back(session, tmp_path):
+    from zipfile import ZipFile
+
+    _seed_data(session)
+    bundle = export_bundle(session, tmp_path / "bundle.zip")
+    with ZipFile(bundle) as zf:
+        manifest = zf.read("snapkit_data.jsonl")
+    session.query(PinnedApp).delete()
+    session.query(InstalledApp).delete()
+    session.commit()
+
+    damaged = tmp_path / "damaged.zip"
+    with ZipFile(damaged, "w") as zf:
+        zf.writestr("snapkit_data.jsonl", manifest[: manifest.rindex(b'{"type":"footer"')])
+
+    with pytest.raises(ValueError):
+        import_bundle(session, damaged)
+    assert session.query(InstalledApp).count() == 0
+
+
+def _file_session(path):
+    from snapkit.db import get_engine, get_session, init_db
+
+    engine = get_engine(path)
+    init_db(engine)
+    return engine, get_session(engine)
+
+
+def test_snapshot_bundle_merges_into_another_database(tmp_path):
+    from zipfile import ZipFile
+
+    from snapkit.models import tag_filter
+
+    engine, session = _file_session(tmp_path / "source.db")
+    _seed_data(session)
+    notes = tmp_path / "notes.txt"
+    notes.write_text("hello", encoding="utf-8")
+    session.query(ResourceItem).one().path = str(notes)
+    session.commit()
+    bundle = export_bundle(session, tmp_path / "snapshot.zip", snapshot=True)
+    session.close()
+    engine.dispose()
+
+    with ZipFile(bundle) as zf:
+        names = set(zf.namelist())
+    assert "snapshot.db" in names and "snapkit_data.jsonl" not in names
+    assert len(_blob_names(bundle)) == 1
+
+    engine, session = _file_session(tmp_path / "target.db")
+    session.add_all(
+        [
+            InstalledApp(name="Firefox (local)", registry_key="HKLM\\Software\\Firefox"),
+            NotInstalledApp(name="Krita"),
+        ]
+    )
+    session.commit()
+
+    restore = tmp_path / "restore"
+    counts = import_bundle(session, bundle, restore_files_to=restore)
+    assert counts == {"installed_apps": 1, "pinned_apps": 1, "not_installed_apps": 1, "resource_items": 1}
+    assert session.query(InstalledApp).count() == 2
+    pin = session.query(PinnedApp).one()
+    assert pin.installed_app.name == "Firefox (local)"
+    assert pin.launch_command == "firefox.exe"
+    blender = session.query(NotInstalledApp).filter(tag_filter(NotInstalledApp, "3d")).one()
+    assert blender.name_key == "blender"
+    assert (restore / "1_notes.txt").read_text(encoding="utf-8") == "hello"
+
+    assert import_bundle(session, bundle) == dict.fromkeys(counts, 0)
+    session.close()
+    engine.dispose()
+
+
+def test_snapshot_from_newer_schema_is_refused(session, tmp_path):
+    import sqlite3
+    from zipfile import ZipFile
+
+    from snapkit.fastpath import SCHEMA_VERSION
+
+    snapshot = tmp_path / "snapshot.db"
+    with sqlite3.connect(snapshot) as conn:
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION + 1}")
+    conn.close()
+    bundle = tmp_path / "future.zip"
+    with ZipFile(bundle, "w") as zf:
+        zf.write(snapshot, "snapshot.db")
+
+    with pytest.raises(ValueError, match="newer"):
+        import_bundle(session, bundle)
+
+
+def test_snapshot_export_after_a_file_export_on_the_same_session(session, tmp_path):
+    notes = tmp_path / "notes.txt"
+    notes.write_text("hello")
+    session.add(ResourceItem(name="Notes", path=str(notes), resource_type="file"))
+    session.commit()
+
+    export_bundle(session, tmp_path / "files.zip")
+    assert export_bundle(session, tmp_path / "snapshot.zip", snapshot=True).exists()
+
+    session.add(InstalledApp(name="Pending"))
+    session.flush()
+    with pytest.raises(RuntimeError, match="uncommitted"):
+        export_bundle(session, tmp_path / "pending.zip", snapshot=True)
+    assert not (tmp_path / "pending.zip.part").exists()
+    session.rollback()
+
+
+def test_export_reports_progress_and_cancel_removes_partial_bundle(session, tmp_path):
+    from snapkit.progress import CancelToken, OperationCancelled
+
+    _seed_data(session)
+    _resource_tree(session, tmp_path)
+    events = []
+    export_bundle(session, tmp_path / "bundle.zip", progress=events.append)
+    assert [event.phase for event in events if event.done == 0] == ["hash", "records", "files"]
+    records = [event for event in events if event.phase == "records"]
+    assert records[-1].done == records[-1].total == 8
+
+    cancel = CancelToken()
+
+    def stop_after_records(event):
+        if event.phase in ("snapshot", "files"):
+            cancel.cancel()
+
+    for snapshot in (False, True):
+        out = tmp_path / f"cancelled-{snapshot}.zip"
+        with pytest.raises(OperationCancelled):
+            export_bundle(session, out, snapshot=snapshot, progress=stop_after_records, cancel=cancel)
+        assert not out.exists() and not out.with_name(out.name + ".part").exists()
+        cancel = CancelToken()
+
+
+def test_interrupted_restore_resumes_from_journal(session, tmp_path, monkeypatch):
+    from snapkit import exporter
+    from snapkit.progress import CancelToken, OperationCancelled
+
+    _resource_tree(session, tmp_path)
+    bundle = export_bundle(session, tmp_path / "bundle.zip")
+    session.query(ResourceItem).delete()
+    session.commit()
+
+    restore = tmp_path / "restore"
+    cancel = CancelToken()
+
+    def stop_after_first_file(event):
+        if event.phase == "files" and event.done == 1:
+            cancel.cancel()
+
+    with pytest.raises(OperationCancelled):
+        import_bundle(session, bundle, restore_files_to=restore, progress=stop_after_first_file, cancel=cancel)
+    assert session.query(ResourceItem).count() == 3  # records were committed before the files
+    assert (restore / exporter.IMPORT_JOURNAL).exists()
+
+    extracted = []
+    original = exporter._extract_to
+    monkeypatch.setattr(
+        exporter, "_extract_to", lambda zf, member, dest: (extracted.append(dest), original(zf, member, dest))
+    )
+    counts = import_bundle(session, bundle, restore_files_to=restore)
+    assert counts["resource_items"] == 3
+    assert len(extracted) == 3  # four files in the bundle, one restored before the cancel
+    assert (restore / "1_notes.txt").read_text(encoding="utf-8") == "hello"
+    assert (restore / "2_project" / ".config" / "settings.json").exists()
+    assert not (restore / exporter.IMPORT_JOURNAL).exists()
+    assert session.query(ResourceItem).count() == 3
+
+
+def _rewrite_entry(bundle, out, name, data):
+    from zipfile import ZipFile
+
+    with ZipFile(bundle) as src, ZipFile(out, "w") as dest:
+        for info in src.infolist():
+            dest.writestr(info, data if info.filename == name else src.read(info.filename))
+
+
+def test_verify_bundle_checks_every_entry_and_reports_damage(session, tmp_path):
+    from snapkit.checksums import CHECKSUMS, verify_bundle
+
+    _seed_data(session)
+    _resource_tree(session, tmp_path)
+    for snapshot in (False, True):
+        bundle = export_bundle(session, tmp_path / f"bundle-{snapshot}.zip", snapshot=snapshot)
+        checks = verify_bundle(bundle, workers=2)
+        assert all(check.ok for check in checks), checks
+        assert {"blob_map.json", "snapshot.db" if snapshot else "snapkit_data.jsonl"} <= {
+            check.name for check in checks
+        }
+        assert CHECKSUMS not in {check.name for check in checks}
+
+    blob = min(_blob_names(bundle))
+    damaged = tmp_path / "damaged.zip"
+    _rewrite_entry(bundle, damaged, blob, b"tampered")
+    failed = [check for check in verify_bundle(damaged) if not check.ok]
+    assert [check.name for check in failed] == [blob]
+    assert failed[0].error.startswith("size 8 != ")
+
+    only = verify_bundle(damaged, entries=["blob_map.json", "blobs/nothing*"])
+    assert [(check.name, check.ok) for check in only] == [("blob_map.json", True), ("blobs/nothing*", False)]
+
+
+def test_verify_bundle_detects_flipped_bytes_and_missing_checksums(session, tmp_path):
+    from zipfile import ZipFile
+
+    from snapkit.checksums import verify_bundle
+    from snapkit.exporter import STORE_ONLY
+
+    notes = tmp_path / "notes.txt"
+    notes.write_text("hello world " * 100, encoding="utf-8")
+    session.add(ResourceItem(name="Notes", path=str(notes), resource_type="file"))
+    session.commit()
+    bundle = export_bundle(session, tmp_path / "bundle.zip", compression=STORE_ONLY)
+
+    raw = bytearray(bundle.read_bytes())
+    offset = raw.index(b"hello world")
+    raw[offset] ^= 0xFF
+    corrupt = tmp_path / "corrupt.zip"
+    corrupt.write_bytes(bytes(raw))
+    checks = verify_bundle(corrupt)
+    assert [check.ok for check in checks if check.name.startswith("blobs/")] == [False]
+    assert all(check.ok for check in checks if not check.name.startswith("blobs/"))
+
+    legacy = tmp_path / "legacy.zip"
+    with ZipFile(legacy, "w") as zf:
+        zf.writestr("snapkit_data.json", "{}")
+    with pytest.raises(ValueError, match="no checksum manifest"):
+        verify_bundle(legacy)
+
+
+def _manifest_tables(bundle):
+    import io
+    from zipfile import ZipFile
+
+    from snapkit.exporter import read_manifest
+
+    tables: dict[str, list] = {}
+    with ZipFile(bundle) as zf:
+        for table, record in read_manifest(io.BytesIO(zf.read("snapkit_data.jsonl"))):
+            tables.setdefault(table, []).append(record)
+    return tables
+
+
+def test_selective_export_filters_in_sql(session, tmp_path):
+    from snapkit.exporter import ExportSelection
+
+    _seed_data(session)
+    notes, folder = _resource_tree(session, tmp_path)
+    session.query(ResourceItem).filter_by(name="Notes", path=str(notes)).one().tags = "work"
+    session.add(ResourceItem(name="Photo", path="https://img", resource_type="image", tags="work"))
+    session.commit()
+
+    pins = _manifest_tables(
+        export_bundle(session, tmp_path / "pins.zip", selection=ExportSelection(views=("installed",)))
+    )
+    assert set(pins) == {"installed_apps", "pinned_apps"}
+    assert [app["name"] for app in pins["installed_apps"]] == ["Firefox"]
+
+    work = export_bundle(session, tmp_path / "work.zip", selection=ExportSelection(tags=("Work",)))
+    assert {table: [row["name"] for row in rows] for table, rows in _manifest_tables(work).items()} == {
+        "resource_items": ["Notes", "Photo"]
+    }
+    assert len(_blob_names(work)) == 1
+
+    images = ExportSelection(views=("resource_image",), resource_types=("folder",))
+    rows = _manifest_tables(export_bundle(session, tmp_path / "images.zip", selection=images))
+    assert [row["name"] for row in rows["resource_items"]] == ["Project", "Photo"]
+
+    project_id = session.query(ResourceItem.id).filter_by(name="Project").scalar()
+    by_id = export_bundle(session, tmp_path / "id.zip", selection=ExportSelection(resource_ids=(project_id,)))
+    assert [row["name"] for row in _manifest_tables(by_id)["resource_items"]] == ["Project"]
+    assert len(_blob_names(by_id)) == 3
+
+    with pytest.raises(ValueError, match="unknown view"):
+        ExportSelection(views=("everything",))
+    with pytest.raises(ValueError, match="snapshot"):
+        export_bundle(session, tmp_path / "snap.zip", snapshot=True, selection=ExportSelection(tags=("work",)))
+
+
+def test_estimate_export_matches_what_export_writes(session, tmp_path):
+    from zipfile import ZipFile
+
+    from snapkit.exporter import ExportSelection, estimate_export
+
+    _seed_data(session)
+    notes, _ = _resource_tree(session, tmp_path)
+    for selection in (ExportSelection(), ExportSelection(views=("installed", "not_installed"))):
+        estimate = estimate_export(session, selection)
+        bundle = export_bundle(session, tmp_path / "bundle.zip", selection=selection)
+        tables = _manifest_tables(bundle)
+        assert estimate.records == {table: len(rows) for table, rows in tables.items()}
+        with ZipFile(bundle) as zf:
+            manifest = zf.getinfo("snapkit_data.jsonl").file_size
+        assert 0.5 * manifest < estimate.record_bytes < 1.5 * manifest
+
+    estimate = estimate_export(session)
+    assert estimate.files == 4  # notes plus three files in the project folder
+    assert estimate.file_bytes == sum(
+        path.stat().st_size for path in [notes, *(p for p in (tmp_path / "project").rglob("*") if p.is_file())]
+    )
+    assert estimate_export(session, snapshot=True).record_bytes > 0
@@ -0,0 +1,139 @@
+"""Tests for fuzzy, frecency-ranked launching."""
+
+import io
+from datetime import datetime, timedelta
+
+from typer.testing import CliRunner
+
+from snapkit import cli
+from snapkit.db import get_engine, get_session, init_db
+from snapkit.launch_index import (
+    LaunchCandidate,
+    LaunchIndex,
+    frecency,
+    fuzzy_score,
+    load_launch_index,
+    record_launch,
+)
+from snapkit.models import InstalledApp, LaunchStat, PinnedApp
+from snapkit.picker import BACKSPACE, DOWN, ENTER, pick
+
+NOW = datetime(2024, 6, 1, 12, 0)
+
+
+def _candidate(app_id, title, launches=0, last=None, pin_id=None):
+    return LaunchCandidate(app_id, pin_id, title, title, None, None, launches, last)
+
+
+def test_fuzzy_score_prefers_word_starts_and_runs():
+    assert fuzzy_score("xyz", "Firefox") is None
+    assert fuzzy_score("vsc", "Visual Studio Code") > fuzzy_score("vsc", "Avast Secure")
+    assert fuzzy_score("fire", "Firefox") > fuzzy_score("fire", "Free Install Reporter")
+    assert fuzzy_score("code", "Code") > fuzzy_score("code", "Code Helper (Renderer)")
+
+
+def test_frecency_decays_with_age():
+    assert frecency(0, NOW, NOW) == 0
+    assert frecency(3, NOW - timedelta(minutes=5), NOW) == 12
+    assert frecency(3, NOW - timedelta(hours=5), NOW) == 6
+    assert frecency(3, NOW - timedelta(days=3), NOW) == 1.5
+    assert frecency(3, NOW - timedelta(days=30), NOW) == 0.75
+
+
+def test_index_ranks_by_match_then_frecency():
+    index = LaunchIndex(
+        [
+            _candidate(1, "Code Helper"),
+            _candidate(2, "Visual Studio Code", launches=20, last=NOW - timedelta(hours=2)),
+            _candidate(3, "Codec Pack", pin_id=7),
+        ]
+    )
+    assert [c.installed_app_id for c in index.search("code", now=NOW)] == [2, 3, 1]
+    assert index.search("zzz", now=NOW) == []
+
+    for _ in range(50):
+        index.note_launch(1, NOW)
+    assert index.search("code", limit=1, now=NOW)[0].installed_app_id == 1
+
+
+def test_blank_query_matches_everything_by_frecency(engine, monkeypatch):
+    assert fuzzy_score("   ", "Firefox") == 0.0
+    index = LaunchIndex([_candidate(1, "Blender"), _candidate(2, "Git", launches=3, last=NOW)])
+    assert [c.installed_app_id for c in index.search("  ", now=NOW)] == [2, 1]
+    assert [c.installed_app_id for c in index.search(" git ", now=NOW)] == [2]
+
+    monkeypatch.setattr(cli, "_engine", engine)
+    result = CliRunner().invoke(cli.app, ["run", "   "])
+    assert result.exit_code == 1
+    assert "Give a pin ID" in result.output
+
+
+def test_load_and_record_launch(engine, session):
+    apps = [InstalledApp(name="Mozilla Firefox"), InstalledApp(name="7-Zip", custom_name="Archiver")]
+    session.add_all(apps)
+    session.flush()
+    session.add(PinnedApp(installed_app_id=apps[1].id, launch_command="7z.exe"))
+    session.commit()
+
+    conn = engine.raw_connection()
+    try:
+        record_launch(conn, apps[0].id, NOW)
+        record_launch(conn, apps[0].id, NOW + timedelta(seconds=1))
+        index = load_launch_index(conn)
+    finally:
+        conn.close()
+
+    stat = session.get(LaunchStat, apps[0].id)
+    assert stat.launch_count == 2
+    assert len(index) == 2
+    # Custom and scanned names both match; pinned entries carry their pin.
+    assert index.search("7zip")[0].title == "Archiver"
+    assert index.search("archiver")[0].launch_command == "7z.exe"
+
+    session.delete(apps[0])
+    session.commit()
+    assert session.query(LaunchStat).count() == 0
+
+
+def test_picker_filters_as_user_types():
+    index = LaunchIndex([_candidate(1, "Firefox"), _candidate(2, "Foobar2000"), _candidate(3, "Git")])
+    out = io.StringIO()
+    seen = []
+
+    def search(text):
+        seen.append(text)
+        return index.search(text)
+
+    choice = pick(search, label=lambda c: c.title, keys=iter(["f", "o", BACKSPACE, DOWN, ENTER]), out=out)
+    assert seen == ["", "f", "fo", "f", "f"]
+    assert choice.title == "Foobar2000"
+    assert pick(search, keys=iter([]), out=out) is None
+    assert out.getvalue().endswith("\x1b[J")
+
+
+def test_run_query_launches_best_match_and_records_it(tmp_path, monkeypatch):
+    engine = get_engine(tmp_path / "run.db")
+    init_db(engine)
+    session = get_session(engine)
+    session.add_all([InstalledApp(name="Mozilla Firefox"), InstalledApp(name="Firewall Tool")])
+    session.flush()
+    session.add(PinnedApp(installed_app_id=1, launch_command="firefox.exe"))
+    session.commit()
+    session.close()
+
+    launched = []
+    monkeypatch.setattr(cli, "_engine", engine)
+    monkeypatch.setattr("snapkit.launcher.launch_app", lambda command, **kwargs: launched.append(command))
+
+    result = CliRunner().invoke(cli.app, ["run", "fire"])
+    assert result.exit_code == 0, result.output
+    assert launched == ["firefox.exe"]
+
+    session = get_session(engine)
+    assert session.get(LaunchStat, 1).launch_count == 1
+    session.close()
+
+    result = CliRunner().invoke(cli.app, ["run", "nomatch"])
+    assert result.exit_code == 1
+    assert "No app matches" in result.output
+    engine.dispose()
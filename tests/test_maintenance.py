@@ -0,0 +1,63 @@
+"""Tests for database maintenance."""
+
+import sqlite3
+
+from sqlalchemy import text
+
+from snapkit.app.service import SnapKitService
+from snapkit.db import get_engine, init_db
+from snapkit.infra.db.maintenance import AUTO_VACUUM_INCREMENTAL, run_maintenance
+from snapkit.infra.db.repo_sqlalchemy import SqlAlchemyToolboxRepository
+
+
+def _fill_and_delete(engine, rows=3000):
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO resource_items (name, path, resource_type, added_at) "
+                "VALUES (:name, :path, 'file', '2024-01-01')"
+            ),
+            [{"name": f"doc {i}" * 20, "path": f"/docs/{i}" * 20} for i in range(rows)],
+        )
+        conn.execute(text("DELETE FROM resource_items"))
+        conn.execute(text("DELETE FROM change_log"))
+
+
+def test_converts_legacy_database_and_reclaims_pages(tmp_path):
+    db_path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE legacy (id INTEGER PRIMARY KEY)")
+    conn.close()
+    engine = get_engine(db_path)
+    init_db(engine)
+    _fill_and_delete(engine)
+
+    report = run_maintenance(engine)
+    assert report.auto_vacuum == AUTO_VACUUM_INCREMENTAL
+    assert report.reclaimed_pages > 0
+    assert report.freelist_count == 0
+    assert report.integrity_ok
+    objects = {obj.name: obj for obj in report.objects}
+    assert objects["resource_items"].rows == 0
+    assert objects["ix_item_tags_tag_kind_item"].is_index
+
+    _fill_and_delete(engine)
+    again = run_maintenance(engine, integrity=False)
+    assert again.reclaimed_pages > 0
+    assert again.freelist_count == 0
+    assert again.integrity_ok is None
+    engine.dispose()
+
+
+def test_service_quick_maintenance(tmp_path):
+    engine = get_engine(tmp_path / "service.db")
+    init_db(engine)
+    service = SnapKitService(SqlAlchemyToolboxRepository(engine), engine)
+    try:
+        _fill_and_delete(engine)
+        report = service.maintain(quick=True)
+        assert report.freelist_count == 0
+        assert report.integrity is None and report.objects == []
+    finally:
+        service.close()
+        engine.dispose()
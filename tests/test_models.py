@@ -58,3 +58,38 @@ def test_installed_app_tags(session):
 
     result = session.query(InstalledApp).one()
     assert "dev" in result.tags
+
+
+def test_name_keys_follow_writes(session):
+    app = InstalledApp(name="  Visual Studio Code ")
+    wish = NotInstalledApp(name="Blender")
+    session.add_all([app, wish])
+    session.commit()
+    assert app.name_key == "visual studio code"
+    assert app.custom_name_key is None
+
+    app.custom_name = "VS Code"
+    wish.name = "BLENDER 4"
+    session.commit()
+    assert app.custom_name_key == "vs code"
+    assert wish.name_key == "blender 4"
+
+
+def test_tags_are_split_into_item_tags(session):
+    from snapkit.models import ItemTag, Tag
+
+    app = InstalledApp(name="Go", tags="Go, dev,go")
+    res = ResourceItem(name="Go docs", path="https://go.dev", resource_type="url", tags="golang，docs")
+    session.add_all([app, res])
+    session.commit()
+
+    assert sorted(name for (name,) in session.query(Tag.name)) == ["dev", "docs", "go", "golang"]
+    assert session.query(ItemTag).filter_by(item_type="local", item_id=app.id).count() == 2
+
+    app.tags = "dev"
+    session.commit()
+    assert session.query(ItemTag).filter_by(item_type="local", item_id=app.id).count() == 1
+
+    session.query(ResourceItem).delete()
+    session.commit()
+    assert session.query(ItemTag).filter_by(item_type="resource").count() == 0
@@ -0,0 +1,48 @@
+"""Tests for the list-view query cache."""
+
+from snapkit.core.entities import UiItem
+from snapkit.infra.cache.query_cache import QueryCache, estimate_size
+
+
+def _items(count: int, prefix: str = "app") -> list[UiItem]:
+    return [
+        UiItem(item_id=i, title=f"{prefix}-{i}", subtitle="", badge="LOCAL APP", kind="local")
+        for i in range(count)
+    ]
+
+
+def test_generation_bump_invalidates():
+    cache = QueryCache()
+    cache.set("k", 0, _items(3))
+    assert cache.get("k", 0) is not None
+    assert cache.get("k", 1) is None
+    assert cache.stats().entries == 0
+
+
+def test_stale_generation_is_not_stored():
+    cache = QueryCache()
+    assert cache.get("k", 2) is None
+    cache.set("k", 1, _items(3))
+    assert cache.get("k", 2) is None
+
+
+def test_lru_eviction_by_size():
+    budget = estimate_size(_items(10)) * 2 + 1
+    cache = QueryCache(max_bytes=budget)
+    cache.set("a", 0, _items(10, "a"))
+    cache.set("b", 0, _items(10, "b"))
+    assert cache.get("a", 0) is not None
+    cache.set("c", 0, _items(10, "c"))
+
+    assert cache.get("b", 0) is None
+    assert cache.get("a", 0) is not None
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.size_bytes <= budget
+
+
+def test_returned_list_is_a_copy():
+    cache = QueryCache()
+    cache.set("k", 0, _items(3))
+    cache.get("k", 0).pop()
+    assert len(cache.get("k", 0)) == 3
@@ -0,0 +1,142 @@
+"""Tests for the SQLAlchemy toolbox repository."""
+
+from snapkit.app.service import SnapKitService
+from snapkit.infra.db.repo_sqlalchemy import SqlAlchemyToolboxRepository
+from snapkit.models import InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
+from snapkit.scanner import load_mock_data, save_scanned_apps
+
+
+def _seed(session):
+    save_scanned_apps(session, load_mock_data())
+    firefox = session.query(InstalledApp).filter_by(name="Mozilla Firefox").one()
+    session.add(PinnedApp(installed_app_id=firefox.id))
+    session.add(NotInstalledApp(name="Blender", download_url="https://blender.org"))
+    session.add(NotInstalledApp(name="git"))
+    session.add(ResourceItem(name="Docs", path="https://docs.python.org", resource_type="url"))
+    session.commit()
+
+
+def test_list_views(session, engine):
+    _seed(session)
+    repo = SqlAlchemyToolboxRepository(engine)
+
+    assert len(repo.list_installed()) == 5
+    assert [i.title for i in repo.list_installed(pinned_filter="pinned")] == ["Mozilla Firefox"]
+    assert [i.title for i in repo.list_pinned()] == ["Mozilla Firefox"]
+    assert [i.title for i in repo.list_not_installed()] == ["Blender"]
+    assert [i.title for i in repo.list_resources("url")] == ["Docs"]
+
+
+def test_cache_hits_until_write(session, engine):
+    _seed(session)
+    repo = SqlAlchemyToolboxRepository(engine)
+    service = SnapKitService(repo, engine)
+
+    first = repo.list_installed(search="git")
+    second = repo.list_installed(search="git")
+    assert first == second
+    assert first is not second
+    stats = repo.cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.hit_rate == 0.5
+
+    _, _, items = service.load_view("local_scan", search="git")
+    ok, _ = service.rename_item(items[0].item_id, "Git SCM")
+    assert ok
+
+    assert repo.list_installed(search="git")[0].title == "Git SCM"
+    assert repo.cache_stats().misses == 2
+
+
+def test_not_installed_anti_join_uses_name_keys(session, engine):
+    _seed(session)
+    app = session.query(InstalledApp).filter_by(name="7-Zip").one()
+    app.custom_name = "  Archiver "
+    session.add(NotInstalledApp(name="archiver"))
+    session.add(NotInstalledApp(name="GIT "))
+    session.commit()
+    repo = SqlAlchemyToolboxRepository(engine)
+
+    assert [i.title for i in repo.list_not_installed()] == ["Blender"]
+    assert len(repo.list_not_installed(limit=0)) == 0
+
+
+def test_list_pinned_is_single_statement_with_sql_search(session, engine, sql_statements):
+    _seed(session)
+    apps = session.query(InstalledApp).order_by(InstalledApp.id).all()
+    session.add_all(PinnedApp(installed_app_id=a.id) for a in apps if a.name != "Mozilla Firefox")
+    session.commit()
+    repo = SqlAlchemyToolboxRepository(engine)
+
+    sql_statements.clear()
+    items = repo.list_pinned(search="fire", limit=1)
+    assert len(sql_statements) == 1
+    assert [i.title for i in items] == ["Mozilla Firefox"]
+    assert items[0].linked_app_id == apps[0].id
+
+
+def _walk_pages(fetch, page_size):
+    pages = [fetch(None)]
+    while len(pages[-1]) == page_size:
+        pages.append(fetch(pages[-1][-1].cursor))
+    return [item.item_id for page in pages for item in page]
+
+
+def test_keyset_pagination_covers_every_row_once(session, engine):
+    from datetime import datetime
+
+    same_time = datetime(2024, 1, 1)
+    for i in range(7):
+        app = InstalledApp(name=f"App {i % 3}", registry_key=f"k{i}")
+        session.add(app)
+        session.flush()
+        session.add(PinnedApp(installed_app_id=app.id, pinned_at=same_time))
+        session.add(NotInstalledApp(name=f"Wish {i}", added_at=same_time))
+        session.add(ResourceItem(name=f"R{i}", path=f"/r{i}", resource_type="file", added_at=same_time))
+    session.commit()
+    repo = SqlAlchemyToolboxRepository(engine)
+
+    installed = _walk_pages(lambda after: repo.list_installed(limit=3, after=after), 3)
+    assert installed == [a.item_id for a in repo.list_installed(limit=100)]
+    assert len(installed) == 7
+
+    for fetch in (
+        lambda after: repo.list_pinned(limit=2, after=after),
+        lambda after: repo.list_not_installed(limit=2, after=after),
+        lambda after: repo.list_resources("file", limit=2, after=after),
+    ):
+        ids = _walk_pages(fetch, 2)
+        assert len(ids) == len(set(ids)) == 7
+
+
+def test_service_load_more_extends_item_index(session, engine):
+    _seed(session)
+    service = SnapKitService(SqlAlchemyToolboxRepository(engine), engine, page_size=2)
+
+    _, _, first = service.load_view("local_scan")
+    more = service.load_more("local_scan", after=first[-1].cursor)
+    assert len(first) == len(more) == 2
+    ok, _ = service.rename_item(more[0].item_id, "Renamed")
+    assert ok
+
+
+def test_tag_filter_and_facets(session, engine, sql_statements):
+    session.add_all(
+        [
+            InstalledApp(name="Go", tags="go,dev"),
+            InstalledApp(name="Rust", tags="dev"),
+            InstalledApp(name="GoLand", tags="golang"),
+            ResourceItem(name="Go site", path="https://go.dev", resource_type="url", tags="go"),
+        ]
+    )
+    session.commit()
+    repo = SqlAlchemyToolboxRepository(engine)
+
+    assert [i.title for i in repo.list_installed(tag="go")] == ["Go"]
+    assert [i.title for i in repo.list_installed(tag="DEV")] == ["Go", "Rust"]
+
+    sql_statements.clear()
+    assert repo.tag_facets("local") == [("dev", 2), ("go", 1), ("golang", 1)]
+    assert len(sql_statements) == 1
+    assert repo.tag_facets("resource", resource_type="url") == [("go", 1)]
+    assert repo.tag_facets("resource", resource_type="image") == []
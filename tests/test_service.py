@@ -0,0 +1,122 @@
+"""Tests for the application service layer."""
+
+from sqlalchemy import event
+
+from snapkit.app.service import SnapKitService
+from snapkit.infra.db.repo_sqlalchemy import SqlAlchemyToolboxRepository
+from snapkit.models import FileDigest, InstalledApp, NotInstalledApp, PinnedApp, ResourceItem
+from snapkit.scanner import load_mock_data, save_scanned_apps
+
+
+def _service(session, engine):
+    save_scanned_apps(session, load_mock_data())
+    return SnapKitService(SqlAlchemyToolboxRepository(engine), engine)
+
+
+def test_batch_pin_and_unpin_in_one_transaction(session, engine):
+    service = _service(session, engine)
+    session.add(NotInstalledApp(name="git"))
+    session.commit()
+    _, _, items = service.load_view("local_scan")
+    ids = [item.item_id for item in items]
+
+    commits = []
+    event.listen(engine, "commit", lambda conn: commits.append(conn))
+    results = service.perform_batch_action(ids + [999], "pin")
+    assert len(commits) == 1
+    assert [r.ok for r in results] == [True] * 5 + [False]
+    assert session.query(PinnedApp).count() == 5
+    assert session.query(NotInstalledApp).count() == 0
+
+    again = service.perform_batch_action(ids[:2], "pin")
+    assert not any(r.ok for r in again)
+
+    results = service.perform_batch_action(ids[:3], "unpin")
+    assert all(r.ok for r in results)
+    assert session.query(PinnedApp).count() == 2
+
+
+def test_batch_delete_and_tag(session, engine):
+    service = _service(session, engine)
+    _, _, items = service.load_view("local_scan")
+    ids = [item.item_id for item in items]
+    service.perform_batch_action(ids[:1], "pin")
+
+    results = service.tag_items(ids[:3], "dev, tools")
+    assert all(r.ok for r in results)
+    assert service.tag_facets("local_scan") == [("dev", 3), ("tools", 3)]
+
+    results = service.perform_batch_action(ids[:2], "delete")
+    assert all(r.ok for r in results)
+    assert session.query(InstalledApp).count() == 3
+    assert session.query(PinnedApp).count() == 0
+    assert service.tag_facets("local_scan") == [("dev", 1), ("tools", 1)]
+    assert service.perform_batch_action(ids[:1], "delete")[0].ok is False
+
+
+def test_concurrent_reads_during_serialized_writes(tmp_path):
+    import threading
+
+    from snapkit.db import get_engine, init_db
+
+    engine = get_engine(tmp_path / "stress.db")
+    init_db(engine)
+    repo = SqlAlchemyToolboxRepository(engine)
+    service = SnapKitService(repo, engine)
+    errors: list[BaseException] = []
+    stop = threading.Event()
+
+    def reader():
+        try:
+            while not stop.is_set():
+                service.load_view("local_scan")
+                repo.list_pinned()
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    try:
+        for _ in range(5):
+            service.submit_write(save_scanned_apps, load_mock_data()).result()
+            ids = [item.item_id for item in service.load_view("local_scan")[2]]
+            assert all(r.ok for r in service.perform_batch_action(ids, "pin"))
+            assert all(r.ok for r in service.perform_batch_action(ids, "unpin"))
+    finally:
+        stop.set()
+        for thread in readers:
+            thread.join()
+        service.close()
+
+    assert errors == []
+    _, _, items = service.load_view("local_scan")
+    assert len(items) == 5
+    assert not any(item.is_pinned for item in items)
+    engine.dispose()
+
+
+def test_export_and_import_run_off_the_calling_thread(session, engine, tmp_path):
+    import threading
+
+    service = _service(session, engine)
+    threads = set()
+
+    def progress(event):
+        threads.add(threading.current_thread().name)
+
+    notes = tmp_path / "notes.txt"
+    notes.write_text("hello")
+    session.add(ResourceItem(name="Notes", path=str(notes), resource_type="file"))
+    session.commit()
+
+    bundle = service.submit_export(tmp_path / "bundle.zip", progress=progress).result()
+    assert [row.path for row in session.query(FileDigest)] == [str(notes)]
+    session.query(InstalledApp).delete()
+    session.commit()
+    counts = service.submit_import(bundle, progress=progress).result()
+    service.close()
+
+    assert counts["installed_apps"] == 5
+    assert session.query(InstalledApp).count() == 5
+    assert threading.current_thread().name not in threads